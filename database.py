@@ -54,6 +54,14 @@ def init_database():
         )
     """)
     
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS strategy_snapshots (
+            snapshot_key TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_instruments_uid ON instruments_cache(instrument_uid)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_uid ON price_history(instrument_uid)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_timestamp ON price_history(timestamp)")
@@ -188,6 +196,38 @@ def save_price(instrument_uid, price, instrument_name = None,
         return False
     finally:
         conn.close()
+
+
+def save_strategy_snapshot(snapshot_key, data):
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO strategy_snapshots (snapshot_key, data, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(snapshot_key) DO UPDATE SET
+                data = excluded.data,
+                updated_at = CURRENT_TIMESTAMP
+        """, (snapshot_key, sqlite3.Binary(data)))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+def load_strategy_snapshot(snapshot_key):
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT data FROM strategy_snapshots WHERE snapshot_key = ?", (snapshot_key,))
+        row = cursor.fetchone()
+        return bytes(row['data']) if row else None
+    finally:
+        conn.close()
+
         
 def clear_accounts():
     conn = get_connection()
@@ -1,15 +1,19 @@
+import multiprocessing
 import sys
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication
+from ui.web_assets import register_scheme
 
-QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
-app = QApplication(sys.argv)
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    register_scheme()
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
 
-from ui.main_window import MainWindow
+    from ui.main_window import MainWindow
 
-if __name__ == "__main__":
     window = MainWindow()
     window.resize(900, 600)
     window.show()
     
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
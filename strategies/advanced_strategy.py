@@ -1,11 +1,55 @@
 from collections import deque
 import numpy as np
-from scipy import stats
-from strategies.base_strategy import BaseStrategy, calculate_rsi, calculate_std
+from strategies.base_strategy import BaseStrategy, SIGNAL_CODES, SIGNAL_NAMES
+from strategies.indicator_registry import IndicatorRegistry
+from strategies.indicators import (
+    bbands_series, ema_series, macd_series, momentum_series, rolling_regression_series,
+    rolling_volatility_series, stochastic_series, wilder_rsi_series
+)
+
+WARMUP_PRICES = 25
+TREND_SLOPE_THRESHOLD = 0.0005
+TREND_STRENGTH_THRESHOLD = 0.2
+HIGH_VOLATILITY_THRESHOLD = 2.5
+SIGNAL_SCORE_THRESHOLD = 4
+
+TREND_PARAMS = {'ema_fast': 5, 'ema_slow': 12, 'ema_trend': 25}
+RANGE_PARAMS = {'ema_fast': 4, 'ema_slow': 10, 'ema_trend': 20}
+HIGH_VOLATILITY_PARAMS = {'bb_period': 12, 'rsi_period': 10}
+LOW_VOLATILITY_PARAMS = {'bb_period': 16, 'rsi_period': 12}
+
+PARAM_GROUPS = ('adaptive_params', 'trend_params', 'range_params', 'high_volatility_params', 'low_volatility_params')
+SCALAR_PARAMS = (
+    'trend_slope_threshold', 'trend_strength_threshold', 'high_volatility_threshold',
+    'signal_score_threshold', 'required_profit_margin', 'stop_loss'
+)
+
+REGIME_NAMES = {1: 'BULLISH', -1: 'BEARISH', 0: 'NEUTRAL'}
+REGIME_CODES = {name: code for code, name in REGIME_NAMES.items()}
+TRACE_INDICATORS = (
+    'ema_fast', 'ema_slow', 'ema_trend', 'rsi', 'bb_upper', 'bb_lower',
+    'macd', 'macd_signal', 'stoch_k', 'momentum'
+)
+
+OVERLAY_INDICATORS = {
+    'EMA Fast': 'ema_fast', 'EMA Slow': 'ema_slow', 'EMA Trend': 'ema_trend',
+    'BB Upper': 'bb_upper', 'BB Middle': 'bb_middle', 'BB Lower': 'bb_lower'
+}
 
 class SmartAdaptiveStrategy(BaseStrategy):
-    def __init__(self):
+    shares_indicators = True
+    warmup = WARMUP_PRICES
+    data_type = 'bars'
+    evaluation = 'bar'
+    param_attributes = SCALAR_PARAMS + PARAM_GROUPS[1:]
+    trace_fields = ('buy_score', 'sell_score', 'raw_signal', 'filtered_signal', 'regime', 'volatility') + TRACE_INDICATORS
+
+    def __init__(self, registry=None):
         super().__init__("Smart Adaptive Strategy")
+        self.registry = IndicatorRegistry(self.price_history.maxlen) if registry is None else registry
+        self.owns_registry = registry is None
+        self.price_history = self.registry.price_history
+        self.indicator_views = []
         self.signals = deque(maxlen=8)
         self.market_regime = "NEUTRAL"
         self.volatility = 0
@@ -14,110 +58,119 @@ class SmartAdaptiveStrategy(BaseStrategy):
             'ema_fast': 6, 'ema_slow': 14, 'ema_trend': 30,
             'rsi_period': 12, 'bb_period': 16, 'momentum_period': 8
         }
+        self.trend_params = dict(TREND_PARAMS)
+        self.range_params = dict(RANGE_PARAMS)
+        self.high_volatility_params = dict(HIGH_VOLATILITY_PARAMS)
+        self.low_volatility_params = dict(LOW_VOLATILITY_PARAMS)
+        self.trend_slope_threshold = TREND_SLOPE_THRESHOLD
+        self.trend_strength_threshold = TREND_STRENGTH_THRESHOLD
+        self.high_volatility_threshold = HIGH_VOLATILITY_THRESHOLD
+        self.signal_score_threshold = SIGNAL_SCORE_THRESHOLD
+        self.last_indicators = None
+        self.last_scores = (0, 0)
+        self.last_decision = (None, None)
+        self._create_indicators()
+
+    def get_params(self):
+        params = {name: getattr(self, name) for name in SCALAR_PARAMS if hasattr(self, name)}
+        for group in PARAM_GROUPS:
+            params.update({f"{group}.{key}": value for key, value in getattr(self, group).items()})
+        return params
+
+    def set_params(self, params):
+        for name, value in params.items():
+            if '.' in name:
+                group, key = name.split('.', 1)
+                if group not in PARAM_GROUPS or key not in getattr(self, group):
+                    raise ValueError(f"Unknown parameter: {name}")
+                getattr(self, group)[key] = int(value)
+            elif name in SCALAR_PARAMS and hasattr(self, name):
+                setattr(self, name, value)
+            else:
+                raise ValueError(f"Unknown parameter: {name}")
+        self.reset()
         
     def _update_market_regime(self):
-        if len(self.price_history) < 25:
+        if len(self.price_history) < WARMUP_PRICES:
             return
             
-        prices = np.array(list(self.price_history))
-        x = np.arange(len(prices))
-        slope, _, r_value, _, _ = stats.linregress(x, prices)
-        self.trend_strength = abs(r_value)
+        slope = self.regression.slope
+        self.trend_strength = abs(self.regression.r_value)
         
-        if slope > 0.0005 and self.trend_strength > 0.2:
+        if slope > self.trend_slope_threshold and self.trend_strength > self.trend_strength_threshold:
             self.market_regime = "BULLISH"
-        elif slope < -0.0005 and self.trend_strength > 0.2:
+        elif slope < -self.trend_slope_threshold and self.trend_strength > self.trend_strength_threshold:
             self.market_regime = "BEARISH"
         else:
             self.market_regime = "NEUTRAL"
         
-        if len(prices) >= 15:
-            returns = np.diff(prices) / prices[:-1]
-            self.volatility = np.std(returns) * 100
+        if self.volatility_tracker.count >= 14:
+            self.volatility = self.volatility_tracker.value
     
     def _adapt_parameters(self):
         if self.market_regime in ["BULLISH", "BEARISH"]:
-            self.adaptive_params.update({'ema_fast': 5, 'ema_slow': 12, 'ema_trend': 25})
+            self.adaptive_params.update(self.trend_params)
         else:
-            self.adaptive_params.update({'ema_fast': 4, 'ema_slow': 10, 'ema_trend': 20})
+            self.adaptive_params.update(self.range_params)
         
-        if self.volatility > 2.5:
-            self.adaptive_params.update({'bb_period': 12, 'rsi_period': 10})
+        if self.volatility > self.high_volatility_threshold:
+            self.adaptive_params.update(self.high_volatility_params)
         else:
-            self.adaptive_params.update({'bb_period': 16, 'rsi_period': 12})
-    
-    def _calculate_ema(self, prices, period):
-        if len(prices) < period:
-            return prices[-1] if prices else 0
-        alpha = 2 / (period + 1)
-        ema = prices[0]
-        for price in prices[1:]:
-            ema = alpha * price + (1 - alpha) * ema
-        return ema
-    
-    def _calculate_bbands(self, prices, period, std_dev=1.8):
-        if len(prices) < period:
-            return None, None, None
-        price_list = list(prices)[-period:]
-        middle = sum(price_list) / period
-        std = calculate_std(prices, period)
-        if std is None:
-            return None, None, None
-        return middle + (std * std_dev), middle, middle - (std * std_dev)
-    
-    def _calculate_macd(self, prices, fast=10, slow=22, signal=7):
-        if len(prices) < slow:
-            return 0, 0, 0
-        ema_fast = self._calculate_ema(prices, fast)
-        ema_slow = self._calculate_ema(prices, slow)
-        macd = ema_fast - ema_slow
-        macd_history = list(prices)[-signal:]
-        macd_signal = self._calculate_ema(macd_history, signal)
-        return macd, macd_signal, macd - macd_signal
-    
-    def _calculate_stochastic(self, prices, period=12, k_smooth=2):
-        if len(prices) < period:
-            return 50, 50
-        price_list = list(prices)[-period:]
-        highest_high = max(price_list)
-        lowest_low = min(price_list)
-        if highest_high == lowest_low:
-            return 50, 50
-        current_close = price_list[-1]
-        k = 100 * (current_close - lowest_low) / (highest_high - lowest_low)
-        return k, k
+            self.adaptive_params.update(self.low_volatility_params)
+
+    def _candidate_periods(self, *keys):
+        param_sets = (self.adaptive_params, self.trend_params, self.range_params, self.high_volatility_params, self.low_volatility_params)
+        return sorted({params[key] for params in param_sets for key in keys if key in params})
+
+    def _subscribe(self, kind, *params):
+        view = self.registry.subscribe(kind, *params)
+        self.indicator_views.append(view)
+        return view
+
+    def _create_indicators(self):
+        previous_views, self.indicator_views = self.indicator_views, []
+        self.emas = {period: self._subscribe('ema', period) for period in self._candidate_periods('ema_fast', 'ema_slow', 'ema_trend')}
+        self.rsis = {period: self._subscribe('rsi', period) for period in self._candidate_periods('rsi_period')}
+        self.bbands = {period: self._subscribe('bbands', period) for period in self._candidate_periods('bb_period')}
+        self.macd = self._subscribe('macd', 10, 22, 7)
+        self.stochastic = self._subscribe('stochastic', 12, 2)
+        self.momentum = self._subscribe('momentum', self.adaptive_params['momentum_period'])
+        self.regression = self._subscribe('regression', self.price_history.maxlen)
+        self.volatility_tracker = self._subscribe('volatility', self.price_history.maxlen)
+        for view in previous_views:
+            self.registry.release(view.key)
+
+    def add_price(self, price):
+        if self.owns_registry:
+            self.registry.update(price)
+        self.last_indicators = None
     
     def calculate_indicators(self):
-        if len(self.price_history) < 25:
+        if len(self.price_history) < WARMUP_PRICES:
             return None
             
-        prices = list(self.price_history)
-        current_price = prices[-1]
-        
-        ema_fast = self._calculate_ema(prices, self.adaptive_params['ema_fast'])
-        ema_slow = self._calculate_ema(prices, self.adaptive_params['ema_slow'])
-        ema_trend = self._calculate_ema(prices, self.adaptive_params['ema_trend'])
+        current_price = self.price_history[-1]
         
-        rsi = calculate_rsi(self.price_history, self.adaptive_params['rsi_period'])
+        ema_fast = self.emas[self.adaptive_params['ema_fast']].value
+        ema_slow = self.emas[self.adaptive_params['ema_slow']].value
+        ema_trend = self.emas[self.adaptive_params['ema_trend']].value
         
-        bb_upper, bb_middle, bb_lower = self._calculate_bbands(
-            self.price_history, self.adaptive_params['bb_period']
-        )
+        rsi = self.rsis[self.adaptive_params['rsi_period']].value
         
-        macd, macd_signal, macd_hist = self._calculate_macd(prices)
-        stoch_k, stoch_d = self._calculate_stochastic(prices)
+        bb_upper, bb_middle, bb_lower = self.bbands[self.adaptive_params['bb_period']].value
         
-        momentum = 0
-        if len(prices) >= self.adaptive_params['momentum_period'] + 1:
-            momentum = current_price - prices[-self.adaptive_params['momentum_period'] - 1]
+        macd, macd_signal, macd_hist = self.macd.value
+        stoch_k, stoch_d = self.stochastic.value
+        momentum = self.momentum.value
         
-        return {
+        self.last_indicators = {
             'ema_fast': ema_fast, 'ema_slow': ema_slow, 'ema_trend': ema_trend,
             'rsi': rsi or 50, 'bb_upper': bb_upper or current_price * 1.08,
             'bb_middle': bb_middle or current_price, 'bb_lower': bb_lower or current_price * 0.92,
             'macd': macd, 'macd_signal': macd_signal, 'macd_hist': macd_hist,
             'stoch_k': stoch_k, 'stoch_d': stoch_d, 'momentum': momentum, 'price': current_price
         }
+        return self.last_indicators
     
     def generate_signal(self, indicators):
         price = indicators['price']
@@ -164,9 +217,10 @@ class SmartAdaptiveStrategy(BaseStrategy):
         elif self.market_regime == "BEARISH":
             sell_score += 1
         
-        if buy_score >= 4 and buy_score > sell_score:
+        self.last_scores = (buy_score, sell_score)
+        if buy_score >= self.signal_score_threshold and buy_score > sell_score:
             return "BUY"
-        elif sell_score >= 4 and sell_score > buy_score:
+        elif sell_score >= self.signal_score_threshold and sell_score > buy_score:
             return "SELL"
         
         return None
@@ -174,7 +228,7 @@ class SmartAdaptiveStrategy(BaseStrategy):
     def analyze(self, current_price):
         self.add_price(current_price)
         
-        if len(self.price_history) < 25:
+        if len(self.price_history) < WARMUP_PRICES:
             return None
         
         self._update_market_regime()
@@ -184,19 +238,127 @@ class SmartAdaptiveStrategy(BaseStrategy):
         if not indicators:
             return None
         
-        signal = self.generate_signal(indicators)
-        
-        if signal and (not self.signals or self.signals[-1] != signal):
-            self.signals.append(signal)
-            return signal
-        
+        return self._accept_signal(self.generate_signal(indicators), current_price, indicators)
+
+    def _filter_signal(self, signal, current_price, indicators):
+        return signal
+
+    def _accept_signal(self, signal, current_price, indicators):
+        filtered = self._filter_signal(signal, current_price, indicators)
+        self.last_decision = (signal, filtered)
+        if filtered and (not self.signals or self.signals[-1] != filtered):
+            self.signals.append(filtered)
+            return filtered
         return None
+
+    def trace_values(self):
+        indicators = self.last_indicators
+        if not indicators:
+            return ()
+        raw_signal, filtered_signal = self.last_decision
+        return (
+            *self.last_scores, SIGNAL_CODES.get(raw_signal, 0), SIGNAL_CODES.get(filtered_signal, 0),
+            REGIME_CODES[self.market_regime], self.volatility, *(indicators[key] for key in TRACE_INDICATORS)
+        )
+
+    def batch_indicators(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        window = self.price_history.maxlen
+        slope, r_value = rolling_regression_series(prices, window)
+        trend_strength = np.abs(r_value)
+        regime = np.where((slope > self.trend_slope_threshold) & (trend_strength > self.trend_strength_threshold), 1,
+                          np.where((slope < -self.trend_slope_threshold) & (trend_strength > self.trend_strength_threshold), -1, 0))
+        volatility = rolling_volatility_series(prices, window)
+        trending = regime != 0
+        volatile = volatility > self.high_volatility_threshold
+
+        emas = {period: ema_series(prices, period, False) for period in self._candidate_periods('ema_fast', 'ema_slow', 'ema_trend')}
+        rsis = {period: wilder_rsi_series(prices, period) for period in self._candidate_periods('rsi_period')}
+        bbands = {period: bbands_series(prices, period) for period in self._candidate_periods('bb_period')}
+
+        def select(series, flags, key, on_params, off_params):
+            return np.where(flags, series[on_params[key]], series[off_params[key]])
+
+        rsi = select(rsis, volatile, 'rsi_period', self.high_volatility_params, self.low_volatility_params)
+        bb_upper, bb_middle, bb_lower = (
+            np.where(volatile, bbands[self.high_volatility_params['bb_period']][band], bbands[self.low_volatility_params['bb_period']][band])
+            for band in range(3)
+        )
+        macd, macd_signal, macd_hist = macd_series(prices, 10, 22, 7)
+        stoch_k, stoch_d = stochastic_series(prices, 12, 2)
+        return {
+            'ema_fast': select(emas, trending, 'ema_fast', self.trend_params, self.range_params),
+            'ema_slow': select(emas, trending, 'ema_slow', self.trend_params, self.range_params),
+            'ema_trend': select(emas, trending, 'ema_trend', self.trend_params, self.range_params),
+            'rsi': np.where(np.isnan(rsi) | (rsi == 0), 50, rsi),
+            'bb_upper': np.where(np.isnan(bb_upper), prices * 1.08, bb_upper),
+            'bb_middle': np.where(np.isnan(bb_middle), prices, bb_middle),
+            'bb_lower': np.where(np.isnan(bb_lower), prices * 0.92, bb_lower),
+            'macd': macd, 'macd_signal': macd_signal, 'macd_hist': macd_hist,
+            'stoch_k': stoch_k, 'stoch_d': stoch_d,
+            'momentum': momentum_series(prices, self.adaptive_params['momentum_period']), 'price': prices,
+            'regime': regime, 'volatility': volatility, 'trend_strength': trend_strength
+        }
+
+    def batch_raw_signals(self, indicators):
+        price = indicators['price']
+        ema_fast, ema_slow, ema_trend = indicators['ema_fast'], indicators['ema_slow'], indicators['ema_trend']
+        rsi, stoch_k = indicators['rsi'], indicators['stoch_k']
+        macd, macd_signal = indicators['macd'], indicators['macd_signal']
+        regime = indicators['regime']
+
+        ema_up = (ema_fast > ema_slow) & (ema_slow > ema_trend)
+        ema_down = ~ema_up & (ema_fast < ema_slow) & (ema_slow < ema_trend)
+        oversold = (rsi < 38) & (stoch_k < 25)
+        overbought = ~oversold & (rsi > 62) & (stoch_k > 75)
+        near_lower = price <= indicators['bb_lower'] * 1.01
+        near_upper = ~near_lower & (price >= indicators['bb_upper'] * 0.99)
+        momentum_up = indicators['momentum'] > 0
+
+        buy_score = 2 * ema_up + (macd > macd_signal) + oversold + momentum_up + near_lower + (regime == 1)
+        sell_score = 2 * ema_down + (macd < macd_signal) + overbought + ~momentum_up + near_upper + (regime == -1)
+
+        signals = np.zeros(len(price), dtype=np.int8)
+        signals[(buy_score >= self.signal_score_threshold) & (buy_score > sell_score)] = SIGNAL_CODES['BUY']
+        signals[(sell_score >= self.signal_score_threshold) & (sell_score > buy_score)] = SIGNAL_CODES['SELL']
+        signals[:WARMUP_PRICES - 1] = 0
+        return signals
+
+    def signals_from_indicators(self, prices, indicators, raw_signals, start=0, end=None, track_position=True):
+        self.reset()
+        end = len(prices) if end is None else end
+        signals = np.zeros(end - start, dtype=np.int8)
+        for index in np.flatnonzero(raw_signals[start:end]) + start:
+            values = {key: column[index] for key, column in indicators.items()}
+            signal = self._accept_signal(SIGNAL_NAMES[raw_signals[index]], prices[index], values)
+            if signal:
+                signals[index - start] = SIGNAL_CODES[signal]
+                if track_position:
+                    self.update_position(signal, prices[index])
+        return signals
+
+    def generate_signals(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        indicators = self.batch_indicators(prices)
+        return self.signals_from_indicators(prices, indicators, self.batch_raw_signals(indicators))
+
+    def warm_up(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        indicators = self.batch_indicators(prices)
+        self.signals_from_indicators(prices, indicators, self.batch_raw_signals(indicators), track_position=False)
+        if self.owns_registry:
+            self.registry.warm_up(prices)
+        if len(prices) >= WARMUP_PRICES:
+            self.market_regime = REGIME_NAMES[int(indicators['regime'][-1])]
+            self.trend_strength = float(indicators['trend_strength'][-1])
+            self.volatility = float(indicators['volatility'][-1])
+            self._adapt_parameters()
     
     def get_indicator_values(self):
-        if len(self.price_history) < 25:
+        if len(self.price_history) < WARMUP_PRICES:
             return {}
         
-        indicators = self.calculate_indicators()
+        indicators = self.last_indicators or self.calculate_indicators()
         if not indicators:
             return {}
         
@@ -210,16 +372,41 @@ class SmartAdaptiveStrategy(BaseStrategy):
             'Volatility': round(self.volatility, 1)
         }
     
+    def get_overlay_series(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        indicators = self.batch_indicators(prices)
+        series = {}
+        for name, key in OVERLAY_INDICATORS.items():
+            values = np.array(indicators[key], dtype=float)
+            values[:WARMUP_PRICES - 1] = np.nan
+            series[name] = values
+        return series
+
+    def get_overlay_values(self):
+        if not self.last_indicators:
+            return {}
+        return {name: self.last_indicators[key] for name, key in OVERLAY_INDICATORS.items()}
+    
     def reset(self):
-        super().reset()
+        if self.owns_registry:
+            self.registry.clear()
+            self.indicator_views = []
         self.signals.clear()
         self.market_regime = "NEUTRAL"
         self.volatility = 0
         self.trend_strength = 0
+        self.last_indicators = None
+        self.last_scores = (0, 0)
+        self.last_decision = (None, None)
+        self._create_indicators()
         
 class CostAwareSmartStrategy(SmartAdaptiveStrategy):
-    def __init__(self, broker_commission=0.0005):
-        super().__init__()
+    display_name = "Advanced Strategy"
+    trace_fields = SmartAdaptiveStrategy.trace_fields + ('position', 'entry_price')
+    param_attributes = SmartAdaptiveStrategy.param_attributes + ('broker_commission',)
+
+    def __init__(self, broker_commission=0.0005, registry=None):
+        super().__init__(registry)
         self.name = "Cost Aware Smart Strategy"
         self.broker_commission = broker_commission
         self.position = None
@@ -227,6 +414,7 @@ class CostAwareSmartStrategy(SmartAdaptiveStrategy):
         self.trade_count = 0
         self.total_commission = 0
         self.required_profit_margin = 0.001
+        self.stop_loss = 0.015
         
     def calculate_net_price(self, price, direction):
         return price * (1 + self.broker_commission) if direction == 'BUY' else price * (1 - self.broker_commission)
@@ -235,27 +423,8 @@ class CostAwareSmartStrategy(SmartAdaptiveStrategy):
         entry_net = entry_price * (1 + self.broker_commission) if direction == 'BUY' else entry_price * (1 - self.broker_commission)
         return entry_net / (1 - self.broker_commission) if direction == 'BUY' else entry_net / (1 + self.broker_commission)
     
-    def analyze(self, current_price):
-        self.add_price(current_price)
-        
-        if len(self.price_history) < 25:
-            return None
-        
-        self._update_market_regime()
-        self._adapt_parameters()
-        
-        indicators = self.calculate_indicators()
-        if not indicators:
-            return None
-        
-        raw_signal = self.generate_signal(indicators)
-        filtered_signal = self._filter_signal_with_costs(raw_signal, current_price, indicators)
-        
-        if filtered_signal and (not self.signals or self.signals[-1] != filtered_signal):
-            self.signals.append(filtered_signal)
-            return filtered_signal
-        
-        return None
+    def _filter_signal(self, signal, current_price, indicators):
+        return self._filter_signal_with_costs(signal, current_price, indicators)
     
     def _filter_signal_with_costs(self, signal, current_price, indicators):
         if signal == "BUY":
@@ -275,7 +444,7 @@ class CostAwareSmartStrategy(SmartAdaptiveStrategy):
                 net_buy_price = self.calculate_net_price(self.entry_price, 'BUY')
                 profit_percent = (net_sell_price - net_buy_price) / net_buy_price
                 
-                if profit_percent > self.required_profit_margin or profit_percent < -0.015:
+                if profit_percent > self.required_profit_margin or profit_percent < -self.stop_loss:
                     return "SELL"
             return None
         
@@ -294,6 +463,10 @@ class CostAwareSmartStrategy(SmartAdaptiveStrategy):
             self.total_commission += price * self.broker_commission
             self.position = None
     
+    def trace_values(self):
+        values = super().trace_values()
+        return values + (self.position == 'LONG', self.entry_price) if values else ()
+
     def get_indicator_values(self):
         base_indicators = super().get_indicator_values()
         
@@ -313,4 +486,18 @@ class CostAwareSmartStrategy(SmartAdaptiveStrategy):
             'Commission': round(self.total_commission, 2)
         })
         
-        return base_indicators
\ No newline at end of file
+        return base_indicators
+
+    def warm_up(self, prices):
+        super().warm_up(prices)
+        self.reset_position()
+
+    def reset_position(self):
+        self.position = None
+        self.entry_price = 0
+        self.trade_count = 0
+        self.total_commission = 0
+
+    def reset(self):
+        super().reset()
+        self.reset_position()
@@ -0,0 +1,146 @@
+import argparse
+import csv
+from datetime import datetime
+
+import numpy as np
+
+from strategies.base_strategy import SIGNAL_CODES
+
+DEFAULT_COMMISSION = 0.0005
+DEFAULT_CAPITAL = 100000.0
+
+
+def candle_arrays(price_data):
+    rows = sorted(price_data, key=lambda row: row[0])
+    data = np.array(rows, dtype=float).reshape(len(rows), -1)
+    if data.shape[1] == 2:
+        return {
+            'time': data[:, 0], 'open': data[:, 1], 'high': data[:, 1],
+            'low': data[:, 1], 'close': data[:, 1]
+        }
+    return {
+        'time': data[:, 0], 'open': data[:, 1], 'high': data[:, 2],
+        'low': data[:, 3], 'close': data[:, 4]
+    }
+
+
+def parse_time(value):
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def load_candles_csv(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            try:
+                rows.append((parse_time(row[0]), *[float(value) for value in row[1:5]]))
+            except ValueError:
+                continue
+    return candle_arrays(rows)
+
+
+def drawdown_series(equity):
+    peaks = np.maximum.accumulate(equity)
+    return equity / peaks - 1
+
+
+def simulate(times, prices, signals, commission=DEFAULT_COMMISSION, initial_capital=DEFAULT_CAPITAL):
+    equity = np.empty(len(prices))
+    trades = []
+    cash = initial_capital
+    units = 0.0
+    entry = None
+    traded = 0.0
+    total_commission = 0.0
+    cursor = 0
+    for index in np.flatnonzero(signals):
+        signal = signals[index]
+        if (signal == SIGNAL_CODES['BUY']) == bool(units):
+            continue
+        equity[cursor:index] = units * prices[cursor:index] if units else cash
+        cursor = index
+        price = prices[index]
+        if signal == SIGNAL_CODES['BUY']:
+            units = cash / (price * (1 + commission))
+            fee = units * price * commission
+            traded += units * price
+            entry = {'entry_time': times[index], 'entry_price': price, 'units': units, 'cost': cash}
+            cash = 0.0
+        else:
+            proceeds = units * price
+            fee = proceeds * commission
+            traded += proceeds
+            cash = proceeds - fee
+            entry.update({
+                'exit_time': times[index], 'exit_price': price,
+                'pnl': cash - entry['cost'], 'return': cash / entry['cost'] - 1
+            })
+            trades.append(entry)
+            units, entry = 0.0, None
+        total_commission += fee
+    equity[cursor:] = units * prices[cursor:] if units else cash
+
+    drawdown = drawdown_series(equity) if len(equity) else equity
+    wins = sum(1 for trade in trades if trade['pnl'] > 0)
+    return {
+        'trades': trades,
+        'open_position': entry,
+        'equity': equity,
+        'drawdown': drawdown,
+        'total_return': float(equity[-1] / initial_capital - 1) if len(equity) else 0.0,
+        'max_drawdown': float(drawdown.min()) if len(drawdown) else 0.0,
+        'hit_rate': wins / len(trades) if trades else 0.0,
+        'turnover': traded / initial_capital,
+        'trade_count': len(trades),
+        'commission': total_commission
+    }
+
+
+def bar_signals(strategy, prices):
+    strategy.reset()
+    signals = np.zeros(len(prices), dtype=np.int8)
+    for index, price in enumerate(prices):
+        signal = strategy.analyze(float(price))
+        if signal:
+            signals[index] = SIGNAL_CODES[signal]
+            strategy.update_position(signal, float(price))
+    return signals
+
+
+def run_backtest(strategy, candles, mode='vectorized', initial_capital=DEFAULT_CAPITAL):
+    prices = np.asarray(candles['close'], dtype=float)
+    signals = strategy.generate_signals(prices) if mode == 'vectorized' else None
+    if signals is None:
+        signals = bar_signals(strategy, prices)
+    commission = getattr(strategy, 'broker_commission', DEFAULT_COMMISSION)
+    result = simulate(np.asarray(candles['time']), prices, signals, commission, initial_capital)
+    result['signals'] = signals
+    return result
+
+
+def main():
+    from strategies.advanced_strategy import CostAwareSmartStrategy
+
+    parser = argparse.ArgumentParser(description='Backtest CostAwareSmartStrategy on a CSV of candles')
+    parser.add_argument('path', help='CSV: time,open,high,low,close (or time,price)')
+    parser.add_argument('--mode', choices=['vectorized', 'bar'], default='vectorized')
+    parser.add_argument('--capital', type=float, default=DEFAULT_CAPITAL)
+    args = parser.parse_args()
+
+    result = run_backtest(CostAwareSmartStrategy(), load_candles_csv(args.path), args.mode, args.capital)
+    print(f"Сделок: {result['trade_count']}")
+    print(f"Доходность: {result['total_return'] * 100:.2f}%")
+    print(f"Макс. просадка: {result['max_drawdown'] * 100:.2f}%")
+    print(f"Hit rate: {result['hit_rate'] * 100:.1f}%")
+    print(f"Оборот: {result['turnover']:.2f}x")
+    print(f"Комиссия: {result['commission']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import time
+
+
+class BarAggregator:
+    def __init__(self, seconds=60):
+        self.seconds = seconds
+        self.bar = None
+        self.closed_ts = None
+
+    def update(self, price, volume=0.0, ts=None):
+        ts = time.time() if ts is None else ts
+        start = ts - ts % self.seconds
+        if self.closed_ts is not None and start <= self.closed_ts:
+            return None
+        closed = None
+        if self.bar and self.bar['ts'] != start:
+            closed, self.bar = self.bar, None
+            self.closed_ts = closed['ts']
+        if self.bar is None:
+            self.bar = {'open': price, 'high': price, 'low': price, 'close': price, 'volume': volume, 'ts': start}
+        else:
+            bar = self.bar
+            if price > bar['high']:
+                bar['high'] = price
+            elif price < bar['low']:
+                bar['low'] = price
+            bar['close'] = price
+            bar['volume'] += volume
+        return closed
+
+    def flush(self, ts=None):
+        ts = time.time() if ts is None else ts
+        if self.bar and ts >= self.bar['ts'] + self.seconds:
+            closed, self.bar = self.bar, None
+            self.closed_ts = closed['ts']
+            return closed
+        return None
+
+
+def resample_candles(candles, seconds, now=None):
+    bars = []
+    for candle in candles:
+        start = candle['time'] - candle['time'] % seconds
+        if bars and bars[-1]['time'] == start:
+            bar = bars[-1]
+            bar['high'] = max(bar['high'], candle['high'])
+            bar['low'] = min(bar['low'], candle['low'])
+            bar['close'] = candle['close']
+            bar['volume'] += candle.get('volume', 0.0)
+        else:
+            bars.append({'time': start, 'open': candle['open'], 'high': candle['high'], 'low': candle['low'],
+                         'close': candle['close'], 'volume': candle.get('volume', 0.0)})
+    now = time.time() if now is None else now
+    if bars and bars[-1]['time'] + seconds > now:
+        bars.pop()
+    return bars
+
+
+def clock_settings(strategy_class, evaluation=None):
+    mode, interval = evaluation or (strategy_class.evaluation, None)
+    return mode, interval or strategy_class.evaluation_interval, strategy_class.bar_seconds
+
+
+class EvaluationClock:
+    def __init__(self, evaluation='tick', interval=1000, bar_seconds=60):
+        self.evaluation = evaluation
+        self.interval = interval
+        self.bars = BarAggregator(bar_seconds)
+        self.last_evaluation = None
+
+    @classmethod
+    def for_strategy(cls, strategy):
+        return cls(strategy.evaluation, strategy.evaluation_interval, strategy.bar_seconds)
+
+    def on_tick(self, price, volume=0.0, ts=None):
+        ts = time.time() if ts is None else ts
+        if self.evaluation == 'bar':
+            return self.bars.update(price, volume, ts)
+        if self.evaluation == 'interval':
+            if self.last_evaluation is not None and (ts - self.last_evaluation) * 1000 < self.interval:
+                return None
+            self.last_evaluation = ts
+        return {'open': price, 'high': price, 'low': price, 'close': price, 'volume': volume, 'ts': ts}
+
+    def flush(self, ts=None):
+        return self.bars.flush(ts) if self.evaluation == 'bar' else None
@@ -1,71 +1,223 @@
+import pickle
+import time
+import zlib
 from abc import ABC, abstractmethod
-from collections import deque
+
+import numpy as np
+
+SIGNAL_CODES = {'BUY': 1, 'SELL': -1}
+SIGNAL_NAMES = {1: 'BUY', -1: 'SELL'}
+EVALUATION_MODES = ('tick', 'interval', 'bar')
+SNAPSHOT_VERSION = 2
+
+
+class PriceHistory:
+    def __init__(self, maxlen=1000):
+        self.maxlen = maxlen
+        self.buffer = np.zeros(maxlen * 2)
+        self.end = 0
+        self.size = 0
+
+    def append(self, price):
+        self.buffer[self.end] = price
+        self.buffer[self.end + self.maxlen] = price
+        self.end = (self.end + 1) % self.maxlen
+        self.size = min(self.size + 1, self.maxlen)
+
+    def window(self, period=None):
+        count = self.size if period is None else min(period, self.size)
+        end = self.end if self.end >= count else self.end + self.maxlen
+        view = self.buffer[end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def values(self):
+        return self.window()
+
+    def load(self, values):
+        values = np.asarray(values, dtype=float)[-self.maxlen:]
+        self.size = len(values)
+        self.end = self.size % self.maxlen
+        self.buffer[:self.size] = values
+        self.buffer[self.maxlen:self.maxlen + self.size] = values
+
+    def clear(self):
+        self.end = 0
+        self.size = 0
+
+    def __getstate__(self):
+        return {'maxlen': self.maxlen, 'values': self.window().copy()}
+
+    def __setstate__(self, state):
+        self.__init__(state['maxlen'])
+        self.load(state['values'])
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return self.window()[index]
+
+    def __iter__(self):
+        return iter(self.window())
 
 
 class BaseStrategy(ABC):
+    display_name = None
+    warmup = 0
+    data_type = 'ticks'
+    shares_indicators = False
+    evaluation = 'tick'
+    evaluation_interval = 1000
+    bar_seconds = 60
+    trace = None
+    trace_fields = ()
+    position = None
+    config_attributes = ('evaluation', 'evaluation_interval', 'bar_seconds')
+    param_attributes = ()
+
     def __init__(self, name):
         self.name = name
-        self.price_history = deque(maxlen=1000)
+        self.price_history = PriceHistory(maxlen=1000)
         
     def add_price(self, price):
-        self.price_history.appendleft(price)
+        self.price_history.append(price)
         
     @abstractmethod
     def analyze(self, current_price):
         pass
+
+    def on_bar(self, open, high, low, close, volume, ts):
+        if self.trace is None:
+            return self.analyze(close)
+        started = time.perf_counter_ns()
+        signal = self.analyze(close)
+        elapsed = time.perf_counter_ns() - started
+        self.trace.record((ts, open, high, low, close, volume), signal, elapsed, self.trace_values())
+        return signal
+
+    def set_trace(self, trace):
+        self.trace = trace
+
+    def trace_values(self):
+        return ()
+
+    def set_evaluation(self, mode, interval=None):
+        if mode not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode: {mode}")
+        self.evaluation = mode
+        if interval is not None:
+            self.evaluation_interval = interval
         
     def get_indicator_values(self):
         return {}
+
+    def get_params(self):
+        return {}
+
+    def set_params(self, params):
+        for name, value in params.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Unknown parameter: {name}")
+            setattr(self, name, value)
+        self.reset()
+
+    def warm_up(self, prices):
+        self.reset()
+        for price in np.asarray(prices, dtype=float).tolist():
+            self.add_price(price)
+
+    def generate_signals(self, prices):
+        return None
+
+    def snapshot(self, last_time=None):
+        excluded = ('trace',) + self.config_attributes + self.param_attributes
+        state = {'version': SNAPSHOT_VERSION, 'class': type(self).__name__, 'time': last_time,
+                 'params': self._param_values(),
+                 'state': {name: value for name, value in self.__dict__.items() if name not in excluded}}
+        return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _param_values(self):
+        return {name: getattr(self, name) for name in self.param_attributes if hasattr(self, name)}
+
+    def restore(self, data, with_params=False):
+        state = pickle.loads(zlib.decompress(data))
+        if state.get('version') != SNAPSHOT_VERSION or state.get('class') != type(self).__name__:
+            raise ValueError("Snapshot does not match this strategy")
+        if with_params:
+            self.__dict__.update(state['params'])
+        elif state['params'] != self._param_values():
+            raise ValueError("Snapshot was saved with different parameters")
+        self.__dict__.update(state['state'])
+        return state['time']
+
+    def update_position(self, signal, price):
+        pass
+
+    def get_overlay_series(self, prices):
+        return {}
+
+    def get_overlay_values(self):
+        return {}
         
     def reset(self):
         self.price_history.clear()
 
 
+def price_window(prices, period):
+    if isinstance(prices, PriceHistory):
+        return prices.window(period)
+    return np.asarray(prices, dtype=float)[-period:]
+
+
 def calculate_ma(prices, period):
     if len(prices) < period:
         return None
-    return sum(list(prices)[-period:]) / period
+    return float(price_window(prices, period).mean())
 
 
 def calculate_rsi(prices, period=14):
     if len(prices) < period + 1:
         return None
         
-    price_list = list(prices)
-    gains = []
-    losses = []
-    
-    for i in range(len(price_list) - period, len(price_list)):
-        if i == 0:
-            continue
-        change = price_list[i] - price_list[i - 1]
-        if change > 0:
-            gains.append(change)
-            losses.append(0)
-        else:
-            gains.append(0)
-            losses.append(abs(change))
+    changes = np.diff(price_window(prices, period + 1))
+    gains = np.maximum(changes, 0)
+    losses = np.maximum(-changes, 0)
     
-    if not gains or sum(losses) == 0:
+    if not len(changes) or losses.sum() == 0:
         return None
         
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period
+    avg_gain = gains.sum() / period
+    avg_loss = losses.sum() / period
     
-    if avg_loss == 0:
-        return 100.0
-        
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return float(rsi)
 
 
 def calculate_std(prices, period):
     if len(prices) < period:
         return None
         
-    price_list = list(prices)[-period:]
-    mean = sum(price_list) / period
-    variance = sum((x - mean) ** 2 for x in price_list) / period
-    return variance ** 0.5
+    return float(price_window(prices, period).std())
 
+
+class CrossSectionStrategy(ABC):
+    def __init__(self, name, symbols):
+        self.name = name
+        self.symbols = list(symbols)
+
+    @abstractmethod
+    def on_cross_section(self, ts, prices):
+        pass
+
+    def warm_up(self, times, matrix):
+        self.reset()
+        for ts, prices in zip(np.asarray(times, dtype=float).tolist(), np.asarray(matrix, dtype=float)):
+            self.on_cross_section(ts, prices)
+
+    def get_indicator_values(self):
+        return {}
+
+    def reset(self):
+        pass
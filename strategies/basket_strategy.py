@@ -0,0 +1,104 @@
+import math
+
+import numpy as np
+
+from strategies.base_strategy import CrossSectionStrategy
+from strategies.indicators import RollingBeta, RollingStats, RollingStatsArray
+
+
+class PairsStrategy(CrossSectionStrategy):
+    def __init__(self, symbols, period=60, entry_z=2.0, exit_z=0.5, hedge_ratio=None):
+        super().__init__("Pairs Strategy", symbols)
+        if len(self.symbols) != 2:
+            raise ValueError("Pairs strategy needs exactly two instruments")
+        self.period = period
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.hedge_ratio = hedge_ratio
+        self.reset()
+
+    def on_cross_section(self, ts, prices):
+        price_a, price_b = prices[0], prices[1]
+        if not (price_a > 0 and price_b > 0):
+            return {}
+        x, y = math.log(price_b), math.log(price_a)
+        if self.hedge_ratio is None:
+            self.beta.update(x, y)
+            beta = self.beta.value
+        else:
+            beta = self.hedge_ratio
+        self.spread = y - beta * x
+        self.spread_stats.update(self.spread)
+        std = self.spread_stats.std
+        if not self.spread_stats.ready or std == 0:
+            return {}
+        self.zscore = (self.spread - self.spread_stats.mean) / std
+
+        symbol_a, symbol_b = self.symbols
+        if self.position == 0:
+            if self.zscore > self.entry_z:
+                self.position = -1
+                return {symbol_a: 'SELL', symbol_b: 'BUY'}
+            if self.zscore < -self.entry_z:
+                self.position = 1
+                return {symbol_a: 'BUY', symbol_b: 'SELL'}
+        elif abs(self.zscore) < self.exit_z:
+            position, self.position = self.position, 0
+            if position == 1:
+                return {symbol_a: 'SELL', symbol_b: 'BUY'}
+            return {symbol_a: 'BUY', symbol_b: 'SELL'}
+        return {}
+
+    def get_indicator_values(self):
+        return {
+            'Z-score': round(self.zscore, 2),
+            'Spread': round(self.spread, 5),
+            'Beta': round(self.hedge_ratio if self.hedge_ratio is not None else self.beta.value, 3),
+            'Position': self.position
+        }
+
+    def reset(self):
+        self.beta = RollingBeta(self.period)
+        self.spread_stats = RollingStats(self.period)
+        self.spread = 0.0
+        self.zscore = 0.0
+        self.position = 0
+
+
+class BasketMeanReversionStrategy(CrossSectionStrategy):
+    def __init__(self, symbols, period=60, entry_z=2.0, exit_z=0.0):
+        super().__init__("Basket Mean Reversion", symbols)
+        self.period = period
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.reset()
+
+    def on_cross_section(self, ts, prices):
+        prices = np.asarray(prices, dtype=float)
+        if not np.all(prices > 0):
+            return {}
+        logs = np.log(prices)
+        deviation = logs - logs.mean()
+        self.stats.update(deviation)
+        if not self.stats.ready:
+            return {}
+        std = self.stats.std
+        self.zscores = np.divide(deviation - self.stats.mean, std, out=np.zeros_like(std), where=std > 0)
+        buys = ~self.held & (self.zscores < -self.entry_z)
+        sells = self.held & (self.zscores > -self.exit_z)
+        self.held = (self.held | buys) & ~sells
+        signals = {self.symbols[column]: 'BUY' for column in np.flatnonzero(buys)}
+        signals.update({self.symbols[column]: 'SELL' for column in np.flatnonzero(sells)})
+        return signals
+
+    def get_indicator_values(self):
+        return {
+            'Min Z': round(float(self.zscores.min()), 2),
+            'Max Z': round(float(self.zscores.max()), 2),
+            'Held': [self.symbols[column] for column in np.flatnonzero(self.held)]
+        }
+
+    def reset(self):
+        self.stats = RollingStatsArray(self.period, len(self.symbols))
+        self.zscores = np.zeros(len(self.symbols))
+        self.held = np.zeros(len(self.symbols), dtype=bool)
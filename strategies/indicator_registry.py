@@ -0,0 +1,76 @@
+from strategies.base_strategy import PriceHistory
+from strategies.indicators import (
+    BollingerBands, Ema, Macd, Momentum, RollingRegression, RollingVolatility, Stochastic, WilderRsi
+)
+
+INDICATOR_TYPES = {
+    'ema': Ema, 'rsi': WilderRsi, 'bbands': BollingerBands, 'macd': Macd, 'stochastic': Stochastic,
+    'momentum': Momentum, 'regression': RollingRegression, 'volatility': RollingVolatility
+}
+
+
+class IndicatorView:
+    __slots__ = ('key', '_indicator')
+
+    def __init__(self, key, indicator):
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, '_indicator', indicator)
+
+    def __getattr__(self, name):
+        if name in ('update', 'seed', '_indicator'):
+            raise AttributeError("Indicator views are read-only")
+        return getattr(self._indicator, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Indicator views are read-only")
+
+    def __getstate__(self):
+        return self.key, self._indicator
+
+    def __setstate__(self, state):
+        object.__setattr__(self, 'key', state[0])
+        object.__setattr__(self, '_indicator', state[1])
+
+
+class IndicatorRegistry:
+    def __init__(self, maxlen=1000):
+        self.price_history = PriceHistory(maxlen)
+        self.indicators = {}
+        self.subscribers = {}
+
+    def __len__(self):
+        return len(self.indicators)
+
+    def subscribe(self, kind, *params):
+        key = (kind, params)
+        indicator = self.indicators.get(key)
+        if indicator is None:
+            indicator = INDICATOR_TYPES[kind](*params)
+            indicator.seed(self.price_history.values())
+            self.indicators[key] = indicator
+            self.subscribers[key] = 0
+        self.subscribers[key] += 1
+        return IndicatorView(key, indicator)
+
+    def release(self, key):
+        if key not in self.subscribers:
+            return
+        self.subscribers[key] -= 1
+        if not self.subscribers[key]:
+            del self.subscribers[key]
+            del self.indicators[key]
+
+    def update(self, price):
+        self.price_history.append(price)
+        for indicator in self.indicators.values():
+            indicator.update(price)
+
+    def warm_up(self, prices):
+        self.price_history.load(prices)
+        for indicator in self.indicators.values():
+            indicator.seed(prices)
+
+    def clear(self):
+        self.price_history.clear()
+        self.indicators.clear()
+        self.subscribers.clear()
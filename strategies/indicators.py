@@ -0,0 +1,897 @@
+from collections import deque
+
+import numpy as np
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from scipy.signal import lfilter
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def ema_series(prices, period, mask_warmup=True):
+    prices = np.asarray(prices, dtype=float)
+    if not len(prices):
+        return prices.copy()
+    alpha = 2 / (period + 1)
+    result, _ = lfilter([alpha], [1, alpha - 1], prices, zi=[(1 - alpha) * prices[0]])
+    if mask_warmup:
+        result[:period - 1] = np.nan
+    return result
+
+
+def sma_series(prices, period):
+    prices = np.asarray(prices, dtype=float)
+    result = np.full(len(prices), np.nan)
+    if len(prices) >= period:
+        result[period - 1:] = sliding_window_view(prices, period).mean(axis=1)
+    return result
+
+
+def std_series(prices, period):
+    prices = np.asarray(prices, dtype=float)
+    result = np.full(len(prices), np.nan)
+    if len(prices) >= period:
+        result[period - 1:] = sliding_window_view(prices, period).std(axis=1)
+    return result
+
+
+def bbands_series(prices, period, std_dev=1.8):
+    middle = sma_series(prices, period)
+    std = std_series(prices, period)
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+
+def wilder_rsi_series(prices, period=14):
+    prices = np.asarray(prices, dtype=float)
+    result = np.full(len(prices), np.nan)
+    if len(prices) <= period:
+        return result
+    changes = np.diff(prices)
+    gains, losses = np.maximum(changes, 0), np.maximum(-changes, 0)
+    decay = 1 - 1 / period
+    averages = []
+    for values in (gains, losses):
+        seed = values[:period].mean()
+        smoothed, _ = lfilter([1 / period], [1, -decay], values[period:], zi=[decay * seed])
+        averages.append(np.concatenate([[seed], smoothed]))
+    avg_gain, avg_loss = averages
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), rsi)
+    result[period:] = rsi
+    return result
+
+
+def macd_series(prices, fast=12, slow=26, signal=9):
+    prices = np.asarray(prices, dtype=float)
+    macd = np.zeros(len(prices))
+    macd_signal = np.zeros(len(prices))
+    if len(prices) >= slow:
+        line = ema_series(prices, fast, False)[slow - 1:] - ema_series(prices, slow, False)[slow - 1:]
+        macd[slow - 1:] = line
+        macd_signal[slow - 1:] = ema_series(line, signal, False)
+    return macd, macd_signal, macd - macd_signal
+
+
+def stochastic_series(prices, period=12, d_period=2):
+    prices = np.asarray(prices, dtype=float)
+    k = np.full(len(prices), 50.0)
+    d = np.full(len(prices), 50.0)
+    if len(prices) < period:
+        return k, d
+    windows = sliding_window_view(prices, period)
+    high, low = windows.max(axis=1), windows.min(axis=1)
+    span = high - low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ready = np.where(span == 0, 50.0, 100 * (prices[period - 1:] - low) / span)
+    k[period - 1:] = ready
+    sums = np.cumsum(np.concatenate([[0.0], ready]))
+    counts = np.minimum(np.arange(1, len(ready) + 1), d_period)
+    ends = np.arange(1, len(ready) + 1)
+    d[period - 1:] = (sums[ends] - sums[ends - counts]) / counts
+    return k, d
+
+
+def momentum_series(prices, period):
+    prices = np.asarray(prices, dtype=float)
+    result = np.zeros(len(prices))
+    result[period:] = prices[period:] - prices[:-period]
+    return result
+
+
+def _window_sums(values, period):
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - period, 0)
+    return sums[ends] - sums[starts], starts, ends - starts
+
+
+def rolling_regression_series(prices, period):
+    prices = np.asarray(prices, dtype=float)
+    if not len(prices):
+        return np.empty(0), np.empty(0)
+    y = prices - prices[0]
+    index = np.arange(len(y), dtype=float)
+    sum_y, starts, n = _window_sums(y, period)
+    sum_yy = _window_sums(y * y, period)[0]
+    sum_xy = _window_sums(index * y, period)[0] - starts * sum_y
+    sum_x = n * (n - 1) / 2
+    sum_xx = (n - 1) * n * (2 * n - 1) / 6
+    var_x = n * sum_xx - sum_x * sum_x
+    cov = n * sum_xy - sum_x * sum_y
+    var_y = n * sum_yy - sum_y * sum_y
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(var_x > 0, cov / var_x, 0.0)
+        r_value = np.where((var_x > 0) & (var_y > 0), cov / np.sqrt(var_x * var_y), 0.0)
+    return slope, np.clip(r_value, -1.0, 1.0)
+
+
+def rolling_volatility_series(prices, period):
+    prices = np.asarray(prices, dtype=float)
+    result = np.zeros(len(prices))
+    if len(prices) < 2:
+        return result
+    returns = np.diff(prices) / prices[:-1]
+    window = max(period - 1, 1)
+    sums, _, n = _window_sums(returns, window)
+    squares = _window_sums(returns * returns, window)[0]
+    mean = sums / n
+    result[1:] = np.sqrt(np.maximum(squares / n - mean * mean, 0.0)) * 100
+    return result
+
+
+def _ohlc(high, low, close):
+    return np.asarray(high, dtype=float), np.asarray(low, dtype=float), np.asarray(close, dtype=float)
+
+
+def _rolling_max(values, period):
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        result[period - 1:] = maximum_filter1d(values, period, origin=(period - 1) // 2)[period - 1:]
+    return result
+
+
+def _rolling_min(values, period):
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        result[period - 1:] = minimum_filter1d(values, period, origin=(period - 1) // 2)[period - 1:]
+    return result
+
+
+def _wilder_series(values, period, start=0):
+    result = np.full(len(values), np.nan)
+    if len(values) < start + period:
+        return result
+    decay = 1 - 1 / period
+    seed = values[start:start + period].mean()
+    smoothed, _ = lfilter([1 / period], [1, -decay], values[start + period:], zi=[decay * seed])
+    result[start + period - 1] = seed
+    result[start + period:] = smoothed
+    return result
+
+
+def true_range_series(high, low, close):
+    high, low, close = _ohlc(high, low, close)
+    ranges = high - low
+    if len(close) > 1:
+        previous = close[:-1]
+        ranges[1:] = np.maximum(ranges[1:], np.maximum(np.abs(high[1:] - previous), np.abs(low[1:] - previous)))
+    return ranges
+
+
+def atr_series(high, low, close, period=14):
+    return _wilder_series(true_range_series(high, low, close), period)
+
+
+def _directional_movement(high, low, close):
+    high, low, close = _ohlc(high, low, close)
+    up = np.zeros(len(high))
+    down = np.zeros(len(high))
+    up[1:] = high[1:] - high[:-1]
+    down[1:] = low[:-1] - low[1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    return true_range_series(high, low, close), plus_dm, minus_dm
+
+
+def adx_series(high, low, close, period=14):
+    true_range, plus_dm, minus_dm = _directional_movement(high, low, close)
+    avg_tr = _wilder_series(true_range, period, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = np.where(avg_tr > 0, 100 * _wilder_series(plus_dm, period, 1) / avg_tr, 0.0)
+        minus_di = np.where(avg_tr > 0, 100 * _wilder_series(minus_dm, period, 1) / avg_tr, 0.0)
+        total = plus_di + minus_di
+        dx = np.where(total > 0, 100 * np.abs(plus_di - minus_di) / total, 0.0)
+    ready = ~np.isnan(avg_tr)
+    plus_di[~ready] = np.nan
+    minus_di[~ready] = np.nan
+    dx[~ready] = np.nan
+    return _wilder_series(dx, period, period), plus_di, minus_di
+
+
+def obv_series(close, volume):
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    flow = np.zeros(len(close))
+    flow[1:] = np.sign(np.diff(close)) * volume[1:]
+    return np.cumsum(flow)
+
+
+def _session_cumsum(values, sessions):
+    totals = np.cumsum(values)
+    if sessions is None or not len(values):
+        return totals
+    sessions = np.asarray(sessions)
+    starts = np.flatnonzero(np.concatenate([[True], sessions[1:] != sessions[:-1]]))
+    offsets = np.concatenate([[0.0], totals[starts[1:] - 1]])
+    return totals - np.repeat(offsets, np.diff(np.append(starts, len(values))))
+
+
+def vwap_series(high, low, close, volume, sessions=None):
+    high, low, close = _ohlc(high, low, close)
+    volume = np.asarray(volume, dtype=float)
+    price_volume = _session_cumsum((high + low + close) / 3 * volume, sessions)
+    total_volume = _session_cumsum(volume, sessions)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_volume > 0, price_volume / total_volume, np.nan)
+
+
+def keltner_series(high, low, close, period=20, atr_period=10, multiplier=2.0):
+    middle = ema_series(close, period)
+    width = atr_series(high, low, close, atr_period) * multiplier
+    return middle + width, middle, middle - width
+
+
+def donchian_series(high, low, period=20):
+    upper = _rolling_max(np.asarray(high, dtype=float), period)
+    lower = _rolling_min(np.asarray(low, dtype=float), period)
+    return upper, (upper + lower) / 2, lower
+
+
+def _shift(values, periods):
+    result = np.full(len(values), np.nan)
+    if len(values) > periods:
+        result[periods:] = values[:len(values) - periods]
+    return result
+
+
+def ichimoku_series(high, low, tenkan=9, kijun=26, senkou=52, displacement=26):
+    high, low = np.asarray(high, dtype=float), np.asarray(low, dtype=float)
+    tenkan_sen = (_rolling_max(high, tenkan) + _rolling_min(low, tenkan)) / 2
+    kijun_sen = (_rolling_max(high, kijun) + _rolling_min(low, kijun)) / 2
+    span_b = (_rolling_max(high, senkou) + _rolling_min(low, senkou)) / 2
+    return tenkan_sen, kijun_sen, _shift((tenkan_sen + kijun_sen) / 2, displacement), _shift(span_b, displacement)
+
+
+class Ema:
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.value = None
+        self.count = 0
+
+    def update(self, price):
+        self.value = price if self.value is None else self.value + self.alpha * (price - self.value)
+        self.count += 1
+        return self.value
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.value = float(ema_series(prices, self.period, False)[-1]) if len(prices) else None
+        self.count = len(prices)
+
+
+class WilderRsi:
+    def __init__(self, period=14):
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = None
+
+    def update(self, price):
+        if self.previous is not None:
+            change = price - self.previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            self.count += 1
+            if self.count <= self.period:
+                self.avg_gain += gain / self.period
+                self.avg_loss += loss / self.period
+            else:
+                self.avg_gain += (gain - self.avg_gain) / self.period
+                self.avg_loss += (loss - self.avg_loss) / self.period
+            if self.count >= self.period:
+                if self.avg_loss == 0:
+                    self.value = 100.0 if self.avg_gain > 0 else 50.0
+                else:
+                    self.value = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        self.previous = price
+        return self.value
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.previous, self.count, self.avg_gain, self.avg_loss, self.value = None, 0, 0.0, 0.0, None
+        if not len(prices):
+            return
+        changes = np.diff(prices)
+        gains, losses = np.maximum(changes, 0), np.maximum(-changes, 0)
+        decay = 1 - 1 / self.period
+        averages = []
+        for values in (gains, losses):
+            average = values[:self.period].sum() / self.period
+            if len(values) > self.period:
+                average = lfilter([1 / self.period], [1, -decay], values[self.period:], zi=[decay * average])[0][-1]
+            averages.append(float(average))
+        self.avg_gain, self.avg_loss = averages
+        self.count = len(changes)
+        self.previous = float(prices[-1])
+        if self.count >= self.period:
+            if self.avg_loss == 0:
+                self.value = 100.0 if self.avg_gain > 0 else 50.0
+            else:
+                self.value = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+
+class RollingStats:
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def ready(self):
+        return len(self.window) == self.period
+
+    @property
+    def std(self):
+        return (max(self.m2, 0.0) / len(self.window)) ** 0.5 if self.window else 0.0
+
+    def update(self, value):
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            self.window.append(value)
+            old_mean = self.mean
+            self.mean += (value - old) / self.period
+            self.m2 += (value - old) * (value - self.mean + old - old_mean)
+        else:
+            self.window.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (value - self.mean)
+        return self.mean
+
+    def seed(self, values):
+        tail = np.asarray(values, dtype=float)[-self.period:]
+        self.window = deque(tail.tolist())
+        self.mean = float(tail.mean()) if len(tail) else 0.0
+        self.m2 = float(((tail - self.mean) ** 2).sum())
+
+
+class BollingerBands:
+    def __init__(self, period, std_dev=1.8):
+        self.std_dev = std_dev
+        self.stats = RollingStats(period)
+
+    @property
+    def value(self):
+        if not self.stats.ready:
+            return None, None, None
+        middle = self.stats.mean
+        width = self.stats.std * self.std_dev
+        return middle + width, middle, middle - width
+
+    def update(self, price):
+        self.stats.update(price)
+        return self.value
+
+    def seed(self, prices):
+        self.stats.seed(prices)
+
+
+class RollingExtremes:
+    def __init__(self, period):
+        self.period = period
+        self.index = 0
+        self.highs = deque()
+        self.lows = deque()
+
+    @property
+    def ready(self):
+        return self.index >= self.period
+
+    @property
+    def high(self):
+        return self.highs[0][1]
+
+    @property
+    def low(self):
+        return self.lows[0][1]
+
+    def update(self, value):
+        while self.highs and self.highs[-1][1] <= value:
+            self.highs.pop()
+        while self.lows and self.lows[-1][1] >= value:
+            self.lows.pop()
+        self.highs.append((self.index, value))
+        self.lows.append((self.index, value))
+        expired = self.index - self.period
+        if self.highs[0][0] <= expired:
+            self.highs.popleft()
+        if self.lows[0][0] <= expired:
+            self.lows.popleft()
+        self.index += 1
+
+    def seed(self, values):
+        values = np.asarray(values, dtype=float)
+        self.highs.clear()
+        self.lows.clear()
+        self.index = max(len(values) - self.period, 0)
+        for value in values[-self.period:].tolist():
+            self.update(value)
+
+
+class Stochastic:
+    def __init__(self, period=12, d_period=2):
+        self.extremes = RollingExtremes(period)
+        self.d = RollingStats(d_period)
+        self.value = (50, 50)
+
+    def update(self, price):
+        self.extremes.update(price)
+        if not self.extremes.ready:
+            return self.value
+        high, low = self.extremes.high, self.extremes.low
+        k = 50.0 if high == low else 100 * (price - low) / (high - low)
+        self.value = (k, self.d.update(k))
+        return self.value
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        period = self.extremes.period
+        self.extremes.seed(prices)
+        k, d = stochastic_series(prices, period, self.d.period)
+        self.d.seed(k[period - 1:])
+        self.value = (float(k[-1]), float(d[-1])) if self.extremes.ready else (50, 50)
+
+
+class Macd:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = Ema(fast)
+        self.slow = Ema(slow)
+        self.signal = Ema(signal)
+        self.value = (0, 0, 0)
+
+    def update(self, price):
+        self.fast.update(price)
+        self.slow.update(price)
+        if self.slow.count < self.slow.period:
+            return self.value
+        macd = self.fast.value - self.slow.value
+        signal = self.signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.fast.seed(prices)
+        self.slow.seed(prices)
+        slow = self.slow.period
+        if len(prices) < slow:
+            self.signal.seed([])
+            self.value = (0, 0, 0)
+            return
+        line = ema_series(prices, self.fast.period, False)[slow - 1:] - ema_series(prices, slow, False)[slow - 1:]
+        self.signal.seed(line)
+        macd = float(line[-1])
+        self.value = (macd, self.signal.value, macd - self.signal.value)
+
+
+class Momentum:
+    def __init__(self, period):
+        self.window = deque(maxlen=period + 1)
+        self.value = 0
+
+    def update(self, price):
+        self.window.append(price)
+        if len(self.window) == self.window.maxlen:
+            self.value = price - self.window[0]
+        return self.value
+
+    def seed(self, prices):
+        self.window.clear()
+        self.window.extend(np.asarray(prices, dtype=float)[-self.window.maxlen:].tolist())
+        self.value = self.window[-1] - self.window[0] if len(self.window) == self.window.maxlen else 0
+
+
+class RollingRegression:
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.reference = None
+        self.sum_y = 0.0
+        self.sum_yy = 0.0
+        self.sum_xy = 0.0
+        self.updates = 0
+
+    @property
+    def count(self):
+        return len(self.window)
+
+    def _moments(self):
+        n = len(self.window)
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return n * sum_xx - sum_x * sum_x, n * self.sum_xy - sum_x * self.sum_y, n * self.sum_yy - self.sum_y * self.sum_y
+
+    @property
+    def slope(self):
+        var_x, cov, _ = self._moments()
+        return cov / var_x if var_x > 0 else 0.0
+
+    @property
+    def r_value(self):
+        var_x, cov, var_y = self._moments()
+        if var_x <= 0 or var_y <= 0:
+            return 0.0
+        return max(-1.0, min(1.0, cov / (var_x * var_y) ** 0.5))
+
+    def update(self, value):
+        if self.reference is None:
+            self.reference = value
+        y = value - self.reference
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            self.sum_y -= old
+            self.sum_yy -= old * old
+            self.sum_xy -= self.sum_y
+        self.sum_xy += len(self.window) * y
+        self.window.append(y)
+        self.sum_y += y
+        self.sum_yy += y * y
+        self.updates += 1
+        if self.updates % self.period == 0:
+            self._recompute()
+
+    def seed(self, values):
+        tail = np.asarray(values, dtype=float)[-self.period:]
+        self.window = deque(tail.tolist())
+        self.reference = 0.0 if len(tail) else None
+        self.updates = len(values)
+        self.sum_y = self.sum_yy = self.sum_xy = 0.0
+        if len(tail):
+            self._recompute()
+
+    def _recompute(self):
+        values = np.fromiter(self.window, dtype=float) + self.reference
+        self.reference = float(values.mean())
+        y = values - self.reference
+        self.window = deque(y.tolist())
+        self.sum_y = float(y.sum())
+        self.sum_yy = float(y @ y)
+        self.sum_xy = float(np.arange(len(y)) @ y)
+
+
+class RollingVolatility:
+    def __init__(self, period):
+        self.returns = RollingStats(max(period - 1, 1))
+        self.previous = None
+
+    @property
+    def count(self):
+        return len(self.returns.window)
+
+    @property
+    def value(self):
+        return self.returns.std * 100
+
+    def update(self, price):
+        if self.previous:
+            self.returns.update((price - self.previous) / self.previous)
+        self.previous = price
+        return self.value
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.returns.seed(np.diff(prices) / prices[:-1] if len(prices) > 1 else [])
+        self.previous = float(prices[-1]) if len(prices) else None
+
+
+class RollingBeta:
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.sum_x = self.sum_y = self.sum_xx = self.sum_xy = 0.0
+        self.updates = 0
+
+    @property
+    def ready(self):
+        return len(self.window) == self.period
+
+    @property
+    def value(self):
+        n = len(self.window)
+        var_x = n * self.sum_xx - self.sum_x * self.sum_x
+        if n < 2 or var_x <= 0:
+            return 1.0
+        return (n * self.sum_xy - self.sum_x * self.sum_y) / var_x
+
+    def update(self, x, y):
+        if len(self.window) == self.period:
+            old_x, old_y = self.window.popleft()
+            self.sum_x -= old_x
+            self.sum_y -= old_y
+            self.sum_xx -= old_x * old_x
+            self.sum_xy -= old_x * old_y
+        self.window.append((x, y))
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xx += x * x
+        self.sum_xy += x * y
+        self.updates += 1
+        if self.updates % self.period == 0:
+            values = np.array(self.window)
+            self.sum_x, self.sum_y = values.sum(axis=0).tolist()
+            self.sum_xx = float(values[:, 0] @ values[:, 0])
+            self.sum_xy = float(values[:, 0] @ values[:, 1])
+        return self.value
+
+
+class RollingStatsArray:
+    def __init__(self, period, width):
+        self.period = period
+        self.window = np.zeros((period, width))
+        self.sums = np.zeros(width)
+        self.squares = np.zeros(width)
+        self.count = 0
+        self.updates = 0
+
+    @property
+    def ready(self):
+        return self.count == self.period
+
+    @property
+    def mean(self):
+        return self.sums / max(self.count, 1)
+
+    @property
+    def std(self):
+        mean = self.mean
+        return np.sqrt(np.maximum(self.squares / max(self.count, 1) - mean * mean, 0.0))
+
+    def update(self, values):
+        slot = self.updates % self.period
+        if self.count == self.period:
+            old = self.window[slot]
+            self.sums -= old
+            self.squares -= old * old
+        else:
+            self.count += 1
+        self.window[slot] = values
+        self.sums += values
+        self.squares += values * values
+        self.updates += 1
+        if self.updates % self.period == 0:
+            self.sums = self.window.sum(axis=0)
+            self.squares = (self.window * self.window).sum(axis=0)
+
+
+def _last(values):
+    value = float(values[-1]) if len(values) else np.nan
+    return None if np.isnan(value) else value
+
+
+class Atr:
+    def __init__(self, period=14):
+        self.period = period
+        self.previous_close = None
+        self.count = 0
+        self.total = 0.0
+        self.value = None
+
+    def update(self, high, low, close):
+        previous = self.previous_close
+        true_range = high - low if previous is None else max(high - low, abs(high - previous), abs(low - previous))
+        self.previous_close = close
+        self.count += 1
+        if self.count < self.period:
+            self.total += true_range
+        elif self.count == self.period:
+            self.value = (self.total + true_range) / self.period
+        else:
+            self.value += (true_range - self.value) / self.period
+        return self.value
+
+    def seed(self, high, low, close):
+        high, low, close = _ohlc(high, low, close)
+        true_range = true_range_series(high, low, close)
+        self.count = len(close)
+        self.previous_close = float(close[-1]) if len(close) else None
+        self.total = float(true_range.sum()) if self.count < self.period else 0.0
+        self.value = _last(_wilder_series(true_range, self.period))
+
+
+class Adx:
+    def __init__(self, period=14):
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.avg_tr = self.avg_plus = self.avg_minus = 0.0
+        self.dx_count = 0
+        self.dx_total = 0.0
+        self.plus_di = self.minus_di = None
+        self.value = None
+
+    def update(self, high, low, close):
+        if self.previous is None:
+            self.previous = (high, low, close)
+            return self.value
+        previous_high, previous_low, previous_close = self.previous
+        self.previous = (high, low, close)
+        true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        up, down = high - previous_high, previous_low - low
+        plus_dm = up if up > down and up > 0 else 0.0
+        minus_dm = down if down > up and down > 0 else 0.0
+        period = self.period
+        self.count += 1
+        if self.count <= period:
+            self.avg_tr += true_range / period
+            self.avg_plus += plus_dm / period
+            self.avg_minus += minus_dm / period
+            if self.count < period:
+                return self.value
+        else:
+            self.avg_tr += (true_range - self.avg_tr) / period
+            self.avg_plus += (plus_dm - self.avg_plus) / period
+            self.avg_minus += (minus_dm - self.avg_minus) / period
+        self.plus_di = 100 * self.avg_plus / self.avg_tr if self.avg_tr > 0 else 0.0
+        self.minus_di = 100 * self.avg_minus / self.avg_tr if self.avg_tr > 0 else 0.0
+        total = self.plus_di + self.minus_di
+        dx = 100 * abs(self.plus_di - self.minus_di) / total if total > 0 else 0.0
+        self.dx_count += 1
+        if self.dx_count < period:
+            self.dx_total += dx
+        elif self.dx_count == period:
+            self.value = (self.dx_total + dx) / period
+        else:
+            self.value += (dx - self.value) / period
+        return self.value
+
+    def seed(self, high, low, close):
+        high, low, close = _ohlc(high, low, close)
+        self.__init__(self.period)
+        if len(close) <= 2 * self.period:
+            for bar in zip(high.tolist(), low.tolist(), close.tolist()):
+                self.update(*bar)
+            return
+        true_range, plus_dm, minus_dm = _directional_movement(high, low, close)
+        self.avg_tr = float(_wilder_series(true_range, self.period, 1)[-1])
+        self.avg_plus = float(_wilder_series(plus_dm, self.period, 1)[-1])
+        self.avg_minus = float(_wilder_series(minus_dm, self.period, 1)[-1])
+        adx, plus_di, minus_di = adx_series(high, low, close, self.period)
+        self.value, self.plus_di, self.minus_di = float(adx[-1]), float(plus_di[-1]), float(minus_di[-1])
+        self.count = len(close) - 1
+        self.dx_count = self.count - self.period + 1
+        self.previous = (float(high[-1]), float(low[-1]), float(close[-1]))
+
+
+class Obv:
+    def __init__(self):
+        self.previous_close = None
+        self.value = 0.0
+
+    def update(self, close, volume):
+        if self.previous_close is not None and close != self.previous_close:
+            self.value += volume if close > self.previous_close else -volume
+        self.previous_close = close
+        return self.value
+
+    def seed(self, close, volume):
+        close = np.asarray(close, dtype=float)
+        self.value = float(obv_series(close, volume)[-1]) if len(close) else 0.0
+        self.previous_close = float(close[-1]) if len(close) else None
+
+
+class Vwap:
+    def __init__(self):
+        self.session = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    @property
+    def value(self):
+        return self.price_volume / self.volume if self.volume > 0 else None
+
+    def update(self, high, low, close, volume, session=None):
+        if session != self.session:
+            self.session = session
+            self.price_volume = self.volume = 0.0
+        self.price_volume += (high + low + close) / 3 * volume
+        self.volume += volume
+        return self.value
+
+    def seed(self, high, low, close, volume, sessions=None):
+        high, low, close = _ohlc(high, low, close)
+        volume = np.asarray(volume, dtype=float)
+        start = 0
+        self.session = None
+        if sessions is not None and len(sessions):
+            sessions = np.asarray(sessions)
+            self.session = sessions[-1].item()
+            start = len(sessions) - int(np.argmax(sessions[::-1] != sessions[-1])) if (sessions != sessions[-1]).any() else 0
+        self.price_volume = float(((high[start:] + low[start:] + close[start:]) / 3) @ volume[start:])
+        self.volume = float(volume[start:].sum())
+
+
+class KeltnerChannels:
+    def __init__(self, period=20, atr_period=10, multiplier=2.0):
+        self.multiplier = multiplier
+        self.ema = Ema(period)
+        self.atr = Atr(atr_period)
+
+    @property
+    def value(self):
+        if self.ema.count < self.ema.period or self.atr.value is None:
+            return None, None, None
+        middle = self.ema.value
+        width = self.atr.value * self.multiplier
+        return middle + width, middle, middle - width
+
+    def update(self, high, low, close):
+        self.ema.update(close)
+        self.atr.update(high, low, close)
+        return self.value
+
+    def seed(self, high, low, close):
+        self.ema.seed(close)
+        self.atr.seed(high, low, close)
+
+
+class DonchianChannels:
+    def __init__(self, period=20):
+        self.highs = RollingExtremes(period)
+        self.lows = RollingExtremes(period)
+
+    @property
+    def value(self):
+        if not self.highs.ready:
+            return None, None, None
+        upper, lower = self.highs.high, self.lows.low
+        return upper, (upper + lower) / 2, lower
+
+    def update(self, high, low):
+        self.highs.update(high)
+        self.lows.update(low)
+        return self.value
+
+    def seed(self, high, low):
+        self.highs.seed(high)
+        self.lows.seed(low)
+
+
+class Ichimoku:
+    def __init__(self, tenkan=9, kijun=26, senkou=52, displacement=26):
+        self.lines = [DonchianChannels(period) for period in (tenkan, kijun, senkou)]
+        self.spans = deque(maxlen=displacement + 1)
+        self.value = (None, None, None, None)
+
+    def update(self, high, low):
+        tenkan, kijun, span_b = (line.update(high, low)[1] for line in self.lines)
+        span_a = (tenkan + kijun) / 2 if tenkan is not None and kijun is not None else None
+        self.spans.append((span_a, span_b))
+        senkou_a, senkou_b = self.spans[0] if len(self.spans) == self.spans.maxlen else (None, None)
+        self.value = (tenkan, kijun, senkou_a, senkou_b)
+        return self.value
+
+    def seed(self, high, low):
+        high, low = np.asarray(high, dtype=float), np.asarray(low, dtype=float)
+        for line in self.lines:
+            line.seed(high, low)
+        tenkan, kijun, senkou = (line.highs.period for line in self.lines)
+        tenkan_sen, kijun_sen, _, _ = ichimoku_series(high, low, tenkan, kijun, senkou, self.spans.maxlen - 1)
+        span_a = (tenkan_sen + kijun_sen) / 2
+        span_b = (_rolling_max(high, senkou) + _rolling_min(low, senkou)) / 2
+        tail = slice(max(len(high) - self.spans.maxlen, 0), len(high))
+        self.spans.clear()
+        self.spans.extend((None if np.isnan(a) else float(a), None if np.isnan(b) else float(b)) for a, b in zip(span_a[tail], span_b[tail]))
+        senkou_a, senkou_b = self.spans[0] if len(self.spans) == self.spans.maxlen else (None, None)
+        self.value = (_last(tenkan_sen), _last(kijun_sen), senkou_a, senkou_b)
@@ -0,0 +1,190 @@
+import argparse
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from strategies.backtest import DEFAULT_CAPITAL, load_candles_csv, run_backtest
+
+try:
+    import optuna
+except ImportError:
+    optuna = None
+
+DEFAULT_GRID = {
+    'trend_slope_threshold': [0.0002, 0.0005, 0.001],
+    'trend_strength_threshold': [0.1, 0.2, 0.3],
+    'high_volatility_threshold': [1.5, 2.5, 3.5],
+    'signal_score_threshold': [3, 4, 5],
+    'required_profit_margin': [0.0005, 0.001, 0.002],
+}
+
+DEFAULT_SPACE = {
+    'trend_slope_threshold': (0.0001, 0.002),
+    'trend_strength_threshold': (0.05, 0.5),
+    'high_volatility_threshold': (1.0, 4.0),
+    'signal_score_threshold': [3, 4, 5],
+    'required_profit_margin': (0.0002, 0.004),
+    'trend_params.ema_fast': (3, 8),
+    'range_params.ema_fast': (3, 8),
+}
+
+SUMMARY_KEYS = ('total_return', 'max_drawdown', 'hit_rate', 'turnover', 'trade_count', 'commission')
+
+_worker_state = {}
+
+
+class SharedCandles:
+    def __init__(self, candles):
+        data = np.vstack([np.asarray(candles['time'], dtype=float), np.asarray(candles['close'], dtype=float)])
+        self.shape = data.shape
+        self.memory = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        np.ndarray(self.shape, dtype=float, buffer=self.memory.buf)[:] = data
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _init_worker(memory_name, shape, strategy_class, strategy_kwargs, initial_capital):
+    memory = shared_memory.SharedMemory(name=memory_name)
+    data = np.ndarray(shape, dtype=float, buffer=memory.buf)
+    _worker_state.update({
+        'memory': memory, 'candles': {'time': data[0], 'close': data[1]},
+        'strategy_class': strategy_class, 'strategy_kwargs': strategy_kwargs,
+        'initial_capital': initial_capital
+    })
+
+
+def evaluate_params(params):
+    strategy = _worker_state['strategy_class'](**_worker_state['strategy_kwargs'])
+    try:
+        strategy.set_params(params)
+        result = run_backtest(strategy, _worker_state['candles'], initial_capital=_worker_state['initial_capital'])
+    except Exception as error:
+        return {'params': params, 'error': str(error), 'total_return': float('-inf')}
+    summary = {key: result[key] for key in SUMMARY_KEYS}
+    summary['params'] = params
+    return summary
+
+
+def grid_candidates(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def sample_params(space, rng):
+    params = {}
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            low, high = values
+            params[name] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+        else:
+            params[name] = rng.choice(values)
+    return params
+
+
+def random_candidates(space, trials, seed=None):
+    rng = random.Random(seed)
+    return [sample_params(space, rng) for _ in range(trials)]
+
+
+def suggest_params(trial, space):
+    params = {}
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                params[name] = trial.suggest_int(name, low, high)
+            else:
+                params[name] = trial.suggest_float(name, low, high)
+        else:
+            params[name] = trial.suggest_categorical(name, values)
+    return params
+
+
+def rank_results(results):
+    return sorted(results, key=lambda result: result['total_return'], reverse=True)
+
+
+class Optimizer:
+    def __init__(self, candles, strategy_class, strategy_kwargs=None, workers=None, initial_capital=DEFAULT_CAPITAL):
+        self.candles = candles
+        self.strategy_class = strategy_class
+        self.strategy_kwargs = strategy_kwargs or {}
+        self.workers = workers or os.cpu_count() or 1
+        self.initial_capital = initial_capital
+
+    def _pool(self, shared):
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(shared.name, shared.shape, self.strategy_class, self.strategy_kwargs, self.initial_capital)
+        )
+
+    def evaluate(self, candidates):
+        with SharedCandles(self.candles) as shared, self._pool(shared) as pool:
+            chunksize = max(1, len(candidates) // (self.workers * 4))
+            return rank_results(list(pool.map(evaluate_params, candidates, chunksize=chunksize)))
+
+    def grid_search(self, grid=None):
+        return self.evaluate(grid_candidates(grid or DEFAULT_GRID))
+
+    def random_search(self, space=None, trials=200, seed=None):
+        return self.evaluate(random_candidates(space or DEFAULT_SPACE, trials, seed))
+
+    def bayesian_search(self, space=None, trials=200, seed=None):
+        if optuna is None:
+            raise RuntimeError("Для байесовской оптимизации установите optuna: pip install optuna")
+        space = space or DEFAULT_SPACE
+        study = optuna.create_study(direction='maximize', sampler=optuna.samplers.TPESampler(seed=seed))
+        results = []
+        with SharedCandles(self.candles) as shared, self._pool(shared) as pool:
+            while len(results) < trials:
+                batch = [study.ask() for _ in range(min(self.workers, trials - len(results)))]
+                candidates = [suggest_params(trial, space) for trial in batch]
+                for trial, result in zip(batch, pool.map(evaluate_params, candidates)):
+                    study.tell(trial, result['total_return'])
+                    results.append(result)
+        return rank_results(results)
+
+
+def main():
+    from strategies.advanced_strategy import CostAwareSmartStrategy
+
+    parser = argparse.ArgumentParser(description='Optimize CostAwareSmartStrategy parameters on a CSV of candles')
+    parser.add_argument('path', help='CSV: time,open,high,low,close (or time,price)')
+    parser.add_argument('--method', choices=['grid', 'random', 'bayes'], default='grid')
+    parser.add_argument('--trials', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    optimizer = Optimizer(load_candles_csv(args.path), CostAwareSmartStrategy, workers=args.workers)
+    if args.method == 'grid':
+        results = optimizer.grid_search()
+    elif args.method == 'random':
+        results = optimizer.random_search(trials=args.trials, seed=args.seed)
+    else:
+        results = optimizer.bayesian_search(trials=args.trials, seed=args.seed)
+
+    for result in results[:args.top]:
+        print(f"{result['total_return'] * 100:8.2f}%  сделок: {result.get('trade_count', 0):4}  "
+              f"просадка: {result.get('max_drawdown', 0) * 100:7.2f}%  {result['params']}")
+
+
+if __name__ == '__main__':
+    main()
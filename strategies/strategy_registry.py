@@ -0,0 +1,153 @@
+import ast
+import importlib
+import importlib.util
+import os
+from importlib import metadata
+
+from strategies.base_strategy import EVALUATION_MODES
+
+DATA_TYPES = ('ticks', 'bars', 'book')
+ENTRY_POINT_GROUP = 'tinkofftool.strategies'
+STRATEGY_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_CLASS = 'BaseStrategy'
+DECLARED_ATTRIBUTES = ('display_name', 'warmup', 'data_type', 'evaluation', 'evaluation_interval', 'bar_seconds')
+
+
+class StrategyPlugin:
+    def __init__(self, name, module, class_name, declared):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.warmup = int(declared.get('warmup', 0))
+        self.data_type = declared.get('data_type', 'ticks')
+        self.evaluation = declared.get('evaluation', 'tick')
+        self.evaluation_interval = declared.get('evaluation_interval', 1000)
+        self.bar_seconds = declared.get('bar_seconds', 60)
+        self.strategy_class = None
+        if self.data_type not in DATA_TYPES:
+            raise ValueError(f"{class_name}: unknown data type {self.data_type}")
+        if self.evaluation not in EVALUATION_MODES:
+            raise ValueError(f"{class_name}: unknown evaluation mode {self.evaluation}")
+
+    @property
+    def loaded(self):
+        return self.strategy_class is not None
+
+    def load(self):
+        if self.strategy_class is None:
+            self.strategy_class = getattr(importlib.import_module(self.module), self.class_name)
+        return self.strategy_class
+
+    def create(self, **kwargs):
+        return self.load()(**kwargs)
+
+    def history_seconds(self):
+        return self.warmup * (self.bar_seconds if self.data_type == 'bars' else 1)
+
+
+def _literal(node, constants):
+    if isinstance(node, ast.Name):
+        if node.id in constants:
+            return constants[node.id]
+        raise ValueError(node.id)
+    return ast.literal_eval(node)
+
+
+def parse_strategy_module(path):
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read(), path)
+    constants, classes = {}, {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = _literal(node.value, constants)
+            except ValueError:
+                pass
+        elif isinstance(node, ast.ClassDef):
+            bases = [base.id if isinstance(base, ast.Name) else base.attr for base in node.bases
+                     if isinstance(base, (ast.Name, ast.Attribute))]
+            declared = {}
+            for item in node.body:
+                if (isinstance(item, ast.Assign) and len(item.targets) == 1 and isinstance(item.targets[0], ast.Name)
+                        and item.targets[0].id in DECLARED_ATTRIBUTES):
+                    try:
+                        declared[item.targets[0].id] = _literal(item.value, constants)
+                    except ValueError:
+                        pass
+            classes[node.name] = (bases, declared)
+    return classes
+
+
+def resolve_declarations(name, classes, seen=()):
+    if name not in classes or name in seen:
+        return None
+    bases, declared = classes[name]
+    if name == BASE_CLASS:
+        return dict(declared)
+    for base in bases:
+        inherited = resolve_declarations(base, classes, seen + (name,))
+        if inherited is not None:
+            return {**inherited, **declared}
+    return None
+
+
+class StrategyRegistry:
+    def __init__(self, directory=STRATEGY_DIR, package='strategies', group=ENTRY_POINT_GROUP):
+        self.directory = directory
+        self.package = package
+        self.group = group
+        self.errors = []
+        self._plugins = None
+
+    @property
+    def plugins(self):
+        if self._plugins is None:
+            self._plugins = self.discover()
+        return self._plugins
+
+    def discover(self):
+        self.errors = []
+        classes, candidates = {}, []
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith('.py') or filename.startswith('_'):
+                continue
+            module = f"{self.package}.{filename[:-3]}" if self.package else filename[:-3]
+            try:
+                parsed = parse_strategy_module(os.path.join(self.directory, filename))
+            except (OSError, SyntaxError) as e:
+                self.errors.append(f"{filename}: {e}")
+                continue
+            classes.update(parsed)
+            candidates.extend((None, module, class_name) for class_name, (_, declared) in parsed.items() if declared.get('display_name'))
+
+        for entry_point in metadata.entry_points(group=self.group):
+            module, _, class_name = entry_point.value.partition(':')
+            try:
+                spec = importlib.util.find_spec(module)
+                classes.update(parse_strategy_module(spec.origin))
+            except Exception as e:
+                self.errors.append(f"{entry_point.name}: {e}")
+                continue
+            candidates.append((entry_point.name, module, class_name))
+
+        plugins = {}
+        for entry_name, module, class_name in candidates:
+            declared = resolve_declarations(class_name, classes)
+            if declared is None:
+                self.errors.append(f"{class_name}: не наследует {BASE_CLASS}")
+                continue
+            name = declared.get('display_name') or entry_name or class_name
+            try:
+                plugins[name] = StrategyPlugin(name, module, class_name, declared)
+            except ValueError as e:
+                self.errors.append(str(e))
+        return plugins
+
+    def names(self):
+        return list(self.plugins)
+
+    def get(self, name):
+        return self.plugins.get(name)
+
+    def __len__(self):
+        return len(self.plugins)
@@ -0,0 +1,99 @@
+import time
+
+import numpy as np
+
+
+def align_bars(series):
+    symbols = list(series)
+    times = np.unique(np.concatenate([np.asarray(series[symbol][0], dtype=float) for symbol in symbols]))
+    matrix = np.full((len(times), len(symbols)), np.nan)
+    for column, symbol in enumerate(symbols):
+        symbol_times, closes = (np.asarray(values, dtype=float) for values in series[symbol])
+        index = np.searchsorted(symbol_times, times, 'right') - 1
+        valid = index >= 0
+        matrix[valid, column] = closes[index[valid]]
+    return times, matrix
+
+
+class SyncBarFeed:
+    def __init__(self, symbols, seconds=60, maxlen=1000):
+        self.symbols = list(symbols)
+        self.columns = {symbol: column for column, symbol in enumerate(self.symbols)}
+        self.seconds = seconds
+        self.maxlen = maxlen
+        self.buffer = np.full((maxlen * 2, len(self.symbols)), np.nan)
+        self.times = np.zeros(maxlen * 2)
+        self.last = np.full(len(self.symbols), np.nan)
+        self.seen = np.zeros(len(self.symbols), dtype=bool)
+        self.bucket = None
+        self.end = 0
+        self.size = 0
+
+    @property
+    def ready(self):
+        return bool(self.seen.all())
+
+    def __len__(self):
+        return self.size
+
+    def update(self, symbol, price, ts=None):
+        column = self.columns.get(symbol)
+        if column is None:
+            return None
+        ts = time.time() if ts is None else ts
+        start = ts - ts % self.seconds
+        closed = None
+        if self.bucket is not None and start > self.bucket:
+            closed = self._close()
+        if self.bucket is None:
+            self.bucket = start
+        self.last[column] = price
+        self.seen[column] = True
+        return closed
+
+    def flush(self, ts=None):
+        ts = time.time() if ts is None else ts
+        if self.bucket is not None and ts >= self.bucket + self.seconds:
+            return self._close()
+        return None
+
+    def _close(self):
+        row = self.last.copy()
+        for offset in (self.end, self.end + self.maxlen):
+            self.buffer[offset] = row
+            self.times[offset] = self.bucket
+        self.end = (self.end + 1) % self.maxlen
+        self.size = min(self.size + 1, self.maxlen)
+        closed = (self.bucket, row)
+        self.bucket = None
+        return closed
+
+    def load(self, times, matrix):
+        times = np.asarray(times, dtype=float)[-self.maxlen:]
+        matrix = np.asarray(matrix, dtype=float)[-self.maxlen:]
+        self.size = len(times)
+        self.end = self.size % self.maxlen
+        for offset in (0, self.maxlen):
+            self.buffer[offset:offset + self.size] = matrix
+            self.times[offset:offset + self.size] = times
+        if self.size:
+            filled = ~np.isnan(matrix[-1])
+            self.last[filled] = matrix[-1][filled]
+            self.seen |= filled
+
+    def _span(self, period):
+        count = self.size if period is None else min(period, self.size)
+        end = self.end if self.end >= count else self.end + self.maxlen
+        return end - count, end
+
+    def window(self, period=None):
+        start, end = self._span(period)
+        view = self.buffer[start:end]
+        view.flags.writeable = False
+        return view
+
+    def time_window(self, period=None):
+        start, end = self._span(period)
+        view = self.times[start:end]
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,182 @@
+import argparse
+import importlib
+import json
+import pickle
+import queue
+import threading
+import time
+
+import numpy as np
+
+from strategies.base_strategy import SIGNAL_CODES, SIGNAL_NAMES
+
+TRACE_VERSION = 1
+BAR_FIELDS = ('ts', 'open', 'high', 'low', 'close', 'volume', 'signal', 'eval_ns')
+DEFAULT_BATCH = 4096
+
+
+class DecisionTrace:
+    def __init__(self, path, strategy, batch_size=DEFAULT_BATCH):
+        self.path = path
+        self.fields = BAR_FIELDS + tuple(strategy.trace_fields)
+        self.batch_size = batch_size
+        self.buffer = self._new_buffer()
+        self.size = 0
+        with open(path, 'wb') as file:
+            pickle.dump({'version': TRACE_VERSION, 'class': type(strategy).__name__, 'fields': self.fields}, file)
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._write, daemon=True)
+        self.writer.start()
+        self.checkpoint(strategy)
+
+    def _new_buffer(self):
+        return np.full((self.batch_size, len(self.fields)), np.nan)
+
+    def _write(self):
+        with open(self.path, 'ab') as file:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                kind, payload = item
+                if kind == 'rows':
+                    payload = np.ascontiguousarray(payload.T)
+                pickle.dump((kind, payload), file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.flush()
+
+    def record(self, bar, signal, elapsed, values):
+        row = bar + (SIGNAL_CODES.get(signal, 0), elapsed) + values
+        self.buffer[self.size, :len(row)] = row
+        self.size += 1
+        if self.size == self.batch_size:
+            self.flush()
+
+    def checkpoint(self, strategy):
+        self.flush()
+        self.queue.put(('snapshot', strategy.snapshot()))
+
+    def flush(self):
+        if self.size:
+            self.queue.put(('rows', self.buffer[:self.size]))
+            self.buffer = self._new_buffer()
+            self.size = 0
+
+    def close(self):
+        self.flush()
+        self.queue.put(None)
+        self.writer.join()
+
+    def __getstate__(self):
+        raise TypeError("DecisionTrace is not serializable")
+
+
+def load_trace(path):
+    segments = []
+    with open(path, 'rb') as file:
+        header = pickle.load(file)
+        if header.get('version') != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version: {header.get('version')}")
+        while True:
+            try:
+                kind, payload = pickle.load(file)
+            except EOFError:
+                break
+            if kind == 'snapshot':
+                segments.append({'snapshot': payload, 'rows': []})
+            elif segments:
+                segments[-1]['rows'].append(payload)
+    fields = header['fields']
+    for segment in segments:
+        rows = np.hstack(segment['rows']) if segment['rows'] else np.empty((len(fields), 0))
+        segment['columns'] = {field: rows[index] for index, field in enumerate(fields)}
+        del segment['rows']
+    return header, segments
+
+
+def replay_segment(strategy, segment, params=None):
+    strategy.restore(segment['snapshot'], with_params=True)
+    if params:
+        history = np.array(strategy.price_history.values())
+        strategy.set_params(params)
+        strategy.warm_up(history)
+    columns = segment['columns']
+    count = len(columns['ts'])
+    signals = np.zeros(count, dtype=np.int8)
+    elapsed = np.zeros(count, dtype=np.int64)
+    bars = zip(*(columns[field].tolist() for field in ('open', 'high', 'low', 'close', 'volume', 'ts')))
+    for index, (open, high, low, close, volume, ts) in enumerate(bars):
+        started = time.perf_counter_ns()
+        signal = strategy.on_bar(open, high, low, close, volume, ts)
+        elapsed[index] = time.perf_counter_ns() - started
+        if signal:
+            signals[index] = SIGNAL_CODES[signal]
+            strategy.update_position(signal, close)
+    return signals, elapsed
+
+
+def replay(path, strategy_class, params=None, strategy_kwargs=None):
+    header, segments = load_trace(path)
+    if strategy_class.__name__ != header['class']:
+        raise ValueError(f"Trace was recorded for {header['class']}, not {strategy_class.__name__}")
+    columns, signals, elapsed = [], [], []
+    for segment in segments:
+        strategy = strategy_class(**(strategy_kwargs or {}))
+        segment_signals, segment_elapsed = replay_segment(strategy, segment, params)
+        columns.append(segment['columns'])
+        signals.append(segment_signals)
+        elapsed.append(segment_elapsed)
+    recorded = {field: np.concatenate([segment[field] for segment in columns]) if columns else np.empty(0) for field in header['fields']}
+    return {
+        'recorded': recorded,
+        'signals': np.concatenate(signals) if signals else np.zeros(0, dtype=np.int8),
+        'eval_ns': np.concatenate(elapsed) if elapsed else np.zeros(0, dtype=np.int64)
+    }
+
+
+def diff_decisions(recorded, signals):
+    return np.flatnonzero(recorded['signal'].astype(np.int8) != signals)
+
+
+def latency_summary(eval_ns):
+    if not len(eval_ns):
+        return {'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+    p50, p99 = np.percentile(eval_ns, [50, 99])
+    return {'p50': float(p50) / 1000, 'p99': float(p99) / 1000, 'max': float(np.max(eval_ns)) / 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a strategy decision trace and diff the decisions')
+    parser.add_argument('path', help='Файл трассировки (*.trace)')
+    parser.add_argument('--module', default='strategies.advanced_strategy', help='Модуль с классом стратегии')
+    parser.add_argument('--params', default=None, help='JSON с параметрами, например {"signal_score_threshold": 3}')
+    parser.add_argument('--limit', type=int, default=20, help='Сколько расхождений и пиков латентности показать')
+    args = parser.parse_args()
+
+    header = load_trace(args.path)[0]
+    strategy_class = getattr(importlib.import_module(args.module), header['class'])
+    result = replay(args.path, strategy_class, json.loads(args.params) if args.params else None)
+    recorded = result['recorded']
+
+    print(f"Оценок в трассе: {len(recorded['ts'])}")
+    for label, values in (('записано', recorded['eval_ns']), ('реплей', result['eval_ns'])):
+        latency = latency_summary(values)
+        print(f"Латентность ({label}): p50 {latency['p50']:.1f} мкс | p99 {latency['p99']:.1f} мкс | max {latency['max']:.1f} мкс")
+
+    spikes = np.argsort(recorded['eval_ns'])[::-1][:args.limit]
+    if len(spikes):
+        print("Пики латентности:")
+        for index in spikes:
+            print(f"  ts {recorded['ts'][index]:.0f}  цена {recorded['close'][index]:.4f}  {recorded['eval_ns'][index] / 1000:.1f} мкс")
+
+    changed = diff_decisions(recorded, result['signals'])
+    print(f"Расхождений решений: {len(changed)}")
+    scores = [field for field in ('buy_score', 'sell_score') if field in recorded]
+    for index in changed[:args.limit]:
+        before = SIGNAL_NAMES.get(int(recorded['signal'][index]), '-')
+        after = SIGNAL_NAMES.get(int(result['signals'][index]), '-')
+        details = ' '.join(f"{field}={recorded[field][index]:.0f}" for field in scores)
+        print(f"  ts {recorded['ts'][index]:.0f}  цена {recorded['close'][index]:.4f}  {before} -> {after}  {details}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import argparse
+
+import numpy as np
+
+from strategies.backtest import DEFAULT_COMMISSION, load_candles_csv, run_backtest, simulate
+from strategies.optimizer import (
+    DEFAULT_GRID, DEFAULT_SPACE, Optimizer, SharedCandles, _worker_state, grid_candidates, random_candidates
+)
+
+
+def walk_forward_windows(count, train_size, test_size, step=None):
+    step = step or test_size
+    windows = []
+    start = 0
+    while start + train_size + test_size <= count:
+        windows.append((start, start + train_size, start + train_size + test_size))
+        start += step
+    return windows
+
+
+def window_return(strategy, candles, cache, start, end, initial_capital):
+    times, prices = candles['time'], candles['close']
+    if cache is None:
+        result = run_backtest(strategy, {'time': times[start:end], 'close': prices[start:end]}, 'bar', initial_capital)
+    else:
+        indicators, raw_signals = cache
+        signals = strategy.signals_from_indicators(prices, indicators, raw_signals, start, end)
+        commission = getattr(strategy, 'broker_commission', DEFAULT_COMMISSION)
+        result = simulate(times[start:end], prices[start:end], signals, commission, initial_capital)
+    return result['total_return'], result['trade_count']
+
+
+def evaluate_candidate(task):
+    params, windows = task
+    strategy = _worker_state['strategy_class'](**_worker_state['strategy_kwargs'])
+    candles = _worker_state['candles']
+    capital = _worker_state['initial_capital']
+    try:
+        strategy.set_params(params)
+        cache = None
+        if hasattr(strategy, 'batch_indicators'):
+            indicators = strategy.batch_indicators(candles['close'])
+            cache = (indicators, strategy.batch_raw_signals(indicators))
+        train = [window_return(strategy, candles, cache, start, split, capital) for start, split, _ in windows]
+        test = [window_return(strategy, candles, cache, split, end, capital) for _, split, end in windows]
+    except Exception as error:
+        return {'params': params, 'error': str(error)}
+    return {'params': params, 'train': train, 'test': test}
+
+
+class WalkForward(Optimizer):
+    def __init__(self, candles, strategy_class, train_size, test_size, step=None, **kwargs):
+        super().__init__(candles, strategy_class, **kwargs)
+        self.windows = walk_forward_windows(len(candles['close']), train_size, test_size, step)
+
+    def evaluate(self, candidates):
+        if not self.windows:
+            raise ValueError("Недостаточно данных для walk-forward окон")
+        tasks = [(params, self.windows) for params in candidates]
+        with SharedCandles(self.candles) as shared, self._pool(shared) as pool:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            results = [result for result in pool.map(evaluate_candidate, tasks, chunksize=chunksize) if 'error' not in result]
+        if not results:
+            raise ValueError("Ни один набор параметров не удалось оценить")
+        return self.summarize(results)
+
+    def summarize(self, results):
+        times = self.candles['time']
+        train_returns = np.array([[value[0] for value in result['train']] for result in results])
+        windows = []
+        for index, (start, split, end) in enumerate(self.windows):
+            best = int(np.argmax(train_returns[:, index]))
+            test_return, test_trades = results[best]['test'][index]
+            windows.append({
+                'train_start': float(times[start]), 'test_start': float(times[split]), 'test_end': float(times[end - 1]),
+                'params': results[best]['params'],
+                'train_return': float(train_returns[best, index]),
+                'test_return': test_return, 'test_trades': test_trades
+            })
+        test_returns = np.array([window['test_return'] for window in windows])
+        mean_train = np.mean([window['train_return'] for window in windows])
+        return {
+            'windows': windows,
+            'oos_return': float(np.prod(1 + test_returns) - 1),
+            'oos_hit_rate': float(np.mean(test_returns > 0)),
+            'efficiency': float(test_returns.mean() / mean_train) if mean_train > 0 else 0.0
+        }
+
+
+def main():
+    from strategies.advanced_strategy import CostAwareSmartStrategy
+
+    parser = argparse.ArgumentParser(description='Walk-forward validation of CostAwareSmartStrategy on a CSV of candles')
+    parser.add_argument('path', help='CSV: time,open,high,low,close (or time,price)')
+    parser.add_argument('--train', type=int, default=20000, help='Баров в обучающем окне')
+    parser.add_argument('--test', type=int, default=5000, help='Баров в тестовом окне')
+    parser.add_argument('--step', type=int, default=None)
+    parser.add_argument('--method', choices=['grid', 'random'], default='random')
+    parser.add_argument('--trials', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    walk_forward = WalkForward(
+        load_candles_csv(args.path), CostAwareSmartStrategy, args.train, args.test, args.step, workers=args.workers
+    )
+    if args.method == 'grid':
+        report = walk_forward.evaluate(grid_candidates(DEFAULT_GRID))
+    else:
+        report = walk_forward.evaluate(random_candidates(DEFAULT_SPACE, args.trials, args.seed))
+
+    for window in report['windows']:
+        print(f"train: {window['train_return'] * 100:7.2f}%  test: {window['test_return'] * 100:7.2f}%  "
+              f"сделок: {window['test_trades']:4}  {window['params']}")
+    print(f"OOS доходность: {report['oos_return'] * 100:.2f}%")
+    print(f"Прибыльных окон: {report['oos_hit_rate'] * 100:.1f}%")
+    print(f"Эффективность walk-forward: {report['efficiency']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from strategies.advanced_strategy import CostAwareSmartStrategy
+
+
+def synthetic_prices(count=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+
+
+def test_warm_up_leaves_position_flat():
+    prices = synthetic_prices()
+    strategy = CostAwareSmartStrategy()
+    assert np.count_nonzero(strategy.generate_signals(prices)) > 0
+    strategy.warm_up(prices)
+    assert strategy.position is None
+    assert strategy.entry_price == 0
+    assert strategy.trade_count == 0
+    assert strategy.total_commission == 0
+    assert 'Position' not in strategy.get_indicator_values()
+
+
+def test_warm_up_keeps_signal_state():
+    prices = synthetic_prices()
+    strategy = CostAwareSmartStrategy()
+    strategy.warm_up(prices)
+    assert len(strategy.price_history) > 0
+    assert strategy.signals
+
+
+def test_restore_keeps_configured_evaluation():
+    prices = synthetic_prices(500)
+    saved = CostAwareSmartStrategy()
+    saved.set_evaluation('interval', 5000)
+    saved.warm_up(prices)
+    data = saved.snapshot(123)
+
+    strategy = CostAwareSmartStrategy()
+    strategy.set_evaluation('bar')
+    assert strategy.restore(data) == 123
+    assert strategy.evaluation == 'bar'
+    assert strategy.evaluation_interval == CostAwareSmartStrategy.evaluation_interval
+    assert len(strategy.price_history) == len(saved.price_history)
+
+
+def test_restore_rejects_snapshot_with_other_params():
+    saved = CostAwareSmartStrategy()
+    saved.warm_up(synthetic_prices(500))
+    saved.signal_score_threshold += 1
+    data = saved.snapshot()
+
+    strategy = CostAwareSmartStrategy()
+    with pytest.raises(ValueError):
+        strategy.restore(data)
+    assert len(strategy.price_history) == 0
+    strategy.restore(data, with_params=True)
+    assert strategy.signal_score_threshold == saved.signal_score_threshold
+
+
+def test_overlay_series_matches_live_values():
+    prices = synthetic_prices(800, seed=5)
+    strategy = CostAwareSmartStrategy()
+    strategy.warm_up(prices[:300])
+    series = CostAwareSmartStrategy().get_overlay_series(prices)
+    for index in range(300, len(prices)):
+        price = prices[index]
+        strategy.on_bar(price, price, price, price, 0.0, index)
+        for name, value in strategy.get_overlay_values().items():
+            assert value == pytest.approx(series[name][index], rel=1e-9)
@@ -0,0 +1,28 @@
+from strategies.bars import BarAggregator, resample_candles
+
+
+def candle(ts, price):
+    return {'time': ts, 'open': price, 'high': price + 1, 'low': price - 1, 'close': price}
+
+
+def test_resample_candles_groups_by_bar_start():
+    candles = [candle(0, 10), candle(30, 12), candle(60, 11), candle(90, 9)]
+    bars = resample_candles(candles, 60, now=1000)
+    assert [bar['time'] for bar in bars] == [0, 60]
+    assert bars[0]['open'] == 10 and bars[0]['close'] == 12
+    assert bars[0]['high'] == 13 and bars[0]['low'] == 9
+    assert bars[1]['open'] == 11 and bars[1]['close'] == 9
+
+
+def test_resample_candles_drops_unfinished_bar():
+    candles = [candle(0, 10), candle(60, 11), candle(90, 12)]
+    assert [bar['time'] for bar in resample_candles(candles, 60, now=100)] == [0]
+
+
+def test_flush_closes_bar_without_next_tick():
+    bars = BarAggregator(60)
+    assert bars.update(10.0, 0.0, 5) is None
+    assert bars.flush(59) is None
+    closed = bars.flush(60)
+    assert closed['close'] == 10.0 and closed['ts'] == 0
+    assert bars.update(11.0, 0.0, 61) is None
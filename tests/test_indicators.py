@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from strategies.indicators import (
+    Adx, Atr, DonchianChannels, Ichimoku, KeltnerChannels, Obv, Vwap,
+    adx_series, atr_series, donchian_series, ichimoku_series, keltner_series, obv_series, vwap_series
+)
+
+COUNT = 300
+CUTS = (1, 5, 13, 27, 60, 151, 299)
+
+
+def make_bars(count=COUNT, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    close[40:45] = close[39]
+    spread = np.abs(rng.normal(0, 0.5, count))
+    high = close + spread + np.abs(rng.normal(0, 0.2, count))
+    low = close - spread - np.abs(rng.normal(0, 0.2, count))
+    volume = rng.integers(1, 1000, count).astype(float)
+    sessions = np.arange(count) // 50
+    return {'high': high, 'low': low, 'close': close, 'volume': volume, 'sessions': sessions}
+
+
+BARS = make_bars()
+
+
+def as_tuple(value):
+    return value if isinstance(value, tuple) else (value,)
+
+
+def assert_matches(streamed, expected, index):
+    for value, column in zip(as_tuple(streamed), expected):
+        if np.isnan(column[index]):
+            assert value is None or np.isnan(value), index
+        else:
+            assert value == pytest.approx(column[index], rel=1e-9, abs=1e-9), index
+
+
+INDICATORS = {
+    'atr': (
+        lambda: Atr(14),
+        lambda indicator, i: indicator.update(BARS['high'][i], BARS['low'][i], BARS['close'][i]),
+        lambda indicator, n: indicator.seed(BARS['high'][:n], BARS['low'][:n], BARS['close'][:n]),
+        lambda indicator: indicator.value,
+        lambda: (atr_series(BARS['high'], BARS['low'], BARS['close'], 14),)
+    ),
+    'adx': (
+        lambda: Adx(14),
+        lambda indicator, i: indicator.update(BARS['high'][i], BARS['low'][i], BARS['close'][i]),
+        lambda indicator, n: indicator.seed(BARS['high'][:n], BARS['low'][:n], BARS['close'][:n]),
+        lambda indicator: (indicator.value, indicator.plus_di, indicator.minus_di),
+        lambda: adx_series(BARS['high'], BARS['low'], BARS['close'], 14)
+    ),
+    'obv': (
+        Obv,
+        lambda indicator, i: indicator.update(BARS['close'][i], BARS['volume'][i]),
+        lambda indicator, n: indicator.seed(BARS['close'][:n], BARS['volume'][:n]),
+        lambda indicator: indicator.value,
+        lambda: (obv_series(BARS['close'], BARS['volume']),)
+    ),
+    'vwap': (
+        Vwap,
+        lambda indicator, i: indicator.update(BARS['high'][i], BARS['low'][i], BARS['close'][i], BARS['volume'][i], int(BARS['sessions'][i])),
+        lambda indicator, n: indicator.seed(BARS['high'][:n], BARS['low'][:n], BARS['close'][:n], BARS['volume'][:n], BARS['sessions'][:n]),
+        lambda indicator: indicator.value,
+        lambda: (vwap_series(BARS['high'], BARS['low'], BARS['close'], BARS['volume'], BARS['sessions']),)
+    ),
+    'keltner': (
+        lambda: KeltnerChannels(20, 10, 2.0),
+        lambda indicator, i: indicator.update(BARS['high'][i], BARS['low'][i], BARS['close'][i]),
+        lambda indicator, n: indicator.seed(BARS['high'][:n], BARS['low'][:n], BARS['close'][:n]),
+        lambda indicator: indicator.value,
+        lambda: keltner_series(BARS['high'], BARS['low'], BARS['close'], 20, 10, 2.0)
+    ),
+    'donchian': (
+        lambda: DonchianChannels(20),
+        lambda indicator, i: indicator.update(BARS['high'][i], BARS['low'][i]),
+        lambda indicator, n: indicator.seed(BARS['high'][:n], BARS['low'][:n]),
+        lambda indicator: indicator.value,
+        lambda: donchian_series(BARS['high'], BARS['low'], 20)
+    ),
+    'ichimoku': (
+        lambda: Ichimoku(9, 26, 52, 26),
+        lambda indicator, i: indicator.update(BARS['high'][i], BARS['low'][i]),
+        lambda indicator, n: indicator.seed(BARS['high'][:n], BARS['low'][:n]),
+        lambda indicator: indicator.value,
+        lambda: ichimoku_series(BARS['high'], BARS['low'], 9, 26, 52, 26)
+    ),
+}
+
+
+@pytest.mark.parametrize('name', INDICATORS)
+def test_update_matches_series(name):
+    create, update, _, _, series = INDICATORS[name]
+    expected = series()
+    indicator = create()
+    for index in range(COUNT):
+        assert_matches(update(indicator, index), expected, index)
+
+
+@pytest.mark.parametrize('name', INDICATORS)
+@pytest.mark.parametrize('cut', CUTS)
+def test_seed_then_stream_matches_series(name, cut):
+    create, update, seed, value, series = INDICATORS[name]
+    expected = series()
+    indicator = create()
+    seed(indicator, cut)
+    assert_matches(value(indicator), expected, cut - 1)
+    for index in range(cut, COUNT):
+        assert_matches(update(indicator, index), expected, index)
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+invest = pytest.importorskip('tinkoff.invest')
+
+import database
+from workers.order_stream_worker import OrderStreamWorker
+
+UID = 'e6123145-9665-43e0-8413-cd61b8aa9b13'
+BUY = invest.OrderDirection.ORDER_DIRECTION_BUY
+NEW = invest.OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_NEW
+PARTIAL = invest.OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_PARTIALLYFILL
+FILL = invest.OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_FILL
+
+
+def money(value):
+    units = int(value)
+    return SimpleNamespace(currency='rub', units=units, nano=int(round((value - units) * 1_000_000_000)))
+
+
+def stream_state(status, lots_executed, trades):
+    amount = sum(price * quantity for price, quantity in trades)
+    return SimpleNamespace(
+        order_id='R1', order_request_id='C1', client_code='', execution_report_status=status,
+        ticker='SBER', class_code='TQBR', lot_size=10, direction=BUY, lots_requested=3,
+        lots_executed=lots_executed, lots_left=3 - lots_executed, lots_cancelled=0,
+        executed_order_price=money(amount), amount=money(amount), instrument_uid=UID,
+        trades=[SimpleNamespace(price=money(price), quantity=quantity, trade_id=str(index))
+                for index, (price, quantity) in enumerate(trades)]
+    )
+
+
+def test_stream_states_without_average_price_apply_fills():
+    worker = OrderStreamWorker()
+    fills = []
+    worker.order_filled.connect(fills.append)
+    worker.on_order_state(stream_state(NEW, 0, []))
+    worker.on_order_state(stream_state(PARTIAL, 1, [(100.0, 10)]))
+    worker.on_order_state(stream_state(FILL, 3, [(100.0, 10), (103.0, 20)]))
+
+    assert [fill['lots'] for fill in fills] == [1, 2]
+    assert fills[0]['price'] == pytest.approx(100.0)
+    assert fills[1]['price'] == pytest.approx(103.0)
+    position = worker.get_positions()[UID]
+    assert position['ticker'] == 'SBER'
+    assert position['lots'] == 3
+    assert position['average_price'] == pytest.approx(102.0)
+
+
+def test_resync_accepts_get_orders_states(monkeypatch):
+    monkeypatch.setattr(database, 'get_cached_ticker', lambda uid: 'SBER' if uid == UID else None)
+    state = SimpleNamespace(
+        order_id='R2', execution_report_status=PARTIAL, lots_requested=5, lots_executed=2,
+        initial_order_price=money(5000.0), executed_order_price=money(2020.0), total_order_amount=money(5000.0),
+        average_position_price=money(101.0), figi='BBG004730N88', direction=BUY, order_request_id='C2',
+        instrument_uid=UID, stages=[SimpleNamespace(price=money(101.0), quantity=2, trade_id='1')]
+    )
+    portfolio = SimpleNamespace(positions=[SimpleNamespace(
+        figi='BBG004730N88', instrument_type='share', instrument_uid=UID,
+        quantity_lots=SimpleNamespace(units=2, nano=0), average_position_price=money(101.0)
+    )])
+    client = SimpleNamespace(
+        operations=SimpleNamespace(get_portfolio=lambda account_id: portfolio),
+        orders=SimpleNamespace(get_orders=lambda account_id: SimpleNamespace(orders=[state]))
+    )
+    worker = OrderStreamWorker()
+    worker.resync(client)
+
+    order, = worker.working_orders()
+    assert order['ticker'] == 'SBER'
+    assert order['lots_executed'] == 2
+    assert order['average_price'] == pytest.approx(101.0)
+    assert worker.get_positions()[UID]['lots'] == 2
@@ -0,0 +1,34 @@
+import pytest
+
+from workers.paper_trade_worker import PaperTradeWorker
+
+
+def test_fills_are_priced_per_lot():
+    worker = PaperTradeWorker(commission=0.001, slippage=0, latency=0, initial_cash=100000.0)
+    worker.set_context('sber', {'lot': 10})
+    worker.place_market_order('SBER', 'BUY', 2)
+    worker.on_tick('SBER', 100.0)
+    assert worker.cash == pytest.approx(100000.0 - 2000.0 - 2.0)
+    assert worker.positions['SBER']['average_price'] == pytest.approx(100.0)
+
+    worker.on_tick('SBER', 110.0)
+    position = worker.summary()['positions']['SBER']
+    assert position['value'] == pytest.approx(2200.0)
+    assert position['unrealized_pnl'] == pytest.approx(200.0)
+
+    worker.place_market_order('SBER', 'SELL', 2)
+    worker.on_tick('SBER', 110.0)
+    assert worker.realized_pnl == pytest.approx(200.0)
+    assert worker.total_commission == pytest.approx(2.0 + 2.2)
+    assert not worker.positions
+
+
+def test_buy_checks_cash_against_lot_notional():
+    worker = PaperTradeWorker(slippage=0, latency=0, initial_cash=1000.0)
+    worker.set_context('GAZP', {'lot': 100})
+    errors = []
+    worker.order_error.connect(errors.append)
+    worker.place_market_order('GAZP', 'BUY', 1)
+    worker.on_tick('GAZP', 100.0)
+    assert errors and not worker.positions
+    assert worker.cash == 1000.0
@@ -0,0 +1,43 @@
+import database
+from strategies.base_strategy import BaseStrategy
+from workers.strategy_worker import StrategyWorker
+
+
+class AlternatingStrategy(BaseStrategy):
+    evaluation = 'bar'
+
+    def __init__(self):
+        super().__init__("Alternating")
+        self.trade_count = 0
+
+    def analyze(self, current_price):
+        self.add_price(current_price)
+        return 'BUY' if len(self.price_history) % 2 else 'SELL'
+
+    def update_position(self, signal, price):
+        self.trade_count += 1
+        self.position = 'LONG' if signal == 'BUY' else None
+
+
+def make_candles(count, start=1_000_000_020, step=60):
+    return [{'time': start + step * index, 'open': 100.0, 'high': 100.0, 'low': 100.0, 'close': 100.0}
+            for index in range(count)]
+
+
+def test_restore_backfills_gap_without_trading(monkeypatch):
+    candles = make_candles(20)
+    saved = AlternatingStrategy()
+    saved_time = candles[9]['time'] - candles[9]['time'] % saved.bar_seconds
+    data = saved.snapshot(saved_time)
+    monkeypatch.setattr(database, 'load_strategy_snapshot', lambda key: data)
+
+    worker = StrategyWorker()
+    worker.strategy = AlternatingStrategy()
+    restored = []
+    worker.stateRestored.connect(lambda saved_time, backfilled: restored.append(backfilled))
+    worker.load_history('key', candles)
+
+    assert restored == [10]
+    assert len(worker.strategy.price_history) == 10
+    assert worker.strategy.trade_count == 0
+    assert worker.strategy.position is None
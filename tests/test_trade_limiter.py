@@ -0,0 +1,18 @@
+from workers.strategy_host import TradeLimiter
+
+
+def test_check_does_not_use_up_the_daily_limit():
+    limiter = TradeLimiter(max_daily_trades=1, min_trade_interval=60)
+    for _ in range(3):
+        assert limiter.check('SBER', now=1000.0) == (True, "")
+    assert limiter.trades_today == 0
+
+
+def test_recorded_trades_count_towards_limits():
+    limiter = TradeLimiter(max_daily_trades=2, min_trade_interval=60)
+    limiter.record('SBER', now=1000.0)
+    allowed, reason = limiter.check('SBER', now=1030.0)
+    assert not allowed and reason
+    assert limiter.check('GAZP', now=1030.0)[0]
+    limiter.record('GAZP', now=1030.0)
+    assert not limiter.check('LKOH', now=2000.0)[0]
@@ -0,0 +1,138 @@
+import base64
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from ui.chart_lod import COLUMN_COUNT, TIME, OPEN, CLOSE, LOW, HIGH, OhlcPyramid
+
+CANDLE_COLUMNS = ('time', 'open', 'close', 'low', 'high')
+DEFAULT_CHART_WIDTH = 1200
+OVERLAY_COLORS = ('#f59e0b', '#3b82f6', '#a855f7', '#94a3b8', '#64748b', '#94a3b8')
+
+
+def candle_columns(candles):
+    rows = np.array([(candle['time'], candle['open'], candle['close'], candle['low'], candle['high']) for candle in candles], dtype='<f8')
+    return np.ascontiguousarray(rows.reshape(-1, len(CANDLE_COLUMNS)).T)
+
+
+def pack_columns(columns):
+    if not columns.shape[1]:
+        return '', 0
+    packed = np.array(columns, dtype='<f8', order='C')
+    packed[TIME] *= 1000
+    return base64.b64encode(packed.tobytes()).decode('ascii'), columns.shape[1]
+
+
+class ChartBridge(QObject):
+    candlesLoaded = pyqtSignal(str, int, float, float, list, bool)
+    candleUpdated = pyqtSignal(float, float, float, float, float, list)
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.pyramid = OhlcPyramid()
+        self.zoom = (0.0, 100.0)
+        self.width = DEFAULT_CHART_WIDTH
+        self.level = 0
+        self.sent_window = None
+        self.payload = ''
+        self.count = 0
+        self.has_tail = False
+        self.last_candle = None
+        self.overlay_names = []
+
+    def load_candles(self, candles):
+        self.pyramid.load(candle_columns(candles) if candles else np.empty((COLUMN_COUNT, 0)))
+        self.overlay_names = []
+        self.last_candle = None
+        self.send_window()
+
+    def set_overlays(self, series):
+        self.overlay_names = list(series)
+        self.pyramid.set_extras([series[name] for name in self.overlay_names])
+        self.send_window()
+
+    def overlay_values(self, values):
+        return [None if np.isnan(value) else float(value) for value in values]
+
+    def zoom_window(self):
+        time_min, time_max = self.pyramid.time_range()
+        span = time_max - time_min
+        return time_min + span * self.zoom[0] / 100, time_min + span * self.zoom[1] / 100
+
+    def send_window(self, force=True):
+        if not self.pyramid.count():
+            self.clear()
+            return
+        start_time, end_time = self.zoom_window()
+        level = self.pyramid.level_for(self.pyramid.bars_between(start_time, end_time), self.width)
+        if not force and self.sent_window:
+            sent_level, sent_start, sent_end = self.sent_window
+            if level == sent_level and sent_start <= start_time and end_time <= sent_end:
+                return
+        margin = end_time - start_time
+        window = self.pyramid.window(level, start_time - margin, end_time + margin)
+        self.level = level
+        self.sent_window = (level, start_time - margin, end_time + margin)
+        self.payload, self.count = pack_columns(window)
+        self.has_tail = bool(window.shape[1] and window[TIME, -1] >= self.pyramid.level(level)[TIME, -1])
+        time_min, time_max = self.pyramid.time_range()
+        self.candlesLoaded.emit(self.payload, self.count, time_min * 1000, time_max * 1000, self.overlay_names, self.has_tail)
+
+    def update_candle(self, candle, overlays=None):
+        extras = None
+        if overlays is not None:
+            extras = [overlays.get(name, np.nan) for name in self.overlay_names]
+        self.pyramid.update_candle(candle, extras)
+        last = self.pyramid.level(min(self.level, len(self.pyramid.levels) - 1))[:, -1]
+        self.last_candle = (
+            float(last[TIME]) * 1000, float(last[OPEN]), float(last[CLOSE]),
+            float(last[LOW]), float(last[HIGH]), self.overlay_values(last[COLUMN_COUNT:])
+        )
+        self.candleUpdated.emit(*self.last_candle)
+
+    def clear(self):
+        self.pyramid.clear()
+        self.payload, self.count = '', 0
+        self.has_tail = False
+        self.sent_window = None
+        self.last_candle = None
+        self.overlay_names = []
+        self.candlesLoaded.emit('', 0, 0.0, 0.0, [], False)
+
+    @pyqtSlot()
+    def requestCandles(self):
+        if self.count:
+            time_min, time_max = self.pyramid.time_range()
+            self.candlesLoaded.emit(self.payload, self.count, time_min * 1000, time_max * 1000, self.overlay_names, self.has_tail)
+        if self.last_candle:
+            self.candleUpdated.emit(*self.last_candle)
+
+    @pyqtSlot()
+    def requestWindow(self):
+        self.send_window()
+
+    @pyqtSlot(float, float, int)
+    def zoomChanged(self, start, end, width):
+        self.zoom = (start, end)
+        if width > 0:
+            self.width = width
+        self.send_window(force=False)
+
+
+class PortfolioBridge(QObject):
+    portfolioUpdated = pyqtSignal(list, list, list)
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.data = None
+
+    def update_portfolio(self, labels, values, colors):
+        self.data = (labels, values, colors)
+        self.portfolioUpdated.emit(labels, values, colors)
+
+    @pyqtSlot()
+    def requestPortfolio(self):
+        if self.data:
+            self.portfolioUpdated.emit(*self.data)
@@ -0,0 +1,141 @@
+import numpy as np
+
+TIME, OPEN, CLOSE, LOW, HIGH = range(5)
+COLUMN_COUNT = 5
+
+LOD_FACTOR = 2
+MIN_LEVEL_BARS = 64
+MIN_BAR_PIXELS = 3
+
+
+def aggregate(columns, factor=LOD_FACTOR):
+    count = columns.shape[1]
+    starts = np.arange(0, count, factor)
+    ends = np.minimum(starts + factor, count) - 1
+    merged = np.empty((columns.shape[0], len(starts)))
+    if not count:
+        return merged
+    merged[TIME] = columns[TIME, starts]
+    merged[OPEN] = columns[OPEN, starts]
+    merged[CLOSE] = columns[CLOSE, ends]
+    merged[LOW] = np.minimum.reduceat(columns[LOW], starts)
+    merged[HIGH] = np.maximum.reduceat(columns[HIGH], starts)
+    merged[COLUMN_COUNT:] = columns[COLUMN_COUNT:, ends]
+    return merged
+
+
+def align_right(values, count):
+    values = np.asarray(values, dtype=float)[-count:] if count else np.empty(0)
+    if len(values) == count:
+        return values
+    return np.concatenate([np.full(count - len(values), np.nan), values])
+
+
+class OhlcPyramid:
+    def __init__(self, factor=LOD_FACTOR):
+        self.factor = factor
+        self.levels = []
+        self.counts = []
+        self.load(np.empty((COLUMN_COUNT, 0)))
+
+    @property
+    def width(self):
+        return self.levels[0].shape[0]
+
+    def load(self, columns):
+        self.levels = [self._allocate(columns)]
+        self.counts = [columns.shape[1]]
+        self._build_from(0)
+
+    def set_extras(self, rows):
+        base = self.level(0)[:COLUMN_COUNT]
+        self.load(np.vstack([base] + [align_right(row, base.shape[1]) for row in rows]))
+
+    def clear(self):
+        self.load(np.empty((COLUMN_COUNT, 0)))
+
+    def _allocate(self, data):
+        storage = np.empty((data.shape[0], max(data.shape[1] * 2, 256)))
+        storage[:, :data.shape[1]] = data
+        return storage
+
+    def _build_from(self, level):
+        del self.levels[level + 1:]
+        del self.counts[level + 1:]
+        while self.counts[-1] > MIN_LEVEL_BARS:
+            merged = aggregate(self.level(len(self.levels) - 1), self.factor)
+            self.levels.append(self._allocate(merged))
+            self.counts.append(merged.shape[1])
+
+    def _append(self, level, values):
+        storage = self.levels[level]
+        count = self.counts[level]
+        if count == storage.shape[1]:
+            grown = np.empty((storage.shape[0], count * 2))
+            grown[:, :count] = storage[:, :count]
+            self.levels[level] = storage = grown
+        storage[:, count] = values
+        self.counts[level] = count + 1
+
+    def _refresh_last(self, level):
+        lower = self.level(level - 1)
+        last = (lower.shape[1] - 1) // self.factor
+        group = lower[:, last * self.factor:]
+        values = (group[TIME, 0], group[OPEN, 0], group[CLOSE, -1], group[LOW].min(), group[HIGH].max(), *group[COLUMN_COUNT:, -1])
+        if last < self.counts[level]:
+            self.levels[level][:, last] = values
+        else:
+            self._append(level, values)
+
+    def update_candle(self, candle, extras=None):
+        values = [candle['time'], candle['open'], candle['close'], candle['low'], candle['high']]
+        count = self.counts[0]
+        if extras is not None:
+            values.extend(extras)
+        elif count and self.levels[0][TIME, count - 1] == candle['time']:
+            values.extend(self.levels[0][COLUMN_COUNT:, count - 1])
+        else:
+            values.extend([np.nan] * (self.width - COLUMN_COUNT))
+        self.update(values)
+
+    def update(self, values):
+        count = self.counts[0]
+        if count and self.levels[0][TIME, count - 1] == values[TIME]:
+            self.levels[0][:, count - 1] = values
+        else:
+            self._append(0, values)
+        for level in range(1, len(self.levels)):
+            self._refresh_last(level)
+        if self.counts[-1] > MIN_LEVEL_BARS * self.factor:
+            self._build_from(len(self.levels) - 1)
+
+    def level(self, index):
+        return self.levels[index][:, :self.counts[index]]
+
+    def count(self, level=0):
+        return self.counts[level]
+
+    def scale(self, level):
+        return self.factor ** level
+
+    def level_for(self, bars, pixels):
+        limit = max(pixels / MIN_BAR_PIXELS, 1)
+        level = 0
+        while level + 1 < len(self.levels) and bars / self.scale(level) > limit:
+            level += 1
+        return level
+
+    def time_range(self):
+        if not self.counts[0]:
+            return 0.0, 0.0
+        return float(self.levels[0][TIME, 0]), float(self.levels[0][TIME, self.counts[0] - 1])
+
+    def bars_between(self, start_time, end_time):
+        times = self.level(0)[TIME]
+        return int(np.searchsorted(times, end_time, 'right') - np.searchsorted(times, start_time, 'left'))
+
+    def window(self, level, start_time, end_time):
+        data = self.level(level)
+        start = max(int(np.searchsorted(data[TIME], start_time, 'right')) - 1, 0)
+        end = int(np.searchsorted(data[TIME], end_time, 'right'))
+        return data[:, start:end]
@@ -1,32 +1,45 @@
 from collections import deque
 from datetime import datetime, timezone
 import json
+import math
 import os
 import sys
+import time
 import configparser
 import logging
+import numpy as np
 
 from PyQt6.QtGui import QAction
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebChannel import QWebChannel
-from PyQt6.QtCore import QObject
 from PyQt6.QtCore import QThread, Qt, pyqtSignal, QTimer
 from PyQt6.QtWidgets import (
     QComboBox, QDialog, QGridLayout, QHBoxLayout,
     QHeaderView, QLabel, QLineEdit, QListWidget, QMainWindow, QPushButton,
     QSplitter, QTableWidget, QTableWidgetItem, QTabWidget, QTextEdit,
-    QVBoxLayout, QWidget, QSizePolicy, QGroupBox, QCheckBox, QSpinBox,
+    QVBoxLayout, QWidget, QSizePolicy, QGroupBox, QCheckBox, QSpinBox, QDoubleSpinBox,
     QFileDialog, QSystemTrayIcon, QMenu, QApplication, QAbstractItemView
 )
 
 from workers.api_worker import ApiWorker
-from workers.stream_worker import MarketStreamWorker
-from workers.trade_worker import TradeWorker
-from workers.sender import send_signal
+from workers.stream_worker import MarketStreamWorker, MultiMarketStreamWorker
+from workers.strategy_host import StrategyHost, TradeLimiter
+from workers.trade_worker import TradeWorker, new_client_order_id
+from workers.order_stream_worker import OrderStreamWorker
+from workers.paper_trade_worker import PaperTradeWorker
+from workers.sender import send_signal_async
+from workers.strategy_worker import StrategyWorker
+from workers.basket_worker import BasketWorker
+from strategies.strategy_registry import StrategyRegistry
 import account
+import database
 from ui import styles
+from ui.chart_bridge import OVERLAY_COLORS, ChartBridge, PortfolioBridge
+from ui.native_chart import CandlestickWidget, PortfolioPieWidget
+from ui.web_assets import base_url, install_scheme_handler
 
 BROKER_COMMISSION = 0.0005
+CHART_VIEWS_DELAY = 50
 
 def apply_broker_commission(price, direction='BUY'):
     if direction == 'BUY':
@@ -41,9 +54,12 @@ LOG_LEVELS = {
     'ERROR': logging.ERROR
 }
 
-STRATEGY_PARAMS = {
-    "Advanced Strategy": {"min_prices": 20},
-}
+NO_STRATEGY = "Выберите стратегию"
+STREAM_HISTORY_HOURS = 6
+
+EVALUATION_MODES = {"Bar close": 'bar', "Every tick": 'tick', "Every N ms": 'interval'}
+
+PARALLEL_MODES = {"Per ticker": 'tickers', "Pairs": 'pairs', "Basket": 'basket'}
 
 CATEGORY_COLORS = {
     'Акции': '#FF6B6B', 'Облигации': '#4ECDC4', 'Валюта': '#FFE66D', 'Фонды': '#95E1D3',
@@ -183,6 +199,19 @@ class AccountManagerWindow(QMainWindow):
 class MainWindow(QMainWindow):
     requestConnect = pyqtSignal()
     requestFetchPortfolio = pyqtSignal()
+    strategySelected = pyqtSignal(object)
+    strategyHistory = pyqtSignal(str, list)
+    strategyPrice = pyqtSignal(float)
+    strategyReset = pyqtSignal()
+    strategySave = pyqtSignal()
+    strategyTrace = pyqtSignal(str)
+    strategyEvaluation = pyqtSignal(str, int)
+    strategyExecution = pyqtSignal(float, int)
+    strategyLivePositions = pyqtSignal(bool)
+    orderPrepare = pyqtSignal(str, str)
+    orderRequested = pyqtSignal(str, str, str, int, float, float)
+    strategyOverlays = pyqtSignal(object)
+    basketSelected = pyqtSignal(object)
 
     def __init__(self):
         super().__init__()
@@ -190,9 +219,11 @@ class MainWindow(QMainWindow):
         self.setup_ui()
         self.setup_workers()
         self.setup_tray_icon()
+        QTimer.singleShot(CHART_VIEWS_DELAY, self.create_chart_views)
         
     def setup_variables(self):
         self.active_strategy = None
+        self.parallel_mode = None
         self.worker = None
         self.streamWorker = None
         self.tradeWorker = None
@@ -204,17 +235,22 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(styles.DARK_THEME["main_window"])
         self.SETTINGS_FILE = "app_settings.ini"
         self.DEFAULT_SETTINGS = {
-            'chart': {'theme': 'Темная', 'show_grid': 'false', 'show_volume': 'false', 'auto_refresh_portfolio': 'true', 'refresh_interval': '60'},
+            'chart': {'theme': 'Темная', 'backend': 'Web', 'show_grid': 'false', 'show_volume': 'false', 'auto_refresh_portfolio': 'true', 'refresh_interval': '60', 'history_hours': str(STREAM_HISTORY_HOURS)},
             'notifications': {'enable_telegram': 'false', 'telegram_token': '', 'telegram_chat_id': ''},
             'system': {'auto_start': 'false', 'minimize_to_tray': 'false', 'log_level': 'INFO'},
-            'strategies': {'testing_mode': 'true', 'auto_start_strategy': 'false', 'allow_parallel_strategies': 'false', 'max_daily_trades': '50', 'min_trade_interval': '60'}
+            'strategies': {'testing_mode': 'true', 'auto_start_strategy': 'false', 'allow_parallel_strategies': 'false', 'max_daily_trades': '50', 'min_trade_interval': '60', 'parallel_tickers': '', 'strategy_shards': '0', 'paper_slippage': '0.02', 'paper_latency': '50'}
         }
         self.chart_data = deque(maxlen=10000)
+        self.chart_backend = 'Web'
+        self.asset_handler = None
+        self.portfolio_chart_data = None
         self.is_loading_history = False
         self.pending_stream_ticker = None
         self.pending_stream_token = None
         self.current_ticker = None
         self.current_token = None
+        self.strategy_registry = StrategyRegistry()
+        self.strategy_plugin = None
         self.stream_auto_reconnect = False
         self.stream_reconnect_delay = 5
         self.candles = []
@@ -302,21 +338,12 @@ class MainWindow(QMainWindow):
         self.positionsTable.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.positionsTable.setStyleSheet(styles.DARK_THEME["table_widget"])
         self.positionsTable.setSortingEnabled(True)
-        self.pieChart = QWebEngineView(self.tab_portfolio)
-        self.pieChart.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        class ChartBridge(QObject):
-            def __init__(self, main_window):
-                super().__init__()
-                self.main_window = main_window
-        self.chart_bridge = ChartBridge(self)
-        self.channel = QWebChannel()
-        self.channel.registerObject("pyObject", self.chart_bridge)
-        self.pieChart.page().setWebChannel(self.channel)
-        self.pieChart.setHtml(self._get_pie_chart())
+        self.pieChart = None
+        self.portfolio_bridge = PortfolioBridge(self)
+        self.portfolio_chart = self.portfolio_bridge
         splitter.addWidget(self.positionsTable)
-        splitter.addWidget(self.pieChart)
-        splitter.setSizes([400, 300])
         splitter.setChildrenCollapsible(False)
+        self.portfolio_splitter = splitter
         layout.addLayout(metrics_layout)
         layout.addWidget(splitter)
 
@@ -330,6 +357,7 @@ class MainWindow(QMainWindow):
         strategy_layout.setContentsMargins(0, 0, 0, 0)
         self.setup_strategy_selection(strategy_layout)
         self.setup_strategy_status(strategy_layout)
+        self.setup_parallel_strategies(strategy_layout)
         self.setup_strategy_log(strategy_layout)
         main_layout.addWidget(strategy_container, 1)
 
@@ -342,7 +370,7 @@ class MainWindow(QMainWindow):
         strategy_label.setStyleSheet(styles.DARK_THEME["label_primary"])
         strategy_select_layout.addWidget(strategy_label)
         self.strategyCombo = QComboBox()
-        self.strategyCombo.addItems(["Выберите стратегию", "Advanced Strategy"])
+        self.strategyCombo.addItems([NO_STRATEGY] + self.strategy_registry.names())
         self.strategyCombo.setStyleSheet(styles.DARK_THEME["combo_box"])
         self.strategyCombo.currentIndexChanged.connect(self.strategy_changed)
         strategy_select_layout.addWidget(self.strategyCombo)
@@ -355,7 +383,31 @@ class MainWindow(QMainWindow):
         self.paramsLabel.setStyleSheet(styles.DARK_THEME["label_secondary"])
         self.paramsLabel.setMinimumHeight(35)
         params_layout.addWidget(self.paramsLabel, 1)
+        evaluation_layout = QHBoxLayout()
+        evaluation_label = QLabel("Evaluation:")
+        evaluation_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        evaluation_layout.addWidget(evaluation_label)
+        self.evaluationCombo = QComboBox()
+        self.evaluationCombo.addItems(list(EVALUATION_MODES))
+        self.evaluationCombo.setStyleSheet(styles.DARK_THEME["combo_box"])
+        self.evaluationCombo.currentIndexChanged.connect(self.evaluation_changed)
+        evaluation_layout.addWidget(self.evaluationCombo)
+        self.evaluationInterval = QSpinBox()
+        self.evaluationInterval.setStyleSheet(styles.DARK_THEME["spinbox"])
+        self.evaluationInterval.setRange(50, 60000)
+        self.evaluationInterval.setSingleStep(100)
+        self.evaluationInterval.setValue(1000)
+        self.evaluationInterval.setSuffix(" ms")
+        self.evaluationInterval.setEnabled(False)
+        self.evaluationInterval.valueChanged.connect(self.evaluation_changed)
+        evaluation_layout.addWidget(self.evaluationInterval)
+        self.traceCheckBox = QCheckBox("Trace decisions")
+        self.traceCheckBox.setStyleSheet(styles.DARK_THEME["checkbox"])
+        self.traceCheckBox.toggled.connect(self.trace_changed)
+        evaluation_layout.addWidget(self.traceCheckBox)
+        evaluation_layout.addStretch()
         strategy_layout.addLayout(strategy_select_layout)
+        strategy_layout.addLayout(evaluation_layout)
         strategy_layout.addLayout(params_layout)
         parent_layout.addWidget(strategy_group)
 
@@ -370,8 +422,46 @@ class MainWindow(QMainWindow):
         self.signalStatsLabel = QLabel("Stats: BUY: 0, SELL: 0, All: 0")
         self.signalStatsLabel.setStyleSheet(styles.DARK_THEME["label_secondary"])
         status_layout.addWidget(self.signalStatsLabel)
+        self.paperStatsLabel = QLabel("Paper: -")
+        self.paperStatsLabel.setStyleSheet(styles.DARK_THEME["label_secondary"])
+        status_layout.addWidget(self.paperStatsLabel)
+        self.liveStatsLabel = QLabel("Live: -")
+        self.liveStatsLabel.setStyleSheet(styles.DARK_THEME["label_secondary"])
+        status_layout.addWidget(self.liveStatsLabel)
         parent_layout.addWidget(status_group)
 
+    def setup_parallel_strategies(self, parent_layout):
+        parallel_group = QGroupBox("Parallel strategies")
+        parallel_group.setStyleSheet(styles.DARK_THEME["group_box"])
+        parallel_layout = QVBoxLayout(parallel_group)
+        buttons_layout = QHBoxLayout()
+        self.parallelModeCombo = QComboBox()
+        self.parallelModeCombo.addItems(list(PARALLEL_MODES))
+        self.parallelModeCombo.setStyleSheet(styles.DARK_THEME["combo_box"])
+        buttons_layout.addWidget(self.parallelModeCombo)
+        self.parallelStartBtn = QPushButton("Start")
+        self.parallelStartBtn.setStyleSheet(styles.DARK_THEME["button_secondary"])
+        self.parallelStartBtn.setEnabled(False)
+        self.parallelStartBtn.clicked.connect(self.start_parallel_strategies)
+        self.parallelStopBtn = QPushButton("Stop")
+        self.parallelStopBtn.setStyleSheet(styles.DARK_THEME["button_secondary"])
+        self.parallelStopBtn.setEnabled(False)
+        self.parallelStopBtn.clicked.connect(self.stop_parallel_strategies)
+        buttons_layout.addWidget(self.parallelStartBtn)
+        buttons_layout.addWidget(self.parallelStopBtn)
+        buttons_layout.addStretch()
+        parallel_layout.addLayout(buttons_layout)
+        self.parallelTable = QTableWidget()
+        self.parallelTable.setColumnCount(7)
+        self.parallelTable.setHorizontalHeaderLabels(["Ticker", "Strategy", "Price", "Ticks", "Bars", "Signals", "Last signal"])
+        self.parallelTable.horizontalHeader().setStretchLastSection(True)
+        self.parallelTable.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.parallelTable.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.parallelTable.setStyleSheet(styles.DARK_THEME["table_widget"])
+        self.parallelTable.setSortingEnabled(True)
+        parallel_layout.addWidget(self.parallelTable)
+        parent_layout.addWidget(parallel_group, 1)
+
     def setup_strategy_log(self, parent_layout):
         log_group = QGroupBox("Signals log")
         log_group.setStyleSheet(styles.DARK_THEME["group_box"])
@@ -459,19 +549,55 @@ class MainWindow(QMainWindow):
         parent_layout.addLayout(order_layout)
 
     def setup_chart_widget(self, parent_layout):
-        self.plotWidget = QWebEngineView(self.tab_chart)
-        self.plotWidget.setMinimumHeight(400)
-        self.plotWidget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        class ChartBridge(QObject):
-            def __init__(self, main_window):
-                super().__init__()
-                self.main_window = main_window
+        self.plotWidget = None
         self.chart_bridge = ChartBridge(self)
-        self.channel = QWebChannel()
-        self.channel.registerObject("pyObject", self.chart_bridge)
-        self.plotWidget.page().setWebChannel(self.channel)
-        self.plotWidget.setHtml(self._get_empty_chart_html())
-        parent_layout.addWidget(self.plotWidget, 1)
+        self.candle_chart = self.chart_bridge
+        self.chart_layout = parent_layout
+
+    def create_chart_views(self):
+        if self.pieChart or self.plotWidget:
+            return
+        if self.chart_backend == 'Native':
+            self.pieChart = PortfolioPieWidget(self.tab_portfolio)
+            self.plotWidget = CandlestickWidget(self.tab_chart)
+            self.portfolio_chart = self.pieChart
+            self.candle_chart = self.plotWidget
+        else:
+            if not self.asset_handler:
+                self.asset_handler = install_scheme_handler(self)
+            self.pieChart = self._create_web_view(self.tab_portfolio, self.portfolio_bridge, self._get_pie_chart())
+            self.plotWidget = self._create_web_view(self.tab_chart, self.chart_bridge, self._get_empty_chart_html())
+            self.portfolio_chart = self.portfolio_bridge
+            self.candle_chart = self.chart_bridge
+        self.portfolio_splitter.addWidget(self.pieChart)
+        self.portfolio_splitter.setSizes([400, 300])
+        self.plotWidget.setMinimumHeight(400)
+        self.chart_layout.addWidget(self.plotWidget, 1)
+
+    def change_chart_backend(self, backend):
+        if backend == self.chart_backend:
+            return
+        self.chart_backend = backend
+        if not self.pieChart and not self.plotWidget:
+            return
+        for view in (self.pieChart, self.plotWidget):
+            view.setParent(None)
+            view.deleteLater()
+        self.pieChart = None
+        self.plotWidget = None
+        self.create_chart_views()
+        if self.portfolio_chart_data:
+            self.portfolio_chart.update_portfolio(*self.portfolio_chart_data)
+        self._update_candlestick_chart()
+
+    def _create_web_view(self, parent, bridge, html):
+        view = QWebEngineView(parent)
+        view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        channel = QWebChannel(view.page())
+        channel.registerObject("pyObject", bridge)
+        view.page().setWebChannel(channel)
+        view.setHtml(html, base_url())
+        return view
 
     def setup_settings_tab(self):
         main_layout = QVBoxLayout(self.tab_settings)
@@ -535,6 +661,14 @@ class MainWindow(QMainWindow):
         self.theme_combo.setStyleSheet(styles.DARK_THEME["combo_box"])
         self.theme_combo.currentTextChanged.connect(self.change_theme)
         chart_layout.addWidget(self.theme_combo, 0, 1)
+        backend_label = QLabel("Chart backend:")
+        backend_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        chart_layout.addWidget(backend_label, 1, 0)
+        self.chart_backend_combo = QComboBox()
+        self.chart_backend_combo.addItems(["Web", "Native"])
+        self.chart_backend_combo.setStyleSheet(styles.DARK_THEME["combo_box"])
+        self.chart_backend_combo.currentTextChanged.connect(self.change_chart_backend)
+        chart_layout.addWidget(self.chart_backend_combo, 1, 1)
         self.show_grid = QCheckBox("Show grid")
         self.show_grid.setStyleSheet(styles.DARK_THEME["checkbox"])
         self.show_grid.setChecked(False)
@@ -561,6 +695,15 @@ class MainWindow(QMainWindow):
         self.auto_refresh_portfolio.toggled.connect(self.refresh_interval.setEnabled)
         self.refresh_interval.valueChanged.connect(self.on_refresh_interval_changed)
         chart_layout.addWidget(self.refresh_interval, 5, 1)
+        history_label = QLabel("Chart history:")
+        history_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        chart_layout.addWidget(history_label, 6, 0)
+        self.chart_history_hours = QSpinBox()
+        self.chart_history_hours.setStyleSheet(styles.DARK_THEME["spinbox"])
+        self.chart_history_hours.setRange(1, 24 * 90)
+        self.chart_history_hours.setValue(STREAM_HISTORY_HOURS)
+        self.chart_history_hours.setSuffix(" ч")
+        chart_layout.addWidget(self.chart_history_hours, 6, 1)
         parent_layout.addWidget(chart_group)
 
     def setup_notification_settings(self, parent_layout):
@@ -620,7 +763,6 @@ class MainWindow(QMainWindow):
     def setup_strategy_settings(self, parent_layout):
         strategies_config_group = QGroupBox("Strategies config")
         strategies_config_group.setStyleSheet(styles.DARK_THEME["group_box"])
-        strategies_config_group.setEnabled(False)
         strategies_config_layout = QVBoxLayout(strategies_config_group)
         strategies_config_layout.setSpacing(10)
         self.testing_mode = QCheckBox("Testing mode")
@@ -634,7 +776,52 @@ class MainWindow(QMainWindow):
         self.allow_parallel_strategies = QCheckBox("Allow parallel strategies")
         self.allow_parallel_strategies.setStyleSheet(styles.DARK_THEME["checkbox"])
         self.allow_parallel_strategies.setChecked(False)
+        self.allow_parallel_strategies.toggled.connect(self.toggle_parallel_strategies)
         strategies_config_layout.addWidget(self.allow_parallel_strategies)
+        parallel_tickers_layout = QHBoxLayout()
+        parallel_tickers_label = QLabel("Parallel tickers:")
+        parallel_tickers_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        parallel_tickers_layout.addWidget(parallel_tickers_label)
+        self.parallel_tickers = QLineEdit()
+        self.parallel_tickers.setStyleSheet(styles.DARK_THEME["line_edit"])
+        self.parallel_tickers.setPlaceholderText("SBER, GAZP, LKOH, ...")
+        parallel_tickers_layout.addWidget(self.parallel_tickers, 1)
+        strategies_config_layout.addLayout(parallel_tickers_layout)
+        shards_layout = QHBoxLayout()
+        shards_label = QLabel("Strategy processes:")
+        shards_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        shards_layout.addWidget(shards_label)
+        self.strategy_shards = QSpinBox()
+        self.strategy_shards.setStyleSheet(styles.DARK_THEME["spinbox"])
+        self.strategy_shards.setRange(0, 64)
+        self.strategy_shards.setValue(0)
+        self.strategy_shards.setSpecialValueText("Auto")
+        shards_layout.addWidget(self.strategy_shards)
+        shards_layout.addStretch()
+        strategies_config_layout.addLayout(shards_layout)
+        paper_layout = QHBoxLayout()
+        paper_slippage_label = QLabel("Paper slippage:")
+        paper_slippage_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        paper_layout.addWidget(paper_slippage_label)
+        self.paper_slippage = QDoubleSpinBox()
+        self.paper_slippage.setStyleSheet(styles.DARK_THEME["spinbox"])
+        self.paper_slippage.setRange(0, 1)
+        self.paper_slippage.setDecimals(3)
+        self.paper_slippage.setSingleStep(0.01)
+        self.paper_slippage.setValue(0.02)
+        self.paper_slippage.setSuffix(" %")
+        paper_layout.addWidget(self.paper_slippage)
+        paper_latency_label = QLabel("Latency:")
+        paper_latency_label.setStyleSheet(styles.DARK_THEME["label_primary"])
+        paper_layout.addWidget(paper_latency_label)
+        self.paper_latency = QSpinBox()
+        self.paper_latency.setStyleSheet(styles.DARK_THEME["spinbox"])
+        self.paper_latency.setRange(0, 5000)
+        self.paper_latency.setValue(50)
+        self.paper_latency.setSuffix(" ms")
+        paper_layout.addWidget(self.paper_latency)
+        paper_layout.addStretch()
+        strategies_config_layout.addLayout(paper_layout)
         max_trades_layout = QHBoxLayout()
         max_trades_label = QLabel("Max daily trades:")
         max_trades_label.setStyleSheet(styles.DARK_THEME["label_primary"])
@@ -703,10 +890,71 @@ class MainWindow(QMainWindow):
         self.requestFetchPortfolio.connect(self.worker.fetch_portfolio)
         self.thread.start()
         self.streamWorker = MarketStreamWorker()
+        self.order_thread = QThread(self)
         self.tradeWorker = TradeWorker()
-        self.tradeWorker.moveToThread(self.thread)
+        self.tradeWorker.moveToThread(self.order_thread)
         self.tradeWorker.order_placed.connect(self.on_order_placed)
         self.tradeWorker.order_error.connect(self.on_order_error)
+        self.tradeWorker.context_ready.connect(self.on_order_context_ready)
+        self.tradeWorker.order_state.connect(self.on_order_state)
+        self.orderPrepare.connect(self.tradeWorker.prepare)
+        self.prepared_orders = set()
+        self.orderRequested.connect(self.tradeWorker.place_order)
+        self.order_thread.finished.connect(self.tradeWorker.close)
+        self.order_thread.start()
+        self.orderStreamWorker = OrderStreamWorker()
+        self.orderStreamWorker.order_updated.connect(self.on_live_order_update)
+        self.orderStreamWorker.order_filled.connect(self.on_live_fill)
+        self.orderStreamWorker.positions_updated.connect(self.update_live_positions)
+        self.orderStreamWorker.error.connect(self.append_log)
+        self.paperTradeWorker = PaperTradeWorker(BROKER_COMMISSION)
+        self.paperTradeWorker.order_placed.connect(self.on_order_placed)
+        self.paperTradeWorker.order_error.connect(self.on_order_error)
+        self.paperTradeWorker.order_filled.connect(self.on_paper_fill)
+        self.paperTradeWorker.portfolio_updated.connect(self.update_paper_stats)
+        self.tradeWorker.context_ready.connect(self.paperTradeWorker.set_context)
+        self.strategy_thread = QThread(self)
+        self.strategyWorker = StrategyWorker()
+        self.strategyWorker.moveToThread(self.strategy_thread)
+        self.strategyWorker.signalGenerated.connect(self.on_strategy_signal)
+        self.strategyWorker.snapshotReady.connect(self.on_strategy_snapshot)
+        self.strategyWorker.overlaySeriesReady.connect(self.on_overlay_series)
+        self.strategyWorker.error.connect(self.append_log)
+        self.strategySelected.connect(self.strategyWorker.set_strategy)
+        self.strategyHistory.connect(self.strategyWorker.load_history)
+        self.strategyPrice.connect(self.strategyWorker.process_price)
+        self.strategyReset.connect(self.strategyWorker.reset)
+        self.strategySave.connect(self.strategyWorker.save_state, Qt.ConnectionType.BlockingQueuedConnection)
+        self.strategyWorker.stateRestored.connect(self.on_strategy_state_restored)
+        self.strategyTrace.connect(self.strategyWorker.set_trace)
+        self.strategyEvaluation.connect(self.strategyWorker.set_evaluation)
+        self.strategyOverlays.connect(self.strategyWorker.compute_overlays)
+        self.strategyExecution.connect(self.strategyWorker.apply_execution)
+        self.strategyLivePositions.connect(self.strategyWorker.set_live_positions)
+        self.basketWorker = BasketWorker()
+        self.basketWorker.moveToThread(self.strategy_thread)
+        self.basketWorker.signalGenerated.connect(self.on_parallel_signal)
+        self.basketWorker.statsUpdated.connect(self.update_parallel_table)
+        self.basketWorker.error.connect(self.append_log)
+        self.basketSelected.connect(self.basketWorker.set_strategy)
+        self.strategy_thread.start()
+        self.trade_limiter = TradeLimiter()
+        self.strategyHost = StrategyHost(self)
+        self.strategyHost.signalGenerated.connect(self.on_parallel_signal)
+        self.strategyHost.statsUpdated.connect(self.update_parallel_table)
+        self.strategyHost.error.connect(self.append_log)
+        self.multiStreamWorker = MultiMarketStreamWorker()
+        self.multiStreamWorker.tick.connect(self.strategyHost.on_tick)
+        self.multiStreamWorker.tick.connect(self.basketWorker.on_tick)
+        self.multiStreamWorker.tick.connect(self.paperTradeWorker.on_tick)
+        self.multiStreamWorker.order_book.connect(self.paperTradeWorker.on_order_book)
+        self.multiStreamWorker.error.connect(self.append_log)
+        self.multiStreamWorker.stopped.connect(self.on_parallel_stream_stopped)
+        self.apply_strategy_settings()
+        self.toggle_parallel_strategies(self.allow_parallel_strategies.isChecked())
+        self.testing_mode.toggled.connect(self.on_testing_mode_changed)
+        for error in self.strategy_registry.errors:
+            self.append_log(f"Плагин стратегии пропущен: {error}", logging.WARNING)
 
     def setup_tray_icon(self):
         if not QSystemTrayIcon.isSystemTrayAvailable():
@@ -875,20 +1123,8 @@ class MainWindow(QMainWindow):
         labels = [cat[0] for cat in sorted_categories]
         values = [cat[1] for cat in sorted_categories]
         colors = [CATEGORY_COLORS.get(cat, '#D5D5D5') for cat in labels]
-        if hasattr(self, 'pieChart') and self.pieChart:
-            try:
-                js_code = f"""
-                if (typeof window.updatePortfolioChart === 'function') {{
-                    window.updatePortfolioChart(
-                        {json.dumps(labels)},
-                        {json.dumps(values)},
-                        {json.dumps(colors)}
-                    );
-                }}
-                """
-                self.pieChart.page().runJavaScript(js_code)
-            except:
-                pass
+        self.portfolio_chart_data = (labels, values, colors)
+        self.portfolio_chart.update_portfolio(labels, values, colors)
 
     def convert_price_to_candles(self, price_data):
         if not price_data:
@@ -949,6 +1185,7 @@ class MainWindow(QMainWindow):
 
         self.current_ticker = ticker
         self.current_token = token
+        self.prepare_order_context(ticker, token)
         self.is_loading_history = True
         self.stream_auto_reconnect = False
         
@@ -965,6 +1202,7 @@ class MainWindow(QMainWindow):
 
         self.current_ticker = ticker
         self.current_token = token
+        self.prepare_order_context(ticker, token)
         self.candles = []
         self.current_candle = None
         self.last_candle_time = None
@@ -975,7 +1213,7 @@ class MainWindow(QMainWindow):
             self.worker.set_token(token)
             self.pending_stream_ticker = ticker
             self.pending_stream_token = token
-            self.worker.fetch_historical_prices(ticker, hours=6, interval='30sec')
+            self.worker.fetch_historical_prices(ticker, hours=self.stream_history_hours(), interval='30sec')
 
     def stop_stream(self):
         self.stream_auto_reconnect = False
@@ -984,7 +1222,7 @@ class MainWindow(QMainWindow):
         self.toggle_stream_ui(False)
         
         if self.active_strategy:
-            self.active_strategy.reset()
+            self.strategyReset.emit()
             self.strategyStatusLabel.setText("Strategy stopped")
         
         self.candles.clear()
@@ -992,8 +1230,8 @@ class MainWindow(QMainWindow):
         self.last_candle_time = None
         self.chart_data.clear()
         
-        if hasattr(self, 'plotWidget') and self.plotWidget:
-            self.plotWidget.setHtml(self._get_empty_chart_html())
+        if hasattr(self, 'candle_chart') and self.candle_chart:
+            self.candle_chart.clear()
         
         self.append_log("Stream stopped - data cleared")
 
@@ -1054,6 +1292,8 @@ class MainWindow(QMainWindow):
                 self.candles = candles
             
             if candles:
+                if self.active_strategy:
+                    self.strategyHistory.emit(self.strategy_state_key(), list(candles))
                 self._update_candlestick_chart()
             
             self._delayed_stream_start()
@@ -1125,9 +1365,6 @@ class MainWindow(QMainWindow):
         if self.last_candle_time != current_timestamp:
             if self.current_candle:
                 self.candles.append(self.current_candle)
-                if len(self.candles) > 500:
-                    self.candles.pop(0)
-                self._update_candlestick_chart()
             
             self.current_candle = {
                 'time': current_timestamp,
@@ -1142,11 +1379,15 @@ class MainWindow(QMainWindow):
                 self.current_candle['high'] = max(self.current_candle['high'], price)
                 self.current_candle['low'] = min(self.current_candle['low'], price)
                 self.current_candle['close'] = price
-                self._update_candlestick_chart()
         
         if self.active_strategy:
-            self.active_strategy.add_price(price)
-            self.process_strategy_signal(price)
+            self.strategyPrice.emit(price)
+
+        if self.testing_mode.isChecked() and self.current_ticker:
+            self.paperTradeWorker.on_tick(self.current_ticker, price)
+        
+        if self.current_candle:
+            self.candle_chart.update_candle(self.current_candle)
         
         self.current_price.setText(f"Текущая цена: {price:.2f}")
 
@@ -1159,26 +1400,27 @@ class MainWindow(QMainWindow):
         if not display_candles:
             return
         
-        if hasattr(self, 'plotWidget') and self.plotWidget:
+        if hasattr(self, 'candle_chart') and self.candle_chart:
             try:
-                chart_data = []
-                for candle in display_candles:
-                    chart_data.append([
-                        int(candle['time']) * 1000,
-                        float(candle['open']),
-                        float(candle['close']), 
-                        float(candle['low']),
-                        float(candle['high'])
-                    ])
-                
-                js_code = f"""
-                if (typeof window.updateCandlestickChart === 'function') {{
-                    window.updateCandlestickChart({json.dumps(chart_data)});
-                }}
-                """
-                self.plotWidget.page().runJavaScript(js_code)
+                self.candle_chart.load_candles(display_candles)
             except:
                 pass
+        self._update_chart_overlays()
+
+    def _update_chart_overlays(self):
+        if not hasattr(self, 'candle_chart') or not self.candle_chart:
+            return
+        display_candles = self.candles + [self.current_candle] if self.current_candle else self.candles
+        if self.active_strategy and display_candles:
+            self.strategyOverlays.emit(np.array([candle['time'] for candle in display_candles], dtype=float))
+        else:
+            self.on_overlay_series({})
+
+    def on_overlay_series(self, series):
+        try:
+            self.candle_chart.set_overlays(series)
+        except:
+            pass
 
     def convert_history_to_candles(self, price_data):
         if not price_data:
@@ -1271,23 +1513,86 @@ class MainWindow(QMainWindow):
         }
 
     def send_order(self, order):
-        self.tradeWorker.set_token(self.get_token())
+        requested_at = time.perf_counter()
         ticker = self.tickerEdit.text().strip()
         quantity = self.quantitySpinBox.value()
+        price = 0.0
         if self.changeMarketComboBox.currentText() == 'Limit':
             try:
-                price = int(self.priceEdit.text())
+                price = float(self.priceEdit.text().replace(',', '.'))
             except ValueError:
                 return
-            if order == 'BUY':
-                self.tradeWorker.place_limit_order(ticker, 'BUY', quantity, price)
-            if order == 'SELL':
-                self.tradeWorker.place_limit_order(ticker, 'SELL', quantity, price)
+        if not ticker or order not in ('BUY', 'SELL'):
+            return
+        if not self.testing_mode.isChecked():
+            self.prepare_order(self.get_token(), ticker)
+            self.orderRequested.emit(new_client_order_id(), ticker, order, quantity, price, requested_at)
+            return
+        self.paperTradeWorker.set_token(self.get_token())
+        self.prepare_order(self.get_token(), ticker)
+        if price > 0:
+            self.paperTradeWorker.place_limit_order(ticker, order, quantity, price)
+        else:
+            self.paperTradeWorker.place_market_order(ticker, order, quantity)
+
+    def prepare_order_context(self, ticker, token):
+        if not token:
+            return
+        self.prepare_order(token, ticker)
+        if not self.testing_mode.isChecked():
+            self.start_order_tracking(token)
+
+    def prepare_order(self, token, ticker):
+        key = (token, ticker.strip().upper())
+        if key not in self.prepared_orders:
+            self.prepared_orders.add(key)
+            self.orderPrepare.emit(token, ticker)
+
+    def start_order_tracking(self, token):
+        self.orderStreamWorker.set_token(token)
+        self.orderStreamWorker.start_stream()
+        self.strategyLivePositions.emit(True)
+
+    def on_testing_mode_changed(self, enabled):
+        if enabled:
+            self.orderStreamWorker.stop_stream()
+            self.liveStatsLabel.setText("Live: -")
+        self.strategyLivePositions.emit(not enabled and self.orderStreamWorker.running)
+
+    def on_live_order_update(self, order):
+        if order['state'] in ('rejected', 'cancelled'):
+            self.append_log(f"Ордер {order['ticker']} {order['direction']} {order['order_id']}: {order['state']} "
+                            f"(исполнено {order['lots_executed']} из {order['lots_requested']} лотов)", logging.WARNING)
+        else:
+            self.append_log(f"Ордер {order['order_id']}: {order['state']}", logging.DEBUG)
+
+    def on_live_fill(self, fill):
+        self.strategySignalsLog.append(
+            f"[Live] {fill['ticker']}: {fill['direction']} {fill['lots']} лотов исполнено по {fill['price']:.2f} "
+            f"(позиция {fill['position']} лотов)"
+        )
+        if self.is_strategy_ticker(fill['ticker']):
+            self.strategyExecution.emit(fill['price'], fill['position'])
+
+    def is_strategy_ticker(self, ticker):
+        return bool(self.active_strategy and ticker and self.current_ticker) and ticker.upper() == self.current_ticker.upper()
+
+    def update_live_positions(self, positions):
+        held = ', '.join(f"{position['ticker']} {position['lots']}" for position in positions.values())
+        working = len(self.orderStreamWorker.working_orders())
+        self.liveStatsLabel.setText(f"Live: позиций {len(positions)}{' (' + held + ')' if held else ''} | активных ордеров {working}")
+        if self.active_strategy and self.current_ticker:
+            current = [position for position in positions.values() if self.is_strategy_ticker(position['ticker'])]
+            self.strategyExecution.emit(current[0]['average_price'] if current else 0.0, current[0]['lots'] if current else 0)
+
+    def on_order_state(self, client_id, state, order):
+        if state == 'retrying':
+            self.append_log(f"Повтор ордера {order['ticker']} {order['direction']} (попытка {order['attempts']}, id {client_id})", logging.WARNING)
         else:
-            if order == 'BUY':
-                self.tradeWorker.place_market_order(ticker, 'BUY', quantity)
-            if order == 'SELL':
-                self.tradeWorker.place_market_order(ticker, 'SELL', quantity)
+            self.append_log(f"Ордер {client_id}: {state}", logging.DEBUG)
+
+    def on_order_context_ready(self, ticker, context):
+        self.append_log(f"Ордер {ticker} подготовлен: лот {context['lot']}, шаг цены {context['min_price_increment']}", logging.DEBUG)
 
     def change_market_type(self):
         if self.changeMarketComboBox.currentText() == 'Market':
@@ -1313,58 +1618,244 @@ class MainWindow(QMainWindow):
             self.changeMarketComboBox.setEnabled(False)
 
     def strategy_changed(self):
-        from strategies.advanced_strategy import CostAwareSmartStrategy
         strategy_name = self.strategyCombo.currentText()
-        if strategy_name == " Выберите стратегию ":
+        plugin = self.strategy_registry.get(strategy_name)
+        if not plugin:
             self.reset_strategy()
             return
-
-        elif strategy_name == "Advanced Strategy":
-            self.active_strategy = CostAwareSmartStrategy()
-            self.paramsLabel.setText("Advanced Strategy")
+        try:
+            self.active_strategy = plugin.create()
+        except Exception as e:
+            self.append_log(f"Не удалось загрузить стратегию '{strategy_name}': {e}", logging.ERROR)
+            self.reset_strategy()
+            return
+        self.strategy_plugin = plugin
+        self.paramsLabel.setText(f"{strategy_name} | данные: {plugin.data_type} | прогрев: {plugin.warmup}")
+        self.select_evaluation(plugin.evaluation, plugin.evaluation_interval)
+        self.active_strategy.set_evaluation(*self.selected_evaluation())
+        self.strategySelected.emit(self.active_strategy)
+        self.trace_changed()
 
         self.sync_strategy_with_chart_data(strategy_name)
+        self._update_chart_overlays()
+
+    def select_evaluation(self, mode, interval):
+        labels = {value: label for label, value in EVALUATION_MODES.items()}
+        self.evaluationCombo.blockSignals(True)
+        self.evaluationInterval.blockSignals(True)
+        self.evaluationCombo.setCurrentText(labels[mode])
+        self.evaluationInterval.setValue(interval)
+        self.evaluationInterval.setEnabled(mode == 'interval')
+        self.evaluationCombo.blockSignals(False)
+        self.evaluationInterval.blockSignals(False)
+
+    def stream_history_hours(self):
+        hours = self.chart_history_hours.value()
+        if not self.strategy_plugin:
+            return hours
+        return max(hours, math.ceil(self.strategy_plugin.history_seconds() / 3600))
+
+    def selected_evaluation(self):
+        return EVALUATION_MODES[self.evaluationCombo.currentText()], self.evaluationInterval.value()
+
+    def evaluation_changed(self):
+        mode, interval = self.selected_evaluation()
+        self.evaluationInterval.setEnabled(mode == 'interval')
+        if self.active_strategy:
+            self.strategyEvaluation.emit(mode, interval)
+
+    def trace_changed(self):
+        if not self.active_strategy:
+            return
+        if not self.traceCheckBox.isChecked():
+            self.strategyTrace.emit("")
+            return
+        trace_dir = os.path.join(os.path.dirname(database.DB_FILE), 'traces')
+        os.makedirs(trace_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(trace_dir, f"{self.strategy_state_key().replace(':', '_').replace(' ', '_')}_{stamp}.trace")
+        self.strategyTrace.emit(path)
+        self.append_log(f"Трассировка решений: {path}")
 
     def reset_strategy(self):
         self.active_strategy = None
+        self.strategy_plugin = None
+        self.strategySelected.emit(None)
+        self._update_chart_overlays()
         self.paramsLabel.setText("Не выбрано")
         self.strategyStatusLabel.setText("Стратегия не выбрана")
         self.strategySignalsLog.clear()
 
+    def strategy_state_key(self):
+        return f"{self.active_strategy.name}:{self.current_ticker or self.tickerEdit.text().strip()}"
+
+    def on_strategy_state_restored(self, saved_time, backfilled):
+        saved = datetime.fromtimestamp(saved_time).strftime('%d.%m %H:%M:%S')
+        self.append_log(f"Состояние стратегии восстановлено из снимка от {saved}, догружено свечей: {backfilled}")
+
     def sync_strategy_with_chart_data(self, strategy_name):
         if self.active_strategy and len(self.candles) > 0:
-            for candle in self.candles:
-                self.active_strategy.add_price(candle['close'])
+            self.strategyHistory.emit(self.strategy_state_key(), list(self.candles))
             
             price_count = len(self.candles)
-            min_required = STRATEGY_PARAMS.get(strategy_name, {}).get("min_prices", 0)
+            min_required = self.active_strategy.warmup
             
             if price_count < min_required:
                 self.strategyStatusLabel.setText(f"Стратегия '{strategy_name}' загружена | Данных: {price_count}/{min_required} | Запустите стрим")
             else:
                 self.strategyStatusLabel.setText(f"Стратегия '{strategy_name}' загружена | Данных: {price_count} | Готова к анализу")
         else:
-            min_required = STRATEGY_PARAMS.get(strategy_name, {}).get("min_prices", 0)
+            min_required = self.active_strategy.warmup
             self.strategyStatusLabel.setText(f"Стратегия '{strategy_name}' загружена | Нужно данных: {min_required} | Запустите стрим")
         
         self.strategySignalsLog.clear()
         self.strategySignalsLog.append(f"Активирована стратегия: {strategy_name}")
         self.strategySignalsLog.append("Стратегия готова анализировать цены из стрима")
 
-    def process_strategy_signal(self, price):
-        signal = self.active_strategy.analyze(price)
-        indicators = self.active_strategy.get_indicator_values()
-        price_count = len(self.active_strategy.price_history)
-
-        if signal:
-            real_price = apply_broker_commission(price, signal)
-            signal_text = f"Сигнал {signal} | Бирж. цена: {price:.2f} | С комиссией: {real_price:.2f}"
-            self.strategySignalsLog.append(signal_text)
-            self.update_strategy_status_with_signal(signal, indicators, price_count)
-            self.update_signal_statistics(signal)
-            self.show_signal_recommendation(signal, price)
+    def on_strategy_signal(self, signal, price, indicators, overlays, price_count, ts):
+        if not self.active_strategy:
+            return
+        allowed, reason = self.trade_limiter.check(self.current_ticker or "")
+        if not allowed:
+            self.strategySignalsLog.append(f"Сигнал {signal} пропущен: {reason}")
+            self._update_live_overlays(overlays)
+            return
+        real_price = apply_broker_commission(price, signal)
+        signal_text = f"[{datetime.fromtimestamp(ts).strftime('%H:%M:%S')}] Сигнал {signal} | Бирж. цена: {price:.2f} | С комиссией: {real_price:.2f}"
+        self.strategySignalsLog.append(signal_text)
+        self.update_strategy_status_with_signal(signal, indicators, price_count)
+        self.update_signal_statistics(signal)
+        self.show_signal_recommendation(signal, price)
+        self.place_paper_order(self.current_ticker, signal)
+        self._update_live_overlays(overlays)
+
+    def toggle_parallel_strategies(self, enabled):
+        if not hasattr(self, 'strategyHost'):
+            return
+        if not enabled and self.parallel_mode:
+            self.stop_parallel_strategies()
+        self.parallelStartBtn.setEnabled(enabled and not self.parallel_mode)
+
+    def start_parallel_strategies(self):
+        from strategies.basket_strategy import BasketMeanReversionStrategy, PairsStrategy
+        token = self.get_token()
+        tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in self.parallel_tickers.text().replace(';', ',').split(',') if ticker.strip()))
+        if not token or not tickers:
+            self.append_log("Для параллельных стратегий нужны токен и список тикеров")
+            return
+        mode = PARALLEL_MODES[self.parallelModeCombo.currentText()]
+        if mode == 'pairs' and len(tickers) != 2:
+            self.append_log("Для парной стратегии укажите ровно два тикера")
+            return
+        if mode == 'basket' and len(tickers) < 3:
+            self.append_log("Для корзины нужно минимум три тикера")
+            return
+        plugin = self.strategy_plugin or next(iter(self.strategy_registry.plugins.values()), None)
+        if mode == 'tickers' and not plugin:
+            self.append_log("Нет доступных стратегий для параллельного запуска")
+            return
+        self.apply_strategy_settings()
+        if mode == 'tickers':
+            self.strategyHost.start(tickers, [(plugin.load(), None, self.selected_evaluation())], self.strategy_shards.value())
+            details = f"процессов: {len(self.strategyHost.processes)}"
         else:
-            self.update_strategy_status_no_signal(indicators, price_count)
+            strategy = PairsStrategy(tickers) if mode == 'pairs' else BasketMeanReversionStrategy(tickers)
+            self.basketSelected.emit(strategy)
+            details = strategy.name
+        self.parallel_mode = mode
+        self.multiStreamWorker.set_token(token)
+        if self.testing_mode.isChecked():
+            for ticker in tickers:
+                self.prepare_order(token, ticker)
+        order_book = self.testing_mode.isChecked() or (mode == 'tickers' and plugin.data_type == 'book')
+        self.multiStreamWorker.start_stream(tickers, order_book)
+        self.parallelStartBtn.setEnabled(False)
+        self.parallelStopBtn.setEnabled(True)
+        self.parallelModeCombo.setEnabled(False)
+        self.strategySignalsLog.append(f"Параллельные стратегии запущены: {len(tickers)} тикеров, {details}")
+
+    def stop_parallel_strategies(self):
+        self.multiStreamWorker.stop_stream()
+        self.strategyHost.stop()
+        self.basketSelected.emit(None)
+        self.parallel_mode = None
+        self.parallelStartBtn.setEnabled(self.allow_parallel_strategies.isChecked())
+        self.parallelStopBtn.setEnabled(False)
+        self.parallelModeCombo.setEnabled(True)
+
+    def on_parallel_stream_stopped(self):
+        if self.parallel_mode:
+            self.stop_parallel_strategies()
+            self.strategySignalsLog.append("Параллельные стратегии остановлены")
+
+    def on_parallel_signal(self, ticker, strategy_name, signal, price):
+        allowed, reason = self.trade_limiter.check(ticker)
+        if not allowed:
+            self.strategySignalsLog.append(f"[{ticker}] Сигнал {signal} пропущен: {reason}")
+            return
+        real_price = apply_broker_commission(price, signal)
+        self.strategySignalsLog.append(f"[{ticker}] {strategy_name}: сигнал {signal} | Бирж. цена: {price:.2f} | С комиссией: {real_price:.2f}")
+        self.update_signal_statistics(signal)
+        self.place_paper_order(ticker, signal)
+        if self.enable_telegram_notifications.isChecked():
+            send_signal_async(f"{ticker}: {signal} по {price:.2f}", self.telegram_token_edit.text(), self.telegram_chat_id.text())
+
+    def update_parallel_table(self, stats):
+        self.parallelTable.setSortingEnabled(False)
+        self.parallelTable.setRowCount(len(stats))
+        for row, entry in enumerate(stats):
+            self.parallelTable.setItem(row, 0, QTableWidgetItem(entry['ticker']))
+            self.parallelTable.setItem(row, 1, QTableWidgetItem(entry['strategy']))
+            price_item = QTableWidgetItem()
+            price_item.setData(Qt.ItemDataRole.DisplayRole, float(entry['price']))
+            self.parallelTable.setItem(row, 2, price_item)
+            ticks_item = QTableWidgetItem()
+            ticks_item.setData(Qt.ItemDataRole.DisplayRole, int(entry['ticks']))
+            self.parallelTable.setItem(row, 3, ticks_item)
+            bars_item = QTableWidgetItem()
+            bars_item.setData(Qt.ItemDataRole.DisplayRole, int(entry['bars']))
+            self.parallelTable.setItem(row, 4, bars_item)
+            signals_item = QTableWidgetItem()
+            signals_item.setData(Qt.ItemDataRole.DisplayRole, int(entry['signals']))
+            self.parallelTable.setItem(row, 5, signals_item)
+            self.parallelTable.setItem(row, 6, QTableWidgetItem(entry['last_signal']))
+        self.parallelTable.setSortingEnabled(True)
+
+    def apply_strategy_settings(self):
+        self.trade_limiter.max_daily_trades = self.max_daily_trades.value()
+        self.trade_limiter.min_trade_interval = self.min_trade_interval.value()
+        self.paperTradeWorker.slippage = self.paper_slippage.value() / 100
+        self.paperTradeWorker.latency = self.paper_latency.value() / 1000
+
+    def place_paper_order(self, ticker, signal):
+        if not self.testing_mode.isChecked() or not ticker:
+            return False
+        if signal == 'SELL' and ticker not in self.paperTradeWorker.positions:
+            return False
+        quantity = self.quantitySpinBox.value() if signal == 'BUY' else self.paperTradeWorker.positions[ticker]['quantity']
+        if not self.paperTradeWorker.place_market_order(ticker, signal, quantity):
+            return False
+        self.trade_limiter.record(ticker)
+        return True
+
+    def on_paper_fill(self, order_id, ticker, direction, quantity, price):
+        self.strategySignalsLog.append(f"[Paper] {ticker}: {direction} {quantity} лотов исполнено по {price:.2f}")
+
+    def update_paper_stats(self, summary):
+        self.paperStatsLabel.setText(
+            f"Paper: equity {summary['equity']:.2f} | P&L {summary['pnl']:+.2f} | "
+            f"позиций: {len(summary['positions'])} | комиссия {summary['commission']:.2f}"
+        )
+
+    def on_strategy_snapshot(self, indicators, overlays, price_count):
+        if not self.active_strategy:
+            return
+        self.update_strategy_status_no_signal(indicators, price_count)
+        self._update_live_overlays(overlays)
+
+    def _update_live_overlays(self, overlays):
+        if self.current_candle and overlays:
+            self.candle_chart.update_candle(self.current_candle, overlays)
 
     def update_signal_statistics(self, signal):
         if not hasattr(self, 'signal_stats'):
@@ -1393,7 +1884,7 @@ class MainWindow(QMainWindow):
         if recommendation:
             self.strategySignalsLog.append(f"\n{recommendation}\n")
             if self.enable_telegram_notifications.isChecked():
-                send_signal(recommendation, self.telegram_token_edit.text(), self.telegram_chat_id.text())
+                send_signal_async(recommendation, self.telegram_token_edit.text(), self.telegram_chat_id.text())
 
     def update_strategy_status_with_signal(self, signal, indicators, price_count):
         if indicators:
@@ -1415,8 +1906,7 @@ class MainWindow(QMainWindow):
             self.strategyStatusLabel.setText(status_text)
 
     def update_strategy_status_no_signal(self, indicators, price_count):
-        strategy_name = self.active_strategy.name if self.active_strategy else ""
-        min_required = STRATEGY_PARAMS.get(strategy_name, {}).get("min_prices", 0)
+        min_required = self.active_strategy.warmup if self.active_strategy else 0
 
         if indicators:
             key_indicators = []
@@ -1440,10 +1930,12 @@ class MainWindow(QMainWindow):
             config = configparser.ConfigParser()
             config['chart'] = {
                 'theme': self.theme_combo.currentText(),
+                'backend': self.chart_backend_combo.currentText(),
                 'show_grid': str(self.show_grid.isChecked()).lower(),
                 'show_volume': str(self.show_volume.isChecked()).lower(),
                 'auto_refresh_portfolio': str(self.auto_refresh_portfolio.isChecked()).lower(),
-                'refresh_interval': str(self.refresh_interval.value())
+                'refresh_interval': str(self.refresh_interval.value()),
+                'history_hours': str(self.chart_history_hours.value())
             }
             config['notifications'] = {
                 'enable_telegram': str(self.enable_telegram_notifications.isChecked()).lower(),
@@ -1460,7 +1952,11 @@ class MainWindow(QMainWindow):
                 'auto_start_strategy': str(self.auto_start_strategy.isChecked()).lower(),
                 'allow_parallel_strategies': str(self.allow_parallel_strategies.isChecked()).lower(),
                 'max_daily_trades': str(self.max_daily_trades.value()),
-                'min_trade_interval': str(self.min_trade_interval.value())
+                'min_trade_interval': str(self.min_trade_interval.value()),
+                'parallel_tickers': self.parallel_tickers.text(),
+                'strategy_shards': str(self.strategy_shards.value()),
+                'paper_slippage': str(self.paper_slippage.value()),
+                'paper_latency': str(self.paper_latency.value())
             }
             with open(self.SETTINGS_FILE, 'w', encoding='utf-8') as f:
                 config.write(f)
@@ -1482,10 +1978,14 @@ class MainWindow(QMainWindow):
                 index = self.theme_combo.findText(theme)
                 if index >= 0:
                     self.theme_combo.setCurrentIndex(index)
+                index = self.chart_backend_combo.findText(config.get('chart', 'backend', fallback='Web'))
+                if index >= 0:
+                    self.chart_backend_combo.setCurrentIndex(index)
                 self.show_grid.setChecked(config.getboolean('chart', 'show_grid', fallback=True))
                 self.show_volume.setChecked(config.getboolean('chart', 'show_volume', fallback=True))
                 self.auto_refresh_portfolio.setChecked(config.getboolean('chart', 'auto_refresh_portfolio', fallback=True))
                 self.refresh_interval.setValue(config.getint('chart', 'refresh_interval', fallback=5))
+                self.chart_history_hours.setValue(config.getint('chart', 'history_hours', fallback=STREAM_HISTORY_HOURS))
             if config.has_section('notifications'):
                 self.enable_telegram_notifications.setChecked(config.getboolean('notifications', 'enable_telegram', fallback=False))
                 self.telegram_token_edit.setText(config.get('notifications', 'telegram_token', fallback=''))
@@ -1503,6 +2003,10 @@ class MainWindow(QMainWindow):
                 self.allow_parallel_strategies.setChecked(config.getboolean('strategies', 'allow_parallel_strategies', fallback=False))
                 self.max_daily_trades.setValue(config.getint('strategies', 'max_daily_trades', fallback=50))
                 self.min_trade_interval.setValue(config.getint('strategies', 'min_trade_interval', fallback=60))
+                self.parallel_tickers.setText(config.get('strategies', 'parallel_tickers', fallback=''))
+                self.strategy_shards.setValue(config.getint('strategies', 'strategy_shards', fallback=0))
+                self.paper_slippage.setValue(config.getfloat('strategies', 'paper_slippage', fallback=0.02))
+                self.paper_latency.setValue(config.getint('strategies', 'paper_latency', fallback=50))
         except:
             pass
 
@@ -1520,6 +2024,7 @@ class MainWindow(QMainWindow):
         try:
             self.change_theme(self.theme_combo.currentText())
             self.setup_portfolio_refresh_timer()
+            self.apply_strategy_settings()
             if self.auto_start.isChecked():
                 self.setup_autostart()
             else:
@@ -1642,7 +2147,7 @@ class MainWindow(QMainWindow):
             pass
 
     def test_notifications(self):
-        send_signal('Тестовое уведомление', self.telegram_token_edit.text(), self.telegram_chat_id.text())
+        send_signal_async('Тестовое уведомление', self.telegram_token_edit.text(), self.telegram_chat_id.text())
 
     def export_accounts(self):
         try:
@@ -1739,6 +2244,11 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'thread') and self.thread.isRunning():
             self.thread.quit()
             self.thread.wait(2000)
+        if hasattr(self, 'orderStreamWorker'):
+            self.orderStreamWorker.stop_stream()
+        if hasattr(self, 'order_thread') and self.order_thread.isRunning():
+            self.order_thread.quit()
+            self.order_thread.wait(2000)
         QApplication.quit()
 
     def closeEvent(self, event):
@@ -1759,6 +2269,19 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'thread') and self.thread.isRunning():
                 self.thread.quit()
                 self.thread.wait(2000)
+            if hasattr(self, 'orderStreamWorker'):
+                self.orderStreamWorker.stop_stream()
+            if hasattr(self, 'order_thread') and self.order_thread.isRunning():
+                self.order_thread.quit()
+                self.order_thread.wait(2000)
+            if hasattr(self, 'strategy_thread') and self.strategy_thread.isRunning():
+                self.strategyTrace.emit("")
+                self.strategySave.emit()
+                self.strategy_thread.quit()
+                self.strategy_thread.wait(2000)
+            if hasattr(self, 'strategyHost'):
+                self.multiStreamWorker.stop_stream()
+                self.strategyHost.stop()
             if self.tray_icon:
                 self.tray_icon.hide()
             event.accept()
@@ -1800,6 +2323,7 @@ class MainWindow(QMainWindow):
         grid_color = "#334155" if is_dark else "#d1d1d1"
         up_color = "#10b981" if is_dark else "#238636" 
         down_color = "#ef4444" if is_dark else "#dc2626" 
+        overlay_colors = json.dumps(list(OVERLAY_COLORS))
         return f"""
         <!DOCTYPE html>
         <html lang="en">
@@ -1807,7 +2331,8 @@ class MainWindow(QMainWindow):
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Tinkoff Candlestick Chart</title>
-            <script src="https://cdn.jsdelivr.net/npm/echarts@5.4.3/dist/echarts.min.js"></script>
+            <script src="echarts.min.js"></script>
+            <script src="qwebchannel.js"></script>
             <style>
                 body {{ 
                     margin: 0; 
@@ -1829,14 +2354,77 @@ class MainWindow(QMainWindow):
             <div id="chart"></div>
             <script>
                 var chart = null;
-                var allCandles = [];
+                var columns = null;
+                var candleCount = 0;
+                var windowHasTail = false;
+                var tailTime = 0;
+                var timeMin = 0;
+                var timeMax = 0;
+                var bridge = null;
+                var zoomTimer = null;
                 var currentZoom = {{ start: 0, end: 100 }};
                 var isChartInitialized = false;
-                window.updateCandlestickChart = function(newCandles) {{
-                    if (!newCandles || newCandles.length === 0) {{
+                var isRendered = false;
+                var overlayNames = [];
+                var overlayColors = {overlay_colors};
+                function columnNames() {{
+                    return ['time', 'open', 'close', 'low', 'high'].concat(overlayNames);
+                }}
+                function columnIndexes() {{
+                    return columnNames().map(function(name, index) {{
+                        return index;
+                    }});
+                }}
+                function allocateColumns(capacity) {{
+                    var width = 5 + overlayNames.length;
+                    var buffer = new Float64Array(capacity * width);
+                    buffer.fill(NaN);
+                    return columnIndexes().map(function(index) {{
+                        return buffer.subarray(index * capacity, (index + 1) * capacity);
+                    }});
+                }}
+                function decodeColumns(payload, count) {{
+                    var binary = atob(payload);
+                    var bytes = new Uint8Array(binary.length);
+                    for (var i = 0; i < binary.length; i++) {{
+                        bytes[i] = binary.charCodeAt(i);
+                    }}
+                    var values = new Float64Array(bytes.buffer);
+                    return columnIndexes().map(function(index) {{
+                        return values.subarray(index * count, (index + 1) * count);
+                    }});
+                }}
+                function candleSource() {{
+                    var source = {{}};
+                    columnNames().forEach(function(name, index) {{
+                        source[name] = columns[index].subarray(0, candleCount);
+                    }});
+                    return source;
+                }}
+                function sameNames(names) {{
+                    return names.length === overlayNames.length && names.every(function(name, index) {{
+                        return name === overlayNames[index];
+                    }});
+                }}
+                function reportZoom() {{
+                    if (zoomTimer) {{
+                        clearTimeout(zoomTimer);
+                    }}
+                    zoomTimer = setTimeout(function() {{
+                        zoomTimer = null;
+                        if (bridge && chart) {{
+                            bridge.zoomChanged(currentZoom.start, currentZoom.end, chart.getWidth());
+                        }}
+                    }}, 120);
+                }}
+                function redraw() {{
+                    if (isRendered && chart) {{
+                        chart.setOption({{
+                            xAxis: {{ min: timeMin, max: timeMax }},
+                            dataset: {{ source: candleSource() }}
+                        }});
                         return;
                     }}
-                    allCandles = newCandles;
                     if (!isChartInitialized || !chart) {{
                         if (initChart()) {{
                             renderCandlestickChart(false);
@@ -1852,9 +2440,76 @@ class MainWindow(QMainWindow):
                         }}
                         renderCandlestickChart(true);
                     }}
+                }}
+                window.loadCandleColumns = function(payload, count, minTime, maxTime, names, hasTail) {{
+                    names = names || [];
+                    windowHasTail = !!hasTail;
+                    if (!sameNames(names)) {{
+                        overlayNames = names.slice();
+                        isRendered = false;
+                    }}
+                    if (!payload || count === 0) {{
+                        columns = null;
+                        candleCount = 0;
+                        timeMin = 0;
+                        timeMax = 0;
+                        currentZoom = {{ start: 0, end: 100 }};
+                        isRendered = false;
+                        if (chart) {{
+                            chart.clear();
+                        }}
+                        return;
+                    }}
+                    columns = decodeColumns(payload, count);
+                    candleCount = count;
+                    timeMin = minTime;
+                    timeMax = maxTime;
+                    redraw();
+                }};
+                window.updateLastCandle = function(time, open, close, low, high, overlays) {{
+                    var newBar = time !== tailTime;
+                    tailTime = time;
+                    if (columns && !windowHasTail) {{
+                        timeMax = Math.max(time, timeMax);
+                        if (newBar && bridge) {{
+                            bridge.requestWindow();
+                        }}
+                        return;
+                    }}
+                    if (!columns) {{
+                        columns = allocateColumns(64);
+                        candleCount = 0;
+                        windowHasTail = true;
+                    }}
+                    var index = candleCount - 1;
+                    if (index < 0 || columns[0][index] !== time) {{
+                        if (candleCount === columns[0].length) {{
+                            var grown = allocateColumns(candleCount * 2);
+                            for (var c = 0; c < columns.length; c++) {{
+                                grown[c].set(columns[c].subarray(0, candleCount));
+                            }}
+                            columns = grown;
+                        }}
+                        index = candleCount;
+                        candleCount += 1;
+                    }}
+                    columns[0][index] = time;
+                    columns[1][index] = open;
+                    columns[2][index] = close;
+                    columns[3][index] = low;
+                    columns[4][index] = high;
+                    for (var o = 0; o < overlayNames.length; o++) {{
+                        var value = overlays ? overlays[o] : null;
+                        columns[5 + o][index] = value === null || value === undefined ? NaN : value;
+                    }}
+                    if (time > timeMax || candleCount === 1) {{
+                        timeMax = Math.max(time, timeMax);
+                        timeMin = timeMin || time;
+                    }}
+                    redraw();
                 }};
                 function renderCandlestickChart(preserveZoom) {{
-                    if (!chart) {{
+                    if (!chart || !columns) {{
                         return;
                     }}
                     var zoomStart = 0;
@@ -1882,7 +2537,12 @@ class MainWindow(QMainWindow):
                                     '<div style="color: ' + color + ';">📈 Открытие: ' + data[1].toFixed(2) + '</div>' +
                                     '<div style="color: ' + color + ';">📉 Закрытие: ' + data[2].toFixed(2) + '</div>' +
                                     '<div style="color: {text_color};">📉 Минимум: ' + data[3].toFixed(2) + '</div>' +
-                                    '<div style="color: {text_color};">📈 Максимум: ' + data[4].toFixed(2) + '</div>';
+                                    '<div style="color: {text_color};">📈 Максимум: ' + data[4].toFixed(2) + '</div>' +
+                                    overlayNames.map(function(name, index) {{
+                                        var value = data[5 + index];
+                                        if (isNaN(value)) return '';
+                                        return '<div style="color: ' + overlayColors[index % overlayColors.length] + ';">' + name + ': ' + value.toFixed(2) + '</div>';
+                                    }}).join('');
                             }},
                             backgroundColor: '{bg_color}',
                             borderColor: '{grid_color}',
@@ -1892,6 +2552,8 @@ class MainWindow(QMainWindow):
                         }},
                         xAxis: {{
                             type: 'time',
+                            min: timeMin,
+                            max: timeMax,
                             boundaryGap: false,
                             axisLine: {{ 
                                 lineStyle: {{ 
@@ -1968,10 +2630,18 @@ class MainWindow(QMainWindow):
                                 }}
                             }}
                         ],
+                        dataset: {{
+                            dimensions: columnNames(),
+                            source: candleSource()
+                        }},
                         series: [{{
                             name: 'Свечи',
                             type: 'candlestick',
-                            data: allCandles,
+                            large: true,
+                            encode: {{
+                                x: 'time',
+                                y: ['open', 'close', 'low', 'high']
+                            }},
                             itemStyle: {{
                                 color: '{up_color}',
                                 color0: '{down_color}',
@@ -1984,7 +2654,20 @@ class MainWindow(QMainWindow):
                                     borderWidth: 2
                                 }}
                             }}
-                        }}],
+                        }}].concat(overlayNames.map(function(name, index) {{
+                            return {{
+                                name: name,
+                                type: 'line',
+                                showSymbol: false,
+                                silent: true,
+                                connectNulls: false,
+                                encode: {{ x: 'time', y: name }},
+                                lineStyle: {{
+                                    width: 1.2,
+                                    color: overlayColors[index % overlayColors.length]
+                                }}
+                            }};
+                        }})),
                         grid: {{ 
                             left: '3%', 
                             right: '3%', 
@@ -1995,6 +2678,7 @@ class MainWindow(QMainWindow):
                     try {{
                         chart.setOption(option, true);
                         isChartInitialized = true;
+                        isRendered = true;
                     }} catch (error) {{
                     }}
                 }}
@@ -2013,10 +2697,12 @@ class MainWindow(QMainWindow):
                                 currentZoom.start = params.start;
                                 currentZoom.end = params.end;
                             }}
+                            reportZoom();
                         }});
                         window.addEventListener('resize', function() {{
                             if (chart) {{
                                 chart.resize();
+                                reportZoom();
                             }}
                         }});
                         isChartInitialized = true;
@@ -2027,6 +2713,12 @@ class MainWindow(QMainWindow):
                 }}
                 document.addEventListener('DOMContentLoaded', function() {{
                     initChart();
+                    new QWebChannel(qt.webChannelTransport, function(channel) {{
+                        bridge = channel.objects.pyObject;
+                        bridge.candlesLoaded.connect(window.loadCandleColumns);
+                        bridge.candleUpdated.connect(window.updateLastCandle);
+                        bridge.requestCandles();
+                    }});
                 }});
                 if (document.readyState === 'complete') {{
                     setTimeout(initChart, 100);
@@ -2043,7 +2735,8 @@ class MainWindow(QMainWindow):
         <head>
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+            <script src="echarts.min.js"></script>
+            <script src="qwebchannel.js"></script>
             <style>
                 body { 
                     margin: 0; 
@@ -2060,64 +2753,64 @@ class MainWindow(QMainWindow):
             </style>
         </head>
         <body>
-            <div class="chart-container">
-                <canvas id="portfolioChart"></canvas>
-            </div>
+            <div class="chart-container" id="portfolioChart"></div>
             <script>
                 let portfolioChart;
                 function initPortfolioChart() {
-                    const ctx = document.getElementById('portfolioChart').getContext('2d');
-                    const initialData = {
-                        labels: ['Загрузка...'],
-                        datasets: [{
-                            data: [100],
-                            backgroundColor: ['#94a3b8'],
-                            borderColor: ['#475569'],
-                            borderWidth: 2
-                        }]
-                    };
-                    portfolioChart = new Chart(ctx, {
-                        type: 'pie',
-                        data: initialData,
-                        options: {
-                            responsive: true,
-                            maintainAspectRatio: false,
-                            plugins: {
-                                legend: {
-                                    position: 'top',
-                                    labels: {
-                                        color: '#f8fafc',
-                                        font: {
-                                            size: 12
-                                        },
-                                        padding: 20
-                                    }
-                                },
-                                tooltip: {
-                                    callbacks: {
-                                        label: function(context) {
-                                            const label = context.label || '';
-                                            const value = context.parsed;
-                                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
-                                            const percentage = Math.round((value / total) * 100);
-                                            return `${label}: ${value.toLocaleString('ru-RU')} руб. (${percentage}%)`;
-                                        }
-                                    }
-                                }
+                    portfolioChart = echarts.init(document.getElementById('portfolioChart'));
+                    portfolioChart.setOption({
+                        animation: false,
+                        legend: {
+                            top: 0,
+                            textStyle: {
+                                color: '#f8fafc',
+                                fontSize: 12
+                            },
+                            itemGap: 20
+                        },
+                        tooltip: {
+                            trigger: 'item',
+                            formatter: function(params) {
+                                return `${params.name}: ${params.value.toLocaleString('ru-RU')} руб. (${Math.round(params.percent)}%)`;
                             }
-                        }
+                        },
+                        series: [{
+                            type: 'pie',
+                            radius: '75%',
+                            top: 40,
+                            label: { show: false },
+                            itemStyle: {
+                                borderColor: '#475569',
+                                borderWidth: 2
+                            },
+                            data: [{ name: 'Загрузка...', value: 100, itemStyle: { color: '#94a3b8' } }]
+                        }]
+                    });
+                    window.addEventListener('resize', function() {
+                        portfolioChart.resize();
                     });
                 }
                 function updatePortfolioChart(labels, data, colors) {
                     if (!portfolioChart) return;
-                    portfolioChart.data.labels = labels;
-                    portfolioChart.data.datasets[0].data = data;
-                    portfolioChart.data.datasets[0].backgroundColor = colors;
-                    portfolioChart.data.datasets[0].borderColor = colors.map(color => color.replace('0.2', '1'));
-                    portfolioChart.update();
+                    portfolioChart.setOption({
+                        series: [{
+                            data: labels.map(function(label, index) {
+                                return {
+                                    name: label,
+                                    value: data[index],
+                                    itemStyle: { color: colors[index], borderColor: colors[index] }
+                                };
+                            })
+                        }]
+                    });
                 }
                 document.addEventListener('DOMContentLoaded', function() {
                     initPortfolioChart();
+                    new QWebChannel(qt.webChannelTransport, function(channel) {
+                        var bridge = channel.objects.pyObject;
+                        bridge.portfolioUpdated.connect(updatePortfolioChart);
+                        bridge.requestPortfolio();
+                    });
                 });
                 window.updatePortfolioChart = updatePortfolioChart;
             </script>
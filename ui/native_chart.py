@@ -0,0 +1,338 @@
+import math
+from datetime import datetime
+
+import numpy as np
+from PyQt6.QtCore import QLineF, QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from ui.chart_bridge import OVERLAY_COLORS, candle_columns
+from ui.chart_lod import COLUMN_COUNT, TIME, OPEN, CLOSE, LOW, HIGH, OhlcPyramid
+
+CHART_COLORS = {
+    'background': '#0f172a', 'grid': '#334155', 'text': '#e2e8f0',
+    'up': '#10b981', 'down': '#ef4444', 'crosshair': '#94a3b8'
+}
+
+PRICE_AXIS_WIDTH = 70
+TIME_AXIS_HEIGHT = 24
+MIN_VISIBLE_BARS = 10
+DEFAULT_VISIBLE_BARS = 150
+ZOOM_STEP = 0.85
+
+
+def nice_step(span, ticks):
+    raw = span / max(ticks, 1)
+    if raw <= 0:
+        return 1.0
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 2.5, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+class CandlestickWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.pyramid = OhlcPyramid()
+        self.view_end = 0.0
+        self.visible_bars = DEFAULT_VISIBLE_BARS
+        self.follow_latest = True
+        self.cache = None
+        self.cache_key = None
+        self.drag_origin = None
+        self.hover_pos = None
+        self.overlay_names = []
+
+    @property
+    def count(self):
+        return self.pyramid.count()
+
+    def load_candles(self, candles):
+        self.pyramid.load(candle_columns(candles) if candles else np.empty((COLUMN_COUNT, 0)))
+        self.overlay_names = []
+        self.follow_latest = True
+        self.view_end = float(self.count)
+        self.invalidate()
+
+    def set_overlays(self, series):
+        self.overlay_names = list(series)
+        self.pyramid.set_extras([series[name] for name in self.overlay_names])
+        self.invalidate()
+
+    def update_candle(self, candle, overlays=None):
+        count = self.count
+        extras = None
+        if overlays is not None:
+            extras = [overlays.get(name, np.nan) for name in self.overlay_names]
+        self.pyramid.update_candle(candle, extras)
+        if self.count != count:
+            self.cache_key = None
+            if self.follow_latest:
+                self.view_end = float(self.count)
+        self.update()
+
+    def clear(self):
+        self.pyramid.clear()
+        self.overlay_names = []
+        self.view_end = 0.0
+        self.follow_latest = True
+        self.invalidate()
+
+    def invalidate(self):
+        self.cache_key = None
+        self.update()
+
+    def plot_rect(self):
+        return QRectF(0, 0, max(self.width() - PRICE_AXIS_WIDTH, 1), max(self.height() - TIME_AXIS_HEIGHT, 1))
+
+    def visible_range(self):
+        level = self.pyramid.level_for(self.visible_bars, self.plot_rect().width())
+        scale = self.pyramid.scale(level)
+        columns = self.pyramid.level(level)
+        first = (self.view_end - self.visible_bars) / scale
+        start = max(0, int(math.floor(first)))
+        end = min(columns.shape[1], int(math.ceil(self.view_end / scale)))
+        return level, columns, first, self.visible_bars / scale, start, end
+
+    def price_range(self, columns, start, end):
+        if end <= start:
+            return 0.0, 1.0
+        low = float(columns[LOW, start:end].min())
+        high = float(columns[HIGH, start:end].max())
+        overlays = columns[COLUMN_COUNT:, start:end]
+        if np.isfinite(overlays).any():
+            low = min(low, float(np.nanmin(overlays)))
+            high = max(high, float(np.nanmax(overlays)))
+        padding = (high - low) * 0.05 or abs(high) * 0.001 or 1.0
+        return low - padding, high + padding
+
+    def resizeEvent(self, event):
+        self.cache_key = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        level, columns, first, visible, start, end = self.visible_range()
+        count = columns.shape[1]
+        completed_end = min(end, count - 1)
+        low, high = self.price_range(columns, start, end)
+        key = (self.width(), self.height(), level, first, visible, start, completed_end, low, high)
+        if key != self.cache_key or self.cache is None:
+            self.cache = self._render_completed(columns, first, visible, start, completed_end, low, high)
+            self.cache_key = key
+        painter.drawPixmap(0, 0, self.cache)
+        if count and end == count:
+            self._draw_overlays(painter, columns, first, visible, max(count - 2, 0), count, low, high)
+            self._draw_candles(painter, columns, first, visible, count - 1, count, low, high)
+            self._draw_last_price(painter, columns, low, high)
+        self._draw_crosshair(painter, columns, first, visible, start, end, low, high)
+        painter.end()
+
+    def _render_completed(self, columns, first, visible, start, end, low, high):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QColor(CHART_COLORS['background']))
+        painter = QPainter(pixmap)
+        self._draw_grid(painter, columns, first, visible, start, end, low, high)
+        if end > start:
+            self._draw_overlays(painter, columns, first, visible, start, end, low, high)
+            self._draw_candles(painter, columns, first, visible, start, end, low, high)
+        painter.end()
+        return pixmap
+
+    def _x(self, index, first, visible, rect):
+        return rect.left() + (index - first + 0.5) * rect.width() / visible
+
+    def _y(self, price, low, high, rect):
+        return rect.bottom() - (price - low) / (high - low) * rect.height()
+
+    def _draw_grid(self, painter, columns, first, visible, start, end, low, high):
+        rect = self.plot_rect()
+        grid_pen = QPen(QColor(CHART_COLORS['grid']))
+        grid_pen.setStyle(Qt.PenStyle.DashLine)
+        text_pen = QPen(QColor(CHART_COLORS['text']))
+        step = nice_step(high - low, max(int(rect.height() / 60), 2))
+        price = math.ceil(low / step) * step
+        decimals = max(0, -int(math.floor(math.log10(step)))) if step < 1 else 0
+        while price <= high:
+            y = self._y(price, low, high, rect)
+            painter.setPen(grid_pen)
+            painter.drawLine(QLineF(rect.left(), y, rect.right(), y))
+            painter.setPen(text_pen)
+            painter.drawText(QPointF(rect.right() + 6, y + 4), f"{price:.{decimals}f}")
+            price += step
+        if end <= start:
+            return
+        span = columns[TIME, end - 1] - columns[TIME, start]
+        time_format = '%d.%m' if span > 3 * 86400 else '%H:%M'
+        every = max(1, int(100 / (rect.width() / visible)))
+        for index in range(start - start % every, end, every):
+            if index < start:
+                continue
+            x = self._x(index, first, visible, rect)
+            painter.setPen(grid_pen)
+            painter.drawLine(QLineF(x, rect.top(), x, rect.bottom()))
+            painter.setPen(text_pen)
+            label = datetime.fromtimestamp(columns[TIME, index]).strftime(time_format)
+            painter.drawText(QPointF(x - 16, rect.bottom() + 16), label)
+
+    def _draw_candles(self, painter, columns, first, visible, start, end, low, high):
+        rect = self.plot_rect()
+        painter.setClipRect(rect)
+        bar_width = rect.width() / visible
+        body_width = max(bar_width * 0.7, 1.0)
+        data = columns[:, start:end]
+        xs = rect.left() + (np.arange(start, end) - first + 0.5) * bar_width
+        scale = rect.height() / (high - low)
+        ys = rect.bottom() - (data[OPEN:] - low) * scale
+        rising = data[CLOSE] >= data[OPEN]
+        for is_up, color in ((True, CHART_COLORS['up']), (False, CHART_COLORS['down'])):
+            mask = rising == is_up
+            if not mask.any():
+                continue
+            x, open_y, close_y, low_y, high_y = xs[mask], ys[0][mask], ys[1][mask], ys[2][mask], ys[3][mask]
+            painter.setPen(QPen(QColor(color)))
+            painter.drawLines([QLineF(x[i], high_y[i], x[i], low_y[i]) for i in range(len(x))])
+            top = np.minimum(open_y, close_y)
+            height = np.maximum(np.abs(open_y - close_y), 1.0)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRects([QRectF(x[i] - body_width / 2, top[i], body_width, height[i]) for i in range(len(x))])
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setClipping(False)
+
+    def _draw_overlays(self, painter, columns, first, visible, start, end, low, high):
+        if columns.shape[0] == COLUMN_COUNT or end - start < 2:
+            return
+        rect = self.plot_rect()
+        painter.setClipRect(rect)
+        xs = rect.left() + (np.arange(start, end) - first + 0.5) * rect.width() / visible
+        ys = rect.bottom() - (columns[COLUMN_COUNT:, start:end] - low) * rect.height() / (high - low)
+        for row, values in enumerate(ys):
+            valid = np.isfinite(values[:-1]) & np.isfinite(values[1:])
+            if not valid.any():
+                continue
+            painter.setPen(QPen(QColor(OVERLAY_COLORS[row % len(OVERLAY_COLORS)]), 1.2))
+            painter.drawLines([QLineF(xs[i], values[i], xs[i + 1], values[i + 1]) for i in np.flatnonzero(valid)])
+        painter.setClipping(False)
+
+    def _draw_last_price(self, painter, columns, low, high):
+        rect = self.plot_rect()
+        close, open_price = columns[CLOSE, -1], columns[OPEN, -1]
+        color = QColor(CHART_COLORS['up'] if close >= open_price else CHART_COLORS['down'])
+        y = self._y(close, low, high, rect)
+        pen = QPen(color)
+        pen.setStyle(Qt.PenStyle.DotLine)
+        painter.setPen(pen)
+        painter.drawLine(QLineF(rect.left(), y, rect.right(), y))
+        painter.fillRect(QRectF(rect.right(), y - 9, PRICE_AXIS_WIDTH, 18), color)
+        painter.setPen(QPen(QColor(CHART_COLORS['background'])))
+        painter.drawText(QPointF(rect.right() + 6, y + 4), f"{close:.2f}")
+
+    def _draw_crosshair(self, painter, columns, first, visible, start, end, low, high):
+        rect = self.plot_rect()
+        if self.hover_pos is None or not rect.contains(self.hover_pos) or end <= start:
+            return
+        index = int(math.floor(first + (self.hover_pos.x() - rect.left()) / rect.width() * visible))
+        if index < start or index >= end:
+            return
+        pen = QPen(QColor(CHART_COLORS['crosshair']))
+        pen.setStyle(Qt.PenStyle.DashLine)
+        painter.setPen(pen)
+        painter.drawLine(QLineF(self.hover_pos.x(), rect.top(), self.hover_pos.x(), rect.bottom()))
+        painter.drawLine(QLineF(rect.left(), self.hover_pos.y(), rect.right(), self.hover_pos.y()))
+        candle = columns[:, index]
+        painter.setPen(QPen(QColor(CHART_COLORS['text'])))
+        painter.drawText(QPointF(rect.left() + 8, rect.top() + 16), (
+            f"{datetime.fromtimestamp(candle[TIME]).strftime('%d.%m.%Y %H:%M')}  "
+            f"O: {candle[OPEN]:.2f}  H: {candle[HIGH]:.2f}  L: {candle[LOW]:.2f}  C: {candle[CLOSE]:.2f}"
+        ))
+
+    def _clamp_view(self):
+        self.visible_bars = min(max(self.visible_bars, MIN_VISIBLE_BARS), max(self.count, MIN_VISIBLE_BARS))
+        self.view_end = min(max(self.view_end, min(self.visible_bars, self.count)), self.count + self.visible_bars / 2)
+        self.follow_latest = self.view_end >= self.count
+
+    def wheelEvent(self, event):
+        if not self.count:
+            return
+        rect = self.plot_rect()
+        first = self.view_end - self.visible_bars
+        anchor = first + (event.position().x() - rect.left()) / rect.width() * self.visible_bars
+        previous = self.visible_bars
+        self.visible_bars *= ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP
+        self._clamp_view()
+        self.view_end = anchor + (self.view_end - anchor) * self.visible_bars / previous
+        self._clamp_view()
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.drag_origin = (event.position().x(), self.view_end)
+
+    def mouseMoveEvent(self, event):
+        self.hover_pos = event.position()
+        if self.drag_origin:
+            origin_x, origin_end = self.drag_origin
+            bar_width = self.plot_rect().width() / self.visible_bars
+            self.view_end = origin_end - (event.position().x() - origin_x) / bar_width
+            self._clamp_view()
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self.drag_origin = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.visible_bars = DEFAULT_VISIBLE_BARS
+        self.view_end = float(self.count)
+        self._clamp_view()
+        self.update()
+
+    def leaveEvent(self, event):
+        self.hover_pos = None
+        self.update()
+
+
+class PortfolioPieWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.labels = ['Загрузка...']
+        self.values = [100.0]
+        self.colors = ['#94a3b8']
+
+    def update_portfolio(self, labels, values, colors):
+        self.labels, self.values, self.colors = labels, values, colors
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor('#0f0f0f'))
+        total = sum(self.values) or 1
+        legend_x, legend_y = 10.0, 10.0
+        for label, value, color in zip(self.labels, self.values, self.colors):
+            text = f"{label} ({round(value / total * 100)}%)"
+            text_width = painter.fontMetrics().horizontalAdvance(text) + 36
+            if legend_x + text_width > self.width():
+                legend_x, legend_y = 10.0, legend_y + 20
+            painter.fillRect(QRectF(legend_x, legend_y, 14, 12), QColor(color))
+            painter.setPen(QPen(QColor('#f8fafc')))
+            painter.drawText(QPointF(legend_x + 20, legend_y + 11), text)
+            legend_x += text_width
+        top = legend_y + 30
+        size = max(min(self.width(), self.height() - top) - 20, 10)
+        pie_rect = QRectF((self.width() - size) / 2, top, size, size)
+        angle = 90 * 16
+        for value, color in zip(self.values, self.colors):
+            span = -int(round(value / total * 360 * 16))
+            painter.setPen(QPen(QColor('#475569'), 2))
+            painter.setBrush(QColor(color))
+            painter.drawPie(pie_rect, angle, span)
+            angle += span
+        painter.end()
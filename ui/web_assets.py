@@ -0,0 +1,82 @@
+import os
+import sys
+
+from PyQt6.QtCore import QBuffer, QFile, QIODevice, QUrl
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+SCHEME = b'tinkofftool'
+BASE_URL = 'tinkofftool:///'
+
+MIME_TYPES = {
+    '.js': b'text/javascript',
+    '.css': b'text/css',
+    '.html': b'text/html',
+}
+
+QT_RESOURCES = {
+    '/qwebchannel.js': ':/qtwebchannel/qwebchannel.js',
+}
+
+
+def get_web_dir():
+    if getattr(sys, 'frozen', False):
+        base_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+        return os.path.join(base_path, 'ui', 'web')
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web')
+
+
+WEB_DIR = get_web_dir()
+
+
+def register_scheme():
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme | QWebEngineUrlScheme.Flag.LocalAccessAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def base_url():
+    return QUrl(BASE_URL)
+
+
+class AssetSchemeHandler(QWebEngineUrlSchemeHandler):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.assets = {}
+
+    def read_asset(self, path):
+        if path in self.assets:
+            return self.assets[path]
+        data = None
+        if path in QT_RESOURCES:
+            resource = QFile(QT_RESOURCES[path])
+            if resource.open(QIODevice.OpenModeFlag.ReadOnly):
+                data = bytes(resource.readAll())
+                resource.close()
+        else:
+            file_path = os.path.normpath(os.path.join(WEB_DIR, path.lstrip('/')))
+            if file_path.startswith(WEB_DIR) and os.path.isfile(file_path):
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+        if data is not None:
+            self.assets[path] = data
+        return data
+
+    def requestStarted(self, job):
+        path = job.requestUrl().path()
+        data = self.read_asset(path)
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        buffer = QBuffer(job)
+        buffer.setData(data)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(MIME_TYPES.get(os.path.splitext(path)[1], b'application/octet-stream'), buffer)
+
+
+def install_scheme_handler(parent=None):
+    handler = AssetSchemeHandler(parent)
+    for path in ['/echarts.min.js', *QT_RESOURCES]:
+        handler.read_asset(path)
+    QWebEngineProfile.defaultProfile().installUrlSchemeHandler(SCHEME, handler)
+    return handler
@@ -0,0 +1,67 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from strategies.sync_feed import SyncBarFeed
+
+BAR_SECONDS = 60
+FLUSH_INTERVAL = 250
+
+
+class BasketWorker(QObject):
+    signalGenerated = pyqtSignal(str, str, str, float)
+    statsUpdated = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.strategy = None
+        self.feed = None
+        self.stats = {}
+        self.flush_timer = None
+
+    @pyqtSlot(object)
+    def set_strategy(self, strategy):
+        self.strategy = strategy
+        self.feed = SyncBarFeed(strategy.symbols, BAR_SECONDS) if strategy else None
+        self.stats = {
+            symbol: {'ticker': symbol, 'strategy': strategy.name, 'price': 0.0, 'ticks': 0, 'bars': 0, 'signals': 0, 'last_signal': ''}
+            for symbol in strategy.symbols
+        } if strategy else {}
+        if self.flush_timer is None:
+            self.flush_timer = QTimer(self)
+            self.flush_timer.timeout.connect(self.flush_bar)
+            self.flush_timer.start(FLUSH_INTERVAL)
+
+    @pyqtSlot(str, float)
+    def on_tick(self, ticker, price):
+        if not self.strategy or ticker not in self.stats:
+            return
+        entry = self.stats[ticker]
+        entry['price'] = price
+        entry['ticks'] += 1
+        closed = self.feed.update(ticker, price, time.time())
+        if closed:
+            self.evaluate(*closed)
+
+    def flush_bar(self):
+        if not self.strategy:
+            return
+        closed = self.feed.flush(time.time())
+        if closed:
+            self.evaluate(*closed)
+
+    def evaluate(self, ts, prices):
+        try:
+            signals = self.strategy.on_cross_section(ts, prices)
+        except Exception as e:
+            self.error.emit(f"Ошибка корзины: {e}")
+            return
+        for entry in self.stats.values():
+            entry['bars'] += 1
+        for symbol, signal in signals.items():
+            entry = self.stats[symbol]
+            entry['signals'] += 1
+            entry['last_signal'] = signal
+            self.signalGenerated.emit(symbol, self.strategy.name, signal, float(prices[self.feed.columns[symbol]]))
+        self.statsUpdated.emit([dict(entry) for entry in self.stats.values()])
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from tinkoff.invest import Client, OrderDirection
+
+import database
+from workers.api_worker import quotation_to_float
+from workers.trade_worker import EXECUTION_STATES, ORDER_HISTORY
+
+ORDER_SIDES = {OrderDirection.ORDER_DIRECTION_BUY: 'BUY', OrderDirection.ORDER_DIRECTION_SELL: 'SELL'}
+FINAL_STATES = ('filled', 'rejected', 'cancelled')
+FILL_HISTORY = 1000
+RECONNECT_DELAY = 5
+
+
+def order_fill_price(state):
+    average = quotation_to_float(getattr(state, 'average_position_price', None))
+    if average:
+        return average
+    trades = getattr(state, 'trades', None) or getattr(state, 'stages', None) or []
+    quantity = sum(trade.quantity for trade in trades)
+    if quantity:
+        return sum((quotation_to_float(trade.price) or 0.0) * trade.quantity for trade in trades) / quantity
+    executed = quotation_to_float(getattr(state, 'executed_order_price', None))
+    units = getattr(state, 'lots_executed', 0) * getattr(state, 'lot_size', 0)
+    return executed / units if executed and units else 0.0
+
+
+class OrderStreamWorker(QObject):
+    order_updated = pyqtSignal(dict)
+    order_filled = pyqtSignal(dict)
+    positions_updated = pyqtSignal(dict)
+    error = pyqtSignal(str)
+    started = pyqtSignal()
+    stopped = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.token = None
+        self.account_id = None
+        self.session = 0
+        self.running = False
+        self.orders = {}
+        self.fills = deque(maxlen=FILL_HISTORY)
+        self.positions = {}
+        self.lock = threading.Lock()
+
+    def set_token(self, token):
+        token = token.strip()
+        if token == self.token:
+            return
+        self.stop_stream()
+        self.token = token
+        self.account_id = None
+
+    def start_stream(self):
+        if self.running or not self.token:
+            return
+        self.running = True
+        self.session += 1
+        session = self.session
+
+        def run():
+            while session == self.session:
+                try:
+                    with Client(self.token) as client:
+                        if self.account_id is None:
+                            self.account_id = client.users.get_accounts().accounts[0].id
+                        stream = client.orders_stream.order_state_stream(accounts=[self.account_id])
+                        self.resync(client)
+                        self.started.emit()
+                        for response in stream:
+                            if session != self.session:
+                                break
+                            if getattr(response, 'order_state', None):
+                                self.on_order_state(response.order_state)
+                except Exception as e:
+                    if session != self.session:
+                        break
+                    self.error.emit(f"Ошибка стрима ордеров: {e}")
+                if session == self.session:
+                    time.sleep(RECONNECT_DELAY)
+            self.stopped.emit()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop_stream(self):
+        if self.running:
+            self.running = False
+            self.session += 1
+
+    def resync(self, client):
+        portfolio = client.operations.get_portfolio(account_id=self.account_id)
+        positions = {}
+        for item in portfolio.positions:
+            lots = quotation_to_float(item.quantity_lots) or 0.0
+            if item.instrument_type == 'currency' or not lots:
+                continue
+            positions[item.instrument_uid] = {
+                'instrument_uid': item.instrument_uid,
+                'ticker': getattr(item, 'ticker', None) or database.get_cached_ticker(item.instrument_uid) or item.figi,
+                'lots': int(lots),
+                'average_price': quotation_to_float(item.average_position_price) or 0.0
+            }
+        with self.lock:
+            self.positions = positions
+        for state in client.orders.get_orders(account_id=self.account_id).orders:
+            self.on_order_state(state, apply_position=False)
+        self.positions_updated.emit(self.get_positions())
+
+    def on_order_state(self, state, apply_position=True):
+        status = EXECUTION_STATES.get(state.execution_report_status, 'accepted')
+        executed = getattr(state, 'lots_executed', 0) or 0
+        average = order_fill_price(state)
+        instrument_uid = getattr(state, 'instrument_uid', '')
+        ticker = getattr(state, 'ticker', '')
+        if not ticker and state.order_id not in self.orders:
+            ticker = database.get_cached_ticker(instrument_uid) or getattr(state, 'figi', '')
+        with self.lock:
+            order = self.orders.get(state.order_id)
+            if order is None:
+                order = self.orders[state.order_id] = {
+                    'order_id': state.order_id, 'client_id': getattr(state, 'order_request_id', ''),
+                    'ticker': ticker, 'instrument_uid': instrument_uid,
+                    'direction': ORDER_SIDES.get(getattr(state, 'direction', None), ''),
+                    'lots_requested': getattr(state, 'lots_requested', 0), 'lots_executed': 0, 'average_price': 0.0
+                }
+                for stale in [key for key, value in self.orders.items() if value.get('state') in FINAL_STATES][:len(self.orders) - ORDER_HISTORY]:
+                    del self.orders[stale]
+            previous, previous_average = order['lots_executed'], order['average_price']
+            fill = None
+            if executed > previous:
+                lots = executed - previous
+                price = (average * executed - previous_average * previous) / lots if average else previous_average
+                order.update(lots_executed=executed, average_price=average or previous_average)
+                if apply_position:
+                    before, after = self._apply_fill(order, lots, price)
+                    fill = {
+                        'order_id': order['order_id'], 'client_id': order['client_id'], 'ticker': order['ticker'],
+                        'instrument_uid': order['instrument_uid'], 'direction': order['direction'],
+                        'lots': lots, 'price': price, 'time': time.time(), 'position_before': before, 'position': after
+                    }
+                    self.fills.append(fill)
+            order.update(state=status, lots_requested=getattr(state, 'lots_requested', order['lots_requested']), updated_at=time.time())
+            snapshot = dict(order)
+        self.order_updated.emit(snapshot)
+        if fill:
+            self.order_filled.emit(fill)
+            self.positions_updated.emit(self.get_positions())
+
+    def _apply_fill(self, order, lots, price):
+        position = self.positions.setdefault(order['instrument_uid'], {
+            'instrument_uid': order['instrument_uid'], 'ticker': order['ticker'], 'lots': 0, 'average_price': 0.0
+        })
+        position['ticker'] = order['ticker'] or position['ticker']
+        before = position['lots']
+        after = before + (lots if order['direction'] == 'BUY' else -lots)
+        if after == 0:
+            position['average_price'] = 0.0
+        elif before == 0 or (before > 0) != (after > 0):
+            position['average_price'] = price
+        elif abs(after) > abs(before):
+            position['average_price'] = (position['average_price'] * abs(before) + price * lots) / abs(after)
+        position['lots'] = after
+        if not after:
+            del self.positions[order['instrument_uid']]
+        return before, after
+
+    def get_positions(self):
+        with self.lock:
+            return {key: dict(value) for key, value in self.positions.items()}
+
+    def working_orders(self):
+        with self.lock:
+            return [dict(order) for order in self.orders.values() if order['state'] not in FINAL_STATES]
@@ -0,0 +1,163 @@
+import time
+import uuid
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+PAPER_COMMISSION = 0.0005
+PAPER_SLIPPAGE = 0.0002
+PAPER_LATENCY = 0.05
+PAPER_CAPITAL = 100000.0
+
+
+class PaperTradeWorker(QObject):
+    order_placed = pyqtSignal(str, str)
+    order_error = pyqtSignal(str)
+    order_filled = pyqtSignal(str, str, str, int, float)
+    portfolio_updated = pyqtSignal(dict)
+
+    def __init__(self, commission=PAPER_COMMISSION, slippage=PAPER_SLIPPAGE, latency=PAPER_LATENCY, initial_cash=PAPER_CAPITAL):
+        super().__init__()
+        self.token = None
+        self.commission = commission
+        self.slippage = slippage
+        self.latency = latency
+        self.initial_cash = initial_cash
+        self.lots = {}
+        self.reset()
+
+    def reset(self):
+        self.cash = self.initial_cash
+        self.orders = {}
+        self.positions = {}
+        self.last_prices = {}
+        self.quotes = {}
+        self.total_commission = 0.0
+        self.realized_pnl = 0.0
+
+    def set_token(self, token):
+        self.token = token.strip() if token else None
+
+    @pyqtSlot(str, dict)
+    def set_context(self, ticker, context):
+        self.lots[ticker.strip().upper()] = context['lot']
+
+    def lot_size(self, ticker):
+        return self.lots.get(ticker.strip().upper(), 1)
+
+    def place_market_order(self, instrument_id_or_ticker, direction, quantity):
+        return self._submit(instrument_id_or_ticker, direction, quantity, None, f"Рыночный ордер: {direction} {quantity} лотов")
+
+    def place_limit_order(self, instrument_id_or_ticker, direction, quantity, price):
+        return self._submit(instrument_id_or_ticker, direction, quantity, float(price), f"Лимитный ордер: {direction} {quantity} лотов по {price}")
+
+    def cancel_order(self, order_id):
+        return self.orders.pop(order_id, None) is not None
+
+    def _submit(self, ticker, direction, quantity, limit_price, message):
+        if direction not in ('BUY', 'SELL') or quantity <= 0:
+            self.order_error.emit(f"[Paper] Некорректный ордер: {direction} {quantity}")
+            return None
+        if direction == 'SELL':
+            reserved = sum(order['quantity'] for order in self.orders.values()
+                           if order['ticker'] == ticker and order['direction'] == 'SELL')
+            if self.positions.get(ticker, {}).get('quantity', 0) - reserved < quantity:
+                self.order_error.emit(f"[Paper] Недостаточно {ticker} для продажи {quantity} лотов")
+                return None
+        order_id = uuid.uuid4().hex
+        self.orders[order_id] = {
+            'id': order_id, 'ticker': ticker, 'direction': direction, 'quantity': quantity,
+            'limit_price': limit_price, 'active_at': time.monotonic() + self.latency
+        }
+        self.order_placed.emit(order_id, f"[Paper] {message}")
+        return order_id
+
+    @pyqtSlot(str, float)
+    def on_tick(self, ticker, price):
+        self.last_prices[ticker] = price
+        self._match(ticker)
+
+    @pyqtSlot(str, float, float)
+    def on_order_book(self, ticker, best_bid, best_ask):
+        self.quotes[ticker] = (best_bid, best_ask)
+        self._match(ticker)
+
+    def _fill_price(self, order):
+        ticker = order['ticker']
+        bid, ask = self.quotes.get(ticker, (None, None))
+        last = self.last_prices.get(ticker)
+        if order['direction'] == 'BUY':
+            market = ask or last
+            if market is None:
+                return None
+            if order['limit_price'] is None:
+                return market * (1 + self.slippage)
+            return min(market, order['limit_price']) if market <= order['limit_price'] else None
+        market = bid or last
+        if market is None:
+            return None
+        if order['limit_price'] is None:
+            return market * (1 - self.slippage)
+        return max(market, order['limit_price']) if market >= order['limit_price'] else None
+
+    def _match(self, ticker):
+        if not self.orders:
+            return
+        now = time.monotonic()
+        filled = False
+        for order in list(self.orders.values()):
+            if order['ticker'] != ticker or order['active_at'] > now:
+                continue
+            price = self._fill_price(order)
+            if price is None:
+                continue
+            del self.orders[order['id']]
+            if self._apply_fill(order, price):
+                filled = True
+                self.order_filled.emit(order['id'], ticker, order['direction'], order['quantity'], price)
+        if filled:
+            self.portfolio_updated.emit(self.summary())
+
+    def _apply_fill(self, order, price):
+        quantity = order['quantity']
+        position = self.positions.setdefault(order['ticker'], {'quantity': 0, 'average_price': 0.0, 'lot': self.lot_size(order['ticker'])})
+        lot = position['lot']
+        notional = price * quantity * lot
+        fee = notional * self.commission
+        if order['direction'] == 'BUY':
+            if notional + fee > self.cash:
+                if not position['quantity']:
+                    del self.positions[order['ticker']]
+                self.order_error.emit(f"[Paper] Недостаточно средств для покупки {quantity} {order['ticker']}")
+                return False
+            total = position['quantity'] + quantity
+            position['average_price'] = (position['average_price'] * position['quantity'] * lot + notional) / (total * lot)
+            position['quantity'] = total
+            self.cash -= notional + fee
+        else:
+            self.realized_pnl += (price - position['average_price']) * quantity * lot
+            position['quantity'] -= quantity
+            self.cash += notional - fee
+            if not position['quantity']:
+                del self.positions[order['ticker']]
+        self.total_commission += fee
+        return True
+
+    def summary(self):
+        positions = {}
+        market_value = 0.0
+        for ticker, position in self.positions.items():
+            price = self.last_prices.get(ticker, position['average_price'])
+            units = position['quantity'] * position['lot']
+            value = price * units
+            market_value += value
+            positions[ticker] = {
+                'quantity': position['quantity'], 'lot': position['lot'], 'average_price': position['average_price'],
+                'price': price, 'value': value,
+                'unrealized_pnl': (price - position['average_price']) * units
+            }
+        equity = self.cash + market_value
+        return {
+            'cash': self.cash, 'equity': equity, 'positions': positions,
+            'realized_pnl': self.realized_pnl, 'commission': self.total_commission,
+            'pnl': equity - self.initial_cash, 'open_orders': len(self.orders)
+        }
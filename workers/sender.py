@@ -1,3 +1,4 @@
+import threading
 import requests
 
 def send_signal(message, telegram_token, telegram_chat_id):
@@ -9,4 +10,10 @@ def send_signal(message, telegram_token, telegram_chat_id):
         payload = {'chat_id': telegram_chat_id, 'text': message, 'parse_mode': 'HTML'}
         return requests.post(url, json=payload, timeout=10).status_code == 200
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+def send_signal_async(message, telegram_token, telegram_chat_id):
+    if not telegram_token or not telegram_chat_id:
+        return
+    threading.Thread(target=send_signal, args=(message, telegram_token, telegram_chat_id), daemon=True).start()
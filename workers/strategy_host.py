@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import queue
+import time
+from datetime import date
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from workers.strategy_shard import run_shard, shard_for
+
+FLUSH_INTERVAL = 50
+
+
+class TradeLimiter:
+    def __init__(self, max_daily_trades=50, min_trade_interval=60):
+        self.max_daily_trades = max_daily_trades
+        self.min_trade_interval = min_trade_interval
+        self.day = date.today()
+        self.trades_today = 0
+        self.last_trade = {}
+
+    def check(self, ticker, now=None):
+        now = time.time() if now is None else now
+        if date.today() != self.day:
+            self.day = date.today()
+            self.trades_today = 0
+        if self.trades_today >= self.max_daily_trades:
+            return False, f"достигнут лимит {self.max_daily_trades} сделок в день"
+        last_trade = self.last_trade.get(ticker)
+        elapsed = now - last_trade if last_trade is not None else self.min_trade_interval
+        if elapsed < self.min_trade_interval:
+            return False, f"с прошлой сделки прошло {elapsed:.0f} из {self.min_trade_interval} сек"
+        return True, ""
+
+    def record(self, ticker, now=None):
+        now = time.time() if now is None else now
+        if date.today() != self.day:
+            self.day = date.today()
+            self.trades_today = 0
+        self.trades_today += 1
+        self.last_trade[ticker] = now
+
+
+class StrategyHost(QObject):
+    signalGenerated = pyqtSignal(str, str, str, float)
+    statsUpdated = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.processes = []
+        self.inboxes = []
+        self.pending = []
+        self.routes = {}
+        self.outbox = None
+        self.stats = {}
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+
+    @property
+    def running(self):
+        return bool(self.processes)
+
+    def start(self, tickers, strategy_specs, shards=0):
+        self.stop()
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return
+        shards = min(shards or os.cpu_count() or 1, len(tickers))
+        context = multiprocessing.get_context('spawn')
+        self.outbox = context.Queue()
+        self.routes = {ticker: shard_for(ticker, shards) for ticker in tickers}
+        self.pending = [[] for _ in range(shards)]
+        for shard in range(shards):
+            specs = [
+                (ticker, strategy_class, params, evaluation)
+                for ticker in tickers if self.routes[ticker] == shard
+                for strategy_class, params, evaluation in strategy_specs
+            ]
+            inbox = context.Queue()
+            process = context.Process(target=run_shard, args=(inbox, self.outbox, specs), daemon=True)
+            process.start()
+            self.inboxes.append(inbox)
+            self.processes.append(process)
+        self.timer.start(FLUSH_INTERVAL)
+
+    @pyqtSlot(str, float)
+    def on_tick(self, ticker, price):
+        shard = self.routes.get(ticker)
+        if shard is not None:
+            self.pending[shard].append((ticker, price, time.time()))
+
+    def flush(self):
+        for shard, batch in enumerate(self.pending):
+            if batch:
+                self.inboxes[shard].put(('ticks', batch))
+                self.pending[shard] = []
+        while True:
+            try:
+                kind, payload = self.outbox.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'signal':
+                self.signalGenerated.emit(*payload)
+            elif kind == 'stats':
+                for entry in payload:
+                    self.stats[entry['ticker'], entry['strategy']] = entry
+                self.statsUpdated.emit(list(self.stats.values()))
+            elif kind == 'error':
+                self.error.emit(payload)
+
+    def stop(self):
+        self.timer.stop()
+        for inbox in self.inboxes:
+            inbox.put(('stop', None))
+        for process in self.processes:
+            process.join(2)
+            if process.is_alive():
+                process.terminate()
+        self.processes, self.inboxes, self.pending = [], [], []
+        self.routes, self.stats = {}, {}
+        self.outbox = None
@@ -0,0 +1,86 @@
+import queue
+import time
+import zlib
+
+from strategies.bars import EvaluationClock, clock_settings
+from strategies.indicator_registry import IndicatorRegistry
+
+STATS_INTERVAL = 1.0
+
+
+def shard_for(ticker, shards):
+    return zlib.crc32(ticker.encode('utf-8')) % shards
+
+
+def create_groups(specs):
+    groups = {}
+    for ticker, strategy_class, params, evaluation in specs:
+        settings = clock_settings(strategy_class, evaluation)
+        group = groups.setdefault((ticker, settings), {
+            'ticker': ticker, 'clock': EvaluationClock(*settings), 'registry': None, 'members': []
+        })
+        if strategy_class.shares_indicators:
+            if group['registry'] is None:
+                group['registry'] = IndicatorRegistry()
+            strategy = strategy_class(registry=group['registry'])
+        else:
+            strategy = strategy_class()
+        if params:
+            strategy.set_params(params)
+        strategy.set_evaluation(settings[0], settings[1])
+        group['members'].append((strategy, {
+            'ticker': ticker, 'strategy': strategy.name, 'price': 0.0,
+            'ticks': 0, 'bars': 0, 'signals': 0, 'last_signal': ''
+        }))
+    by_ticker = {}
+    for group in groups.values():
+        by_ticker.setdefault(group['ticker'], []).append(group)
+    return by_ticker
+
+
+def evaluate(outbox, group, bar):
+    if group['registry'] is not None:
+        group['registry'].update(bar['close'])
+    for strategy, entry in group['members']:
+        entry['bars'] += 1
+        try:
+            signal = strategy.on_bar(**bar)
+        except Exception as e:
+            outbox.put(('error', f"{entry['ticker']} {strategy.name}: {e}"))
+            continue
+        if signal:
+            entry['signals'] += 1
+            entry['last_signal'] = signal
+            outbox.put(('signal', (entry['ticker'], strategy.name, signal, bar['close'])))
+
+
+def run_shard(inbox, outbox, specs):
+    groups = create_groups(specs)
+    last_stats = time.monotonic()
+    while True:
+        try:
+            kind, payload = inbox.get(timeout=STATS_INTERVAL)
+        except queue.Empty:
+            kind, payload = None, None
+        if kind == 'stop':
+            break
+        if kind == 'ticks':
+            for ticker, price, ts in payload:
+                for group in groups.get(ticker, ()):
+                    for _, entry in group['members']:
+                        entry['price'] = price
+                        entry['ticks'] += 1
+                    bar = group['clock'].on_tick(price, ts=ts)
+                    if bar:
+                        evaluate(outbox, group, bar)
+        now = time.time()
+        for ticker_groups in groups.values():
+            for group in ticker_groups:
+                bar = group['clock'].flush(now)
+                if bar:
+                    evaluate(outbox, group, bar)
+        now = time.monotonic()
+        if now - last_stats >= STATS_INTERVAL:
+            last_stats = now
+            outbox.put(('stats', [dict(entry) for ticker_groups in groups.values()
+                                  for group in ticker_groups for _, entry in group['members']]))
@@ -0,0 +1,237 @@
+import time
+from collections import deque
+
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+import database
+from strategies.bars import EvaluationClock, resample_candles
+from strategies.trace import DecisionTrace
+
+SNAPSHOT_INTERVAL = 0.25
+FLUSH_INTERVAL = 250
+STATE_SAVE_INTERVAL = 60
+OVERLAY_HISTORY = 50000
+
+
+class StrategyWorker(QObject):
+    signalGenerated = pyqtSignal(str, float, dict, dict, int, float)
+    snapshotReady = pyqtSignal(dict, dict, int)
+    overlaySeriesReady = pyqtSignal(dict)
+    stateRestored = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.strategy = None
+        self.clock = None
+        self.state_key = None
+        self.last_time = None
+        self.last_snapshot = 0.0
+        self.last_save = 0.0
+        self.live_positions = False
+        self.broker_lots = None
+        self.overlay_times = deque(maxlen=OVERLAY_HISTORY)
+        self.overlay_values = deque(maxlen=OVERLAY_HISTORY)
+        self.flush_timer = None
+
+    @pyqtSlot(object)
+    def set_strategy(self, strategy):
+        if strategy is not self.strategy:
+            self.close_trace()
+            self.clear_overlays()
+        self.strategy = strategy
+        self.clock = EvaluationClock.for_strategy(strategy) if strategy else None
+        self.last_snapshot = 0.0
+        if self.flush_timer is None:
+            self.flush_timer = QTimer(self)
+            self.flush_timer.timeout.connect(self.flush_bar)
+            self.flush_timer.start(FLUSH_INTERVAL)
+
+    @pyqtSlot(str, int)
+    def set_evaluation(self, mode, interval):
+        if not self.strategy:
+            return
+        try:
+            self.strategy.set_evaluation(mode, interval)
+            self.clock = EvaluationClock.for_strategy(self.strategy)
+        except Exception as e:
+            self.error.emit(f"Ошибка режима оценки: {e}")
+
+    @pyqtSlot(str, list)
+    def load_history(self, state_key, candles):
+        if not self.strategy:
+            return
+        self.state_key = state_key
+        self.clear_overlays()
+        data = None
+        try:
+            data = database.load_strategy_snapshot(state_key) if state_key else None
+            saved_time = self.strategy.restore(data) if data else None
+        except Exception as e:
+            self.error.emit(f"Снимок стратегии не восстановлен: {e}")
+            saved_time = None
+        try:
+            if self.strategy.evaluation == 'bar':
+                candles = resample_candles(candles, self.strategy.bar_seconds)
+            if saved_time is None or (candles and saved_time < candles[0]['time']):
+                if data:
+                    self.strategy.reset()
+                closes = np.array([candle['close'] for candle in candles], dtype=float)
+                self.strategy.warm_up(closes)
+                self._record_overlay_series(candles, closes)
+                backfilled = len(candles)
+            else:
+                known = [candle for candle in candles if candle['time'] <= saved_time]
+                self._record_overlay_series(known, np.array([candle['close'] for candle in known], dtype=float))
+                gap = [candle for candle in candles if candle['time'] > saved_time]
+                for candle in gap:
+                    self._evaluate_bar(candle['open'], candle['high'], candle['low'], candle['close'], 0.0, candle['time'], trade=False)
+                backfilled = len(gap)
+                self.stateRestored.emit(int(saved_time), backfilled)
+            if candles:
+                self.last_time = candles[-1]['time']
+            self.clock = EvaluationClock.for_strategy(self.strategy)
+            if candles and self.strategy.evaluation == 'bar':
+                self.clock.bars.closed_ts = candles[-1]['time']
+            if self.live_positions and candles:
+                self._sync_position(candles[-1]['close'])
+            if self.strategy.trace:
+                self.strategy.trace.checkpoint(self.strategy)
+        except Exception as e:
+            self.error.emit(f"Ошибка прогрева стратегии: {e}")
+
+    def _evaluate_bar(self, open, high, low, close, volume, ts, trade=True):
+        signal = self.strategy.on_bar(open, high, low, close, volume, ts)
+        overlays = self.strategy.get_overlay_values()
+        if overlays:
+            self.overlay_times.append(ts)
+            self.overlay_values.append(overlays)
+        if signal and trade and not self.live_positions:
+            self.strategy.update_position(signal, close)
+        return signal
+
+    @pyqtSlot(bool)
+    def set_live_positions(self, enabled):
+        self.live_positions = enabled
+        if not enabled:
+            self.broker_lots = None
+
+    @pyqtSlot(float, int)
+    def apply_execution(self, price, lots):
+        self.broker_lots = lots
+        if self.strategy and self._sync_position(price) and self.strategy.trace:
+            self.strategy.trace.checkpoint(self.strategy)
+
+    def _sync_position(self, price):
+        if self.broker_lots is None:
+            return False
+        if self.broker_lots > 0 and self.strategy.position != 'LONG':
+            self.strategy.update_position('BUY', price)
+        elif self.broker_lots <= 0 and self.strategy.position == 'LONG':
+            self.strategy.update_position('SELL', price)
+        else:
+            return False
+        return True
+
+    @pyqtSlot()
+    def save_state(self):
+        if not self.strategy or not self.state_key:
+            return
+        try:
+            database.save_strategy_snapshot(self.state_key, self.strategy.snapshot(self.last_time))
+            self.last_save = time.monotonic()
+        except Exception as e:
+            self.error.emit(f"Снимок стратегии не сохранен: {e}")
+
+    @pyqtSlot()
+    def reset(self):
+        if self.strategy:
+            self.save_state()
+            self.strategy.reset()
+            self.clock = EvaluationClock.for_strategy(self.strategy)
+            self.last_time = None
+            self.clear_overlays()
+            if self.strategy.trace:
+                self.strategy.trace.checkpoint(self.strategy)
+
+    @pyqtSlot(str)
+    def set_trace(self, path):
+        self.close_trace()
+        if not self.strategy or not path:
+            return
+        try:
+            self.strategy.set_trace(DecisionTrace(path, self.strategy))
+        except Exception as e:
+            self.error.emit(f"Не удалось включить трассировку: {e}")
+
+    def close_trace(self):
+        if self.strategy and self.strategy.trace:
+            trace, self.strategy.trace = self.strategy.trace, None
+            trace.close()
+
+    def clear_overlays(self):
+        self.overlay_times.clear()
+        self.overlay_values.clear()
+
+    def _record_overlay_series(self, candles, closes):
+        series = self.strategy.get_overlay_series(closes) if len(closes) else {}
+        for index, candle in enumerate(candles if series else []):
+            self.overlay_times.append(candle['time'])
+            self.overlay_values.append({name: values[index] for name, values in series.items()})
+
+    @pyqtSlot(object)
+    def compute_overlays(self, times):
+        try:
+            if not self.strategy or not self.overlay_times:
+                self.overlaySeriesReady.emit({})
+                return
+            index = np.searchsorted(np.fromiter(self.overlay_times, dtype=float), np.asarray(times, dtype=float), side='right') - 1
+            missing = index < 0
+            index[missing] = 0
+            series = {}
+            for name in self.overlay_values[-1]:
+                values = np.array([row.get(name, np.nan) for row in self.overlay_values], dtype=float)[index]
+                values[missing] = np.nan
+                series[name] = values
+            self.overlaySeriesReady.emit(series)
+        except Exception as e:
+            self.error.emit(f"Ошибка индикаторов: {e}")
+
+    @pyqtSlot(float)
+    def process_price(self, price):
+        if not self.strategy:
+            return
+        try:
+            self._publish(self.clock.on_tick(price))
+        except Exception as e:
+            self.error.emit(f"Ошибка стратегии: {e}")
+
+    def flush_bar(self):
+        if not self.strategy or not self.clock:
+            return
+        try:
+            bar = self.clock.flush(time.time())
+            if bar:
+                self._publish(bar)
+        except Exception as e:
+            self.error.emit(f"Ошибка стратегии: {e}")
+
+    def _publish(self, bar):
+        signal = None
+        if bar:
+            signal = self._evaluate_bar(**bar)
+            self.last_time = bar['ts']
+        now = time.monotonic()
+        if now - self.last_save >= STATE_SAVE_INTERVAL:
+            self.save_state()
+        if not signal and now - self.last_snapshot < SNAPSHOT_INTERVAL:
+            return
+        self.last_snapshot = now
+        indicators = self.strategy.get_indicator_values()
+        overlays = self.strategy.get_overlay_values()
+        price_count = len(self.strategy.price_history)
+        if signal:
+            self.signalGenerated.emit(signal, bar['close'], indicators, overlays, price_count, float(bar['ts']))
+        else:
+            self.snapshotReady.emit(indicators, overlays, price_count)
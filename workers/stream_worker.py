@@ -1,6 +1,6 @@
 import threading
 from PyQt6.QtCore import QObject, pyqtSignal
-from tinkoff.invest import Client, TradeInstrument, LastPriceInstrument
+from tinkoff.invest import Client, TradeInstrument, LastPriceInstrument, OrderBookInstrument
 from workers.api_worker import find_instrument_by_ticker, quotation_to_float
 
 class MarketStreamWorker(QObject):
@@ -38,13 +38,18 @@ class MarketStreamWorker(QObject):
                     self.manager = stream
                     self.started.emit()
 
+                    last_price = None
                     for event in stream:
                         if hasattr(event, 'trade') and event.trade:
                             price = quotation_to_float(event.trade.price)
-                            if price: self.candle.emit(price)
+                            if price:
+                                last_price = price
+                                self.candle.emit(price)
                         elif hasattr(event, 'last_price') and event.last_price:
                             price = quotation_to_float(event.last_price.price)
-                            if price: self.candle.emit(price)
+                            if price and price != last_price:
+                                last_price = price
+                                self.candle.emit(price)
 
                     self.stopped.emit()
 
@@ -56,4 +61,79 @@ class MarketStreamWorker(QObject):
 
     def stop_stream(self):
         if self.manager:
-            self.manager.stop()
\ No newline at end of file
+            self.manager.stop()
+
+class MultiMarketStreamWorker(QObject):
+    tick = pyqtSignal(str, float)
+    order_book = pyqtSignal(str, float, float)
+    error = pyqtSignal(str)
+    started = pyqtSignal()
+    stopped = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.token = None
+        self.manager = None
+
+    def set_token(self, token):
+        self.token = token.strip()
+
+    def start_stream(self, tickers, order_book=False):
+        def run():
+            try:
+                with Client(self.token) as client:
+                    tickers_by_uid = {}
+                    for ticker in tickers:
+                        instrument_uid = find_instrument_by_ticker(client, ticker)
+                        if instrument_uid:
+                            tickers_by_uid[instrument_uid] = ticker
+                        else:
+                            self.error.emit(f"Инструмент '{ticker}' не найден")
+                    if not tickers_by_uid:
+                        self.stopped.emit()
+                        return
+
+                    stream = client.create_market_data_stream()
+                    stream.trades.subscribe([TradeInstrument(instrument_id=uid) for uid in tickers_by_uid])
+                    stream.last_price.subscribe([LastPriceInstrument(instrument_id=uid) for uid in tickers_by_uid])
+                    if order_book:
+                        stream.order_book.subscribe([OrderBookInstrument(instrument_id=uid, depth=1) for uid in tickers_by_uid])
+
+                    self.manager = stream
+                    self.started.emit()
+
+                    last_prices = {}
+                    for event in stream:
+                        if hasattr(event, 'orderbook') and event.orderbook:
+                            book = event.orderbook
+                            ticker = tickers_by_uid.get(book.instrument_uid)
+                            if ticker and book.bids and book.asks:
+                                self.order_book.emit(ticker, quotation_to_float(book.bids[0].price), quotation_to_float(book.asks[0].price))
+                            continue
+                        data = None
+                        is_trade = hasattr(event, 'trade') and event.trade
+                        if is_trade:
+                            data = event.trade
+                        elif hasattr(event, 'last_price') and event.last_price:
+                            data = event.last_price
+                        if data is None:
+                            continue
+                        ticker = tickers_by_uid.get(data.instrument_uid)
+                        price = quotation_to_float(data.price)
+                        if not ticker or not price or (not is_trade and last_prices.get(ticker) == price):
+                            continue
+                        last_prices[ticker] = price
+                        self.tick.emit(ticker, price)
+
+                    self.stopped.emit()
+
+            except Exception as e:
+                self.error.emit(f"Ошибка стрима: {e}")
+                self.stopped.emit()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop_stream(self):
+        if self.manager:
+            self.manager.stop()
+            self.manager = None
@@ -1,58 +1,239 @@
-from PyQt6.QtCore import QObject, pyqtSignal
-from tinkoff.invest import Client, OrderDirection, OrderType, Quotation
-from workers.api_worker import find_instrument_by_ticker
+import threading
+import time
+import uuid
+
+import grpc
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+from tinkoff.invest import Client, InstrumentIdType, OrderDirection, OrderExecutionReportStatus, OrderType, Quotation
+from workers.api_worker import find_instrument_by_ticker, quotation_to_float
+
+ORDER_DIRECTIONS = {'BUY': OrderDirection.ORDER_DIRECTION_BUY, 'SELL': OrderDirection.ORDER_DIRECTION_SELL}
+EXECUTION_STATES = {
+    OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_NEW: 'accepted',
+    OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_PARTIALLYFILL: 'partially_filled',
+    OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_FILL: 'filled',
+    OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_REJECTED: 'rejected',
+    OrderExecutionReportStatus.EXECUTION_REPORT_STATUS_CANCELLED: 'cancelled'
+}
+TRANSIENT_CODES = {
+    grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED, grpc.StatusCode.INTERNAL
+}
+KEEPALIVE_INTERVAL = 60000
+ORDER_RATE_LIMIT = 100
+ORDER_RATE_PERIOD = 60.0
+ORDER_RETRIES = 4
+RETRY_DELAY = 0.2
+ORDER_HISTORY = 1000
+ACTIVE_STATES = ('queued', 'sending', 'retrying')
+
+
+def price_to_quotation(price, increment=0.0):
+    if increment > 0:
+        price = round(round(price / increment) * increment, 9)
+    units = int(price)
+    return Quotation(units=units, nano=int(round((price - units) * 1_000_000_000)))
+
+
+def new_client_order_id():
+    return str(uuid.uuid4())
+
+
+def is_transient(error):
+    code = getattr(error, 'code', None)
+    if callable(code):
+        code = code()
+    return code in TRANSIENT_CODES
+
+
+class RateBudget:
+    def __init__(self, rate=ORDER_RATE_LIMIT, period=ORDER_RATE_PERIOD):
+        self.rate = rate
+        self.period = period
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.period)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * self.period / self.rate
+            time.sleep(wait)
+
 
 class TradeWorker(QObject):
     order_placed = pyqtSignal(str, str)
     order_error = pyqtSignal(str)
-    
-    def __init__(self):
+    order_state = pyqtSignal(str, str, dict)
+    context_ready = pyqtSignal(str, dict)
+
+    def __init__(self, budget=None):
         super().__init__()
         self.token = None
-        
+        self.client = None
+        self.services = None
+        self.keepalive = None
+        self.account_id = None
+        self.contexts = {}
+        self.budget = budget or RateBudget()
+        self.orders = {}
+        self.orders_lock = threading.Lock()
+
+    @pyqtSlot(str)
     def set_token(self, token):
-        self.token = token.strip()
-        
-    def place_market_order(self, instrument_id_or_ticker, direction, quantity):
+        token = token.strip()
+        if token == self.token:
+            return
+        self.close()
+        self.token = token
+        self.account_id = None
+        self.contexts = {}
+
+    def _services(self):
+        if self.services is None:
+            self.client = Client(self.token)
+            self.services = self.client.__enter__()
+            if self.keepalive is None:
+                self.keepalive = QTimer(self)
+                self.keepalive.timeout.connect(self._keep_warm)
+            self.keepalive.start(KEEPALIVE_INTERVAL)
+        return self.services
+
+    def _keep_warm(self):
+        if self.active_orders():
+            return
         try:
-            with Client(self.token) as client:
-                account_id = client.users.get_accounts().accounts[0].id
-                instrument_id = find_instrument_by_ticker(client, instrument_id_or_ticker) if isinstance(instrument_id_or_ticker, str) else instrument_id_or_ticker
-                order_direction = OrderDirection.ORDER_DIRECTION_BUY if direction == 'BUY' else OrderDirection.ORDER_DIRECTION_SELL
-                
-                response = client.orders.post_order(
-                    instrument_id=instrument_id,
-                    quantity=quantity,
-                    direction=order_direction,
-                    account_id=account_id,
-                    order_type=OrderType.ORDER_TYPE_MARKET,
-                    order_id=""
-                )
-                
-                self.order_placed.emit(response.order_id, f"Рыночный ордер: {direction} {quantity} лотов")
+            self.services.users.get_info()
+        except Exception:
+            self.close()
+
+    @pyqtSlot()
+    def close(self):
+        if self.keepalive:
+            self.keepalive.stop()
+        if self.client is not None:
+            try:
+                self.client.__exit__(None, None, None)
+            except Exception:
+                pass
+        self.client = None
+        self.services = None
+
+    def _find_instrument_uid(self, services, ticker):
+        found = [item for item in services.instruments.find_instrument(query=ticker).instruments if item.ticker.upper() == ticker.upper()]
+        tradable = [item for item in found if item.api_trade_available_flag] or found
+        return tradable[0].uid if tradable else find_instrument_by_ticker(services, ticker)
+
+    def resolve(self, instrument_id_or_ticker):
+        key = instrument_id_or_ticker.strip().upper()
+        if key in self.contexts:
+            return self.contexts[key]
+        services = self._services()
+        if self.account_id is None:
+            self.account_id = services.users.get_accounts().accounts[0].id
+        instrument_uid = key.lower() if len(key) == 36 else self._find_instrument_uid(services, key)
+        if not instrument_uid:
+            raise ValueError(f"Инструмент '{instrument_id_or_ticker}' не найден")
+        instrument = services.instruments.get_instrument_by(
+            id_type=InstrumentIdType.INSTRUMENT_ID_TYPE_UID, id=instrument_uid
+        ).instrument
+        context = {
+            'account_id': self.account_id,
+            'instrument_uid': instrument_uid,
+            'lot': instrument.lot,
+            'min_price_increment': quotation_to_float(instrument.min_price_increment) or 0.0
+        }
+        self.contexts[key] = context
+        return context
+
+    @pyqtSlot(str, str)
+    def prepare(self, token, instrument_id_or_ticker):
+        self.set_token(token)
+        try:
+            self.context_ready.emit(instrument_id_or_ticker, self.resolve(instrument_id_or_ticker))
         except Exception as e:
-            self.order_error.emit(f"Ошибка рыночного ордера: {str(e)}")
-            
-    def place_limit_order(self, instrument_id_or_ticker, direction, quantity, price):
+            self.order_error.emit(f"Не удалось подготовить ордер для {instrument_id_or_ticker}: {e}")
+
+    def active_orders(self):
+        with self.orders_lock:
+            return [order for order in self.orders.values() if order['state'] in ACTIVE_STATES]
+
+    def _set_state(self, order, state, **changes):
+        with self.orders_lock:
+            order.update(changes, state=state, updated_at=time.time())
+            snapshot = dict(order)
+        self.order_state.emit(order['client_id'], state, snapshot)
+
+    @pyqtSlot(str, str, str, int, float, float)
+    def place_order(self, client_id, instrument_id_or_ticker, direction, quantity, price, requested_at):
+        client_id = client_id or new_client_order_id()
+        with self.orders_lock:
+            if client_id in self.orders:
+                return
+            order = self.orders[client_id] = {
+                'client_id': client_id, 'ticker': instrument_id_or_ticker, 'direction': direction,
+                'quantity': quantity, 'price': price, 'requested_at': requested_at,
+                'state': 'new', 'attempts': 0, 'order_id': None, 'error': None
+            }
+            for stale in [key for key, value in self.orders.items() if value['state'] not in ACTIVE_STATES][:len(self.orders) - ORDER_HISTORY]:
+                del self.orders[stale]
         try:
-            with Client(self.token) as client:
-                account_id = client.users.get_accounts().accounts[0].id
-                instrument_id = find_instrument_by_ticker(client, instrument_id_or_ticker) if isinstance(instrument_id_or_ticker, str) else instrument_id_or_ticker
-                order_direction = OrderDirection.ORDER_DIRECTION_BUY if direction == 'BUY' else OrderDirection.ORDER_DIRECTION_SELL
-                
-                price_units = int(price)
-                price_nano = int((price - price_units) * 1_000_000_000)
-                
-                response = client.orders.post_order(
-                    instrument_id=instrument_id,
-                    quantity=quantity,
-                    price=Quotation(units=price_units, nano=price_nano),
-                    direction=order_direction,
-                    account_id=account_id,
-                    order_type=OrderType.ORDER_TYPE_LIMIT,
-                    order_id=""
-                )
-                
-                self.order_placed.emit(response.order_id, f"Лимитный ордер: {direction} {quantity} лотов по {price}")
+            context = self.resolve(instrument_id_or_ticker)
+            request = {
+                'instrument_id': context['instrument_uid'],
+                'quantity': quantity,
+                'direction': ORDER_DIRECTIONS[direction],
+                'account_id': context['account_id'],
+                'order_id': client_id
+            }
+            if price > 0:
+                request['order_type'] = OrderType.ORDER_TYPE_LIMIT
+                request['price'] = price_to_quotation(price, context['min_price_increment'])
+            else:
+                request['order_type'] = OrderType.ORDER_TYPE_MARKET
         except Exception as e:
-            self.order_error.emit(f"Ошибка лимитного ордера: {str(e)}")
\ No newline at end of file
+            self._fail(order, e)
+            return
+        self._set_state(order, 'queued')
+        self._send(order, request)
+
+    def _send(self, order, request, attempt=1):
+        self.budget.acquire()
+        self._set_state(order, 'sending' if attempt == 1 else 'retrying', attempts=attempt)
+        try:
+            response = self._services().orders.post_order(**request)
+        except Exception as e:
+            if attempt < ORDER_RETRIES and is_transient(e):
+                delay = int(RETRY_DELAY * 2 ** (attempt - 1) * 1000)
+                QTimer.singleShot(delay, lambda: self._send(order, request, attempt + 1))
+                return
+            self._fail(order, e)
+            return
+        state = EXECUTION_STATES.get(response.execution_report_status, 'accepted')
+        self._set_state(order, state, order_id=response.order_id, lots_executed=response.lots_executed)
+        if state == 'rejected':
+            self.order_error.emit(f"Ордер {order['client_id']} отклонен: {response.message}")
+            return
+        latency = (time.perf_counter() - order['requested_at']) * 1000
+        if order['price'] > 0:
+            description = f"Лимитный ордер: {order['direction']} {order['quantity']} лотов по {order['price']}"
+        else:
+            description = f"Рыночный ордер: {order['direction']} {order['quantity']} лотов"
+        self.order_placed.emit(response.order_id, f"{description} ({latency:.0f} мс, попыток: {attempt})")
+
+    def _fail(self, order, error):
+        self._set_state(order, 'failed', error=str(error))
+        kind = "лимитного" if order['price'] > 0 else "рыночного"
+        self.order_error.emit(f"Ошибка {kind} ордера: {str(error)}")
+
+    def place_market_order(self, instrument_id_or_ticker, direction, quantity):
+        self.place_order(new_client_order_id(), instrument_id_or_ticker, direction, quantity, 0.0, time.perf_counter())
+
+    def place_limit_order(self, instrument_id_or_ticker, direction, quantity, price):
+        self.place_order(new_client_order_id(), instrument_id_or_ticker, direction, quantity, float(price), time.perf_counter())